@@ -7,6 +7,7 @@ modules, classes, functions, and variables. These entities form the basis of the
 documentation and analysis capabilities of the CodeDoc framework.
 """
 
+import sys
 import uuid
 from typing import Any, Dict, List, Optional, Union
 
@@ -339,7 +340,8 @@ class ImportEntity(Entity):
             line_start=line_start,
             line_end=line_end,
         )
-        self.module_name = module_name
+        # Module names repeat across many imports, so share one string object
+        self.module_name = sys.intern(module_name)
         self.imported_names = imported_names
         self.is_from = is_from
     
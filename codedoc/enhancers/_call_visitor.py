@@ -0,0 +1,162 @@
+"""
+Function call collection for CodeDoc's relationship mapper.
+
+This module walks Python ASTs and records the names of the functions each
+function calls. It is kept free of dynamic attribute access and fully
+annotated so it can be compiled with mypyc.
+"""
+
+import ast
+from typing import Container, Dict, List, Union
+
+# Longest attribute chain recorded as a call; longer ones rarely name an entity
+_MAX_ATTRIBUTE_DEPTH = 6
+
+
+class FunctionCallVisitor(ast.NodeVisitor):
+    """
+    AST visitor that identifies function calls in code.
+    
+    Calls are collected in a list, in the order they appear, and may repeat.
+    """
+    
+    __slots__ = ("function_calls",)
+    
+    def __init__(self) -> None:
+        """
+        Initialize the visitor.
+        """
+        self.function_calls: List[str] = []
+
+    def visit_Call(self, node: ast.Call) -> None:
+        """
+        Visit a function call node in the AST.
+        
+        Args:
+            node: The AST node representing a function call
+        """
+        # Extract the call target
+        if isinstance(node.func, ast.Name):
+            # Simple function call: func()
+            self.function_calls.append(node.func.id)
+        elif isinstance(node.func, ast.Attribute):
+            # Attribute call: obj.method()
+            # Convert to a dotted path
+            path = self._get_attribute_path(node.func)
+            if path:
+                self.function_calls.append(path)
+        
+        # Continue visiting children
+        self.generic_visit(node)
+
+    def _get_attribute_path(self, node: ast.Attribute) -> str:
+        """
+        Convert an attribute node to a dotted path.
+        
+        Args:
+            node: The attribute node
+            
+        Returns:
+            The dotted path as a string, or an empty string for chains longer
+            than _MAX_ATTRIBUTE_DEPTH
+        """
+        parts = []
+        
+        current = node
+        while isinstance(current, ast.Attribute):
+            if len(parts) == _MAX_ATTRIBUTE_DEPTH:
+                return ""
+            parts.append(current.attr)
+            current = current.value
+        
+        if isinstance(current, ast.Name):
+            parts.append(current.id)
+        else:
+            # If it's not a simple chain of attributes, return just the method name
+            return node.attr
+        
+        # Reverse in place and join with dots
+        parts.reverse()
+        return '.'.join(parts)
+
+
+class _ModuleCallVisitor(FunctionCallVisitor):
+    """
+    AST visitor that collects the calls of every function in a module in one pass.
+    
+    Calls are recorded for the innermost enclosing function that is a known
+    entity, so calls in nested helpers count for the function defining them.
+    Methods are looked up by their full scope and, failing that, by module,
+    class and method name, which is how methods of nested classes are
+    registered.
+    """
+    
+    def __init__(self, module_name: str, known_names: Container[str]) -> None:
+        """
+        Initialize the visitor.
+        
+        Args:
+            module_name: Name of the module being visited
+            known_names: Full names of the registered entities
+        """
+        super().__init__()
+        self.calls: Dict[str, List[str]] = {}
+        self._known_names = known_names
+        self._scope: List[str] = [module_name]
+        # Name of the class whose body is being visited, if any
+        self._class_name = ""
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        """
+        Visit a class definition, adding it to the enclosing scope.
+        
+        Args:
+            node: The AST node representing the class
+        """
+        enclosing_class = self._class_name
+        self._class_name = node.name
+        self._scope.append(node.name)
+        self.generic_visit(node)
+        self._scope.pop()
+        self._class_name = enclosing_class
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        """
+        Visit a function definition, collecting its calls if it is known.
+        
+        Args:
+            node: The AST node representing the function
+        """
+        self._visit_function(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        """
+        Visit an async function definition, collecting its calls if it is known.
+        
+        Args:
+            node: The AST node representing the function
+        """
+        self._visit_function(node)
+
+    def _visit_function(self, node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> None:
+        """
+        Visit a function body with the function as the innermost scope.
+        
+        Args:
+            node: The AST node representing the function
+        """
+        self._scope.append(node.name)
+        qualified_name = '.'.join(self._scope)
+        if qualified_name not in self._known_names and self._class_name:
+            qualified_name = '.'.join((self._scope[0], self._class_name, node.name))
+        enclosing_calls = self.function_calls
+        if qualified_name in self._known_names:
+            self.function_calls = self.calls.setdefault(qualified_name, [])
+        
+        enclosing_class = self._class_name
+        self._class_name = ""
+        self.generic_visit(node)
+        self._class_name = enclosing_class
+        
+        self.function_calls = enclosing_calls
+        self._scope.pop()
@@ -0,0 +1,121 @@
+"""
+Function complexity classification for CodeDoc.
+
+This module estimates the complexity of a function from the number of
+branching keywords in its source. It is kept free of dynamic attribute
+access and fully annotated so it can be compiled with mypyc.
+"""
+
+import re
+import bisect
+import functools
+import logging
+from typing import Any, List
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+logger = logging.getLogger(__name__)
+
+# Branching keywords counted by the function complexity estimate
+_BRANCH_RE = re.compile(r'\b(?:if|for|while)\b')
+_BRANCH_KEYWORDS = (b'if', b'for', b'while')
+
+# Upper bounds of the branch count for each complexity label but the last
+_COMPLEXITY_THRESHOLDS = (0, 2, 5)
+_COMPLEXITY_LABELS = (
+    "Simple (linear execution)",
+    "Low (few branches)",
+    "Moderate",
+    "Complex (many branches)",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _branch_database() -> Any:
+    """
+    Compile the Hyperscan database used for branch counting.
+    
+    Returns:
+        The compiled database, or None if Hyperscan is unavailable
+    """
+    if hyperscan is None:
+        return None
+    
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[rb'\b' + keyword + rb'\b' for keyword in _BRANCH_KEYWORDS],
+            ids=list(range(len(_BRANCH_KEYWORDS))),
+            elements=len(_BRANCH_KEYWORDS),
+            flags=[0] * len(_BRANCH_KEYWORDS),
+        )
+        return database
+    except Exception as e:
+        logger.warning(f"Failed to compile Hyperscan branch database, falling back to re: {str(e)}")
+        return None
+
+
+def count_branches_batch(codes: List[str]) -> List[int]:
+    """
+    Count the branching keywords (if/for/while) in many code strings.
+    
+    Uses a Hyperscan DFA when the optional ``hyperscan`` package is
+    installed and the precompiled ``re`` pattern otherwise.
+    
+    Args:
+        codes: Source code strings to scan
+        
+    Returns:
+        The number of branching keywords in each code string
+    """
+    database = _branch_database()
+    if database is None:
+        findall = _BRANCH_RE.findall
+        return [len(findall(code)) for code in codes]
+    
+    # Scan all code strings in one pass, separated by NUL bytes so no
+    # keyword can match across a boundary
+    counts = [0] * len(codes)
+    ends: List[int] = []
+    offset = 0
+    encoded = [code.encode('utf-8') for code in codes]
+    for body in encoded:
+        offset += len(body)
+        ends.append(offset)
+        offset += 1
+    
+    def on_match(pattern_id: int, start: int, end: int, flags: int, context: Any) -> None:
+        counts[bisect.bisect_left(ends, end)] += 1
+    
+    database.scan(b'\x00'.join(encoded), match_event_handler=on_match)
+    
+    return counts
+
+
+def complexity_label(branch_count: int) -> str:
+    """
+    Map a branch count to a complexity label.
+    
+    Args:
+        branch_count: Number of branching keywords in a function
+        
+    Returns:
+        The complexity description
+    """
+    return _COMPLEXITY_LABELS[bisect.bisect_left(_COMPLEXITY_THRESHOLDS, branch_count)]
+
+
+def classify_complexity(code: str) -> str:
+    """
+    Estimate the complexity of a function from its source code.
+    
+    Args:
+        code: The source code of the function
+        
+    Returns:
+        The complexity description
+    """
+    return complexity_label(count_branches_batch([code])[0])
@@ -0,0 +1,75 @@
+"""
+Default reference templates for the enhanced documentation generator.
+
+These are the plain ``{{variable}}`` templates written next to the
+generated documentation so users have a starting point for their own
+templates. They are kept as module constants so they are built once per
+process rather than on every documentation run.
+"""
+
+MODULE_TEMPLATE = """# Module: {{module_name}}
+
+{{module_description}}
+
+## Implementation Notes
+
+{{implementation_notes}}
+
+## Dependencies
+
+{{dependencies}}
+
+## Classes
+
+{{classes}}
+
+## Functions
+
+{{functions}}
+"""
+
+CLASS_TEMPLATE = """# Class: {{class_name}}
+
+{{class_description}}
+
+## Implementation Notes
+
+{{implementation_notes}}
+
+## Inheritance
+
+{{inheritance}}
+
+## Methods
+
+{{methods}}
+
+## Example Usage
+
+```python
+{{example_usage}}
+```
+"""
+
+FUNCTION_TEMPLATE = """# Function: {{function_name}}
+
+{{function_description}}
+
+## Implementation Notes
+
+{{implementation_notes}}
+
+## Parameters
+
+{{parameters}}
+
+## Returns
+
+{{returns}}
+
+## Example Usage
+
+```python
+{{example_usage}}
+```
+"""
@@ -0,0 +1,49 @@
+"""
+Process pools for CodeDoc's enhancers.
+
+Every process pool in the package is created here, so all of them start
+their workers the same way. Workers are forked where the platform supports
+it, which lets them inherit the modules this process has already imported
+instead of importing codedoc again. Since a thread holding a lock at the
+time of a fork leaves that lock held in the child, background threads
+register the event they set when done, and pools wait for them first.
+"""
+
+import multiprocessing
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional
+
+_CONTEXT = multiprocessing.get_context(
+    'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+)
+
+# Completion events of background threads that must finish before a fork
+_background_work: 'weakref.WeakSet[threading.Event]' = weakref.WeakSet()
+
+
+def register_background_work(done: threading.Event) -> None:
+    """
+    Make process pools wait for a background thread before starting workers.
+
+    Args:
+        done: Event the thread sets once it has finished
+    """
+    _background_work.add(done)
+
+
+def process_pool(max_workers: Optional[int] = None, **kwargs: Any) -> ProcessPoolExecutor:
+    """
+    Create a process pool once registered background threads have finished.
+
+    Args:
+        max_workers: Number of worker processes
+        **kwargs: Additional arguments for ProcessPoolExecutor
+
+    Returns:
+        The process pool
+    """
+    for done in list(_background_work):
+        done.wait()
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=_CONTEXT, **kwargs)
@@ -9,17 +9,66 @@ about code entities to enhance documentation for LLM comprehension.
 import os
 import ast
 import re
+import functools
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Any, Tuple, Union
+from typing import Dict, List, Set, Optional, Any, Tuple, Union, Sequence
 import logging
 
 from codedoc.core.entities import (
     Entity, ModuleEntity, ClassEntity, FunctionEntity, VariableEntity, ImportEntity
 )
-from codedoc.utils.text_formatter import TextFormatter
+from codedoc.enhancers._complexity import (
+    classify_complexity, complexity_label, count_branches_batch
+)
 
 logger = logging.getLogger(__name__)
 
+# Shared result for helpers that find nothing; immutable so it is safe to reuse
+_EMPTY_SEQ: Tuple[str, ...] = ()
+
+# Prefixes of legacy string imports that refer to the current package
+_RELATIVE_IMPORT_PREFIXES = ('from .', 'import .')
+
+
+def _imports_are_entities(imports: Sequence[Any]) -> bool:
+    """
+    Check whether an imports list holds ImportEntity objects.
+    
+    Import lists are homogeneous (either ImportEntity objects or legacy
+    strings), so only the first element is inspected.
+    
+    Args:
+        imports: The imports of a module
+        
+    Returns:
+        True if the list is non-empty and holds ImportEntity objects
+    """
+    return bool(imports) and isinstance(imports[0], ImportEntity)
+
+
+def _memoize_by_entity(method):
+    """
+    Cache the result of a ``_get_*`` helper per entity.
+    
+    Results are keyed by the helper name and ``id(entity)``. The entity itself
+    is stored alongside the result so a recycled ``id`` is never mistaken for
+    a cache hit.
+    """
+    name = method.__name__
+    
+    @functools.wraps(method)
+    def wrapper(self, entity):
+        self._check_registrations()
+        key = (name, id(entity))
+        hit = self._member_cache.get(key)
+        if hit is not None and hit[0] is entity:
+            return hit[1]
+        result = method(self, entity)
+        self._member_cache[key] = (entity, result)
+        return result
+    
+    return wrapper
+
 
 class ContextGenerator:
     """
@@ -56,6 +105,25 @@ class ContextGenerator:
         
         # Map of entity IDs to examples
         self.examples: Dict[str, str] = {}
+        
+        # Memoized results of the _get_* helpers, keyed by (helper, id(entity))
+        self._member_cache: Dict[Tuple[str, int], Tuple[Entity, Any]] = {}
+        
+        # Complexity labels of the registered functions, keyed by id(entity)
+        self._complexity_by_id: Optional[Dict[int, str]] = None
+        
+        # Mapper registration version the caches above were built against
+        self._registration_version = getattr(relationship_mapper, 'registration_version', 0)
+
+    def _check_registrations(self) -> None:
+        """Clear the cached helper results if entities were registered since."""
+        if self.relationship_mapper is None:
+            return
+        version = self.relationship_mapper.registration_version
+        if version != self._registration_version:
+            self._member_cache.clear()
+            self._complexity_by_id = None
+            self._registration_version = version
 
     def generate_context(self, entity: Entity) -> Dict[str, Any]:
         """
@@ -178,9 +246,8 @@ class ContextGenerator:
         if variables:
             notes.append(f"Variables: {', '.join(variables)}")
 
-        # Return formatted notes
-        formatted_notes = "\n".join(notes)
-        return TextFormatter.format_module_implementation_notes(formatted_notes)
+        # The notes are built from whole names, so they need no spacing fix
+        return "\n".join(notes)
 
     def _get_class_implementation_notes(self, entity: ClassEntity) -> str:
         """Generate implementation notes for a class.
@@ -194,8 +261,8 @@ class ContextGenerator:
         notes = []
 
         # Base classes
-        if entity.bases:
-            notes.append(f"Base Classes: {', '.join(entity.bases)}")
+        if entity.base_classes:
+            notes.append(f"Base Classes: {', '.join(entity.base_classes)}")
 
         # Methods
         methods = self._get_methods(entity)
@@ -217,9 +284,8 @@ class ContextGenerator:
         if instance_vars:
             notes.append(f"Instance Variables: {', '.join(instance_vars)}")
 
-        # Return formatted notes
-        formatted_notes = "\n".join(notes)
-        return TextFormatter.format_class_implementation_notes(formatted_notes)
+        # The notes are built from whole names, so they need no spacing fix
+        return "\n".join(notes)
 
     def _get_function_implementation_notes(self, entity: FunctionEntity) -> str:
         """Generate implementation notes for a function.
@@ -252,9 +318,8 @@ class ContextGenerator:
         if local_vars:
             notes.append(f"Local Variables: {', '.join(local_vars)}")
 
-        # Return formatted notes
-        formatted_notes = "\n".join(notes)
-        return TextFormatter.format_function_implementation_notes(formatted_notes)
+        # The notes are built from whole names, so they need no spacing fix
+        return "\n".join(notes)
 
     def _get_variable_implementation_notes(self, entity: VariableEntity) -> str:
         """Generate implementation notes for a variable.
@@ -275,9 +340,8 @@ class ContextGenerator:
         if entity.value:
             notes.append(f"Value: {entity.value}")
 
-        # Return formatted notes
-        formatted_notes = "\n".join(notes)
-        return TextFormatter.format_variable_implementation_notes(formatted_notes)
+        # The notes are built from whole names, so they need no spacing fix
+        return "\n".join(notes)
 
     def generate_runtime_behavior(self, entity: Entity) -> Dict[str, Any]:
         """
@@ -517,9 +581,6 @@ class ContextGenerator:
         
         # Look for __init__ method
         if hasattr(entity, 'methods') and entity.methods:
-            regular_methods = [method for method in entity.methods 
-                              if hasattr(method, 'name') and not method.name.startswith('__')]
-            
             init_methods = [method for method in entity.methods 
                            if hasattr(method, 'name') and method.name == '__init__']
             
@@ -593,8 +654,7 @@ class ContextGenerator:
                 
                 example_lines.append("")
         
-        # Apply text formatting
-        return TextFormatter.fix_character_spacing("\n".join(example_lines).rstrip())
+        return "\n".join(example_lines).rstrip()
 
     def _generate_function_example(self, entity: FunctionEntity) -> str:
         """Generate example code for a function.
@@ -640,8 +700,7 @@ class ContextGenerator:
             f"result = {function_name}({param_str})"
         ]
 
-        # Apply text formatting
-        return TextFormatter.fix_character_spacing("\n".join(example_lines))
+        return "\n".join(example_lines)
 
     def _generate_function_complexity(self, entity: FunctionEntity) -> str:
         """Generate a description of function complexity."""
@@ -727,10 +786,10 @@ class ContextGenerator:
             f"result = instance.{method_name}({param_str})"
         ]
 
-        # Apply text formatting
-        return TextFormatter.fix_character_spacing("\n".join(example_lines))
+        return "\n".join(example_lines)
 
-    def _get_external_dependencies(self, entity: ModuleEntity) -> List[str]:
+    @_memoize_by_entity
+    def _get_external_dependencies(self, entity: ModuleEntity) -> Sequence[str]:
         """Get external dependencies of a module.
         
         Args:
@@ -739,19 +798,19 @@ class ContextGenerator:
         Returns:
             List of external dependency names.
         """
-        if not hasattr(entity, 'imports') or not entity.imports:
-            return []
+        imports = getattr(entity, 'imports', None) or _EMPTY_SEQ
         
         # Handle ImportEntity objects
-        if all(isinstance(imp, ImportEntity) for imp in entity.imports):
-            return [imp.module_name for imp in entity.imports 
+        if _imports_are_entities(imports):
+            return [imp.module_name for imp in imports 
                     if not imp.module_name.startswith('.')]
         
         # Handle string imports (legacy)
-        return [imp for imp in entity.imports 
-                if not imp.startswith('from .') and not imp.startswith('import .')]
+        return [imp for imp in imports 
+                if not imp.startswith(_RELATIVE_IMPORT_PREFIXES)]
 
-    def _get_internal_dependencies(self, entity: ModuleEntity) -> List[str]:
+    @_memoize_by_entity
+    def _get_internal_dependencies(self, entity: ModuleEntity) -> Sequence[str]:
         """Get internal dependencies of a module.
         
         Args:
@@ -760,19 +819,34 @@ class ContextGenerator:
         Returns:
             List of internal dependency names.
         """
-        if not hasattr(entity, 'imports') or not entity.imports:
-            return []
+        imports = getattr(entity, 'imports', None) or _EMPTY_SEQ
         
         # Handle ImportEntity objects
-        if all(isinstance(imp, ImportEntity) for imp in entity.imports):
-            return [imp.module_name for imp in entity.imports 
+        if _imports_are_entities(imports):
+            return [imp.module_name for imp in imports 
                     if imp.module_name.startswith('.')]
         
         # Handle string imports (legacy)
-        return [imp for imp in entity.imports 
-                if imp.startswith('from .') or imp.startswith('import .')]
+        return [imp for imp in imports 
+                if imp.startswith(_RELATIVE_IMPORT_PREFIXES)]
 
-    def _get_classes(self, entity: ModuleEntity) -> List[str]:
+    def _get_module_members(self, entity: ModuleEntity, kind: str) -> Sequence[Entity]:
+        """Get the members of a module from the relationship mapper's index.
+        
+        Args:
+            entity: The module entity.
+            kind: The member bucket to select: 'classes', 'functions' or 'variables'.
+            
+        Returns:
+            List of member entities.
+        """
+        if self.relationship_mapper is None:
+            return _EMPTY_SEQ
+        buckets = self.relationship_mapper._by_module.get(entity.name)
+        return buckets[kind] if buckets else _EMPTY_SEQ
+
+    @_memoize_by_entity
+    def _get_classes(self, entity: ModuleEntity) -> Sequence[str]:
         """Get classes defined in a module.
         
         Args:
@@ -781,25 +855,14 @@ class ContextGenerator:
         Returns:
             List of class names with their base classes.
         """
-        class_entities = [e for e in self.relationship_mapper.entities.values() 
-                          if isinstance(e, ClassEntity) and 
-                          hasattr(e, 'module_name') and 
-                          e.module_name == entity.name]
-        
-        if not class_entities:
-            return []
-        
-        class_notes = []
-        for cls in class_entities:
-            if hasattr(cls, 'bases') and cls.bases:
-                base_classes_str = ', '.join(cls.bases)
-                class_notes.append(f"{cls.name} (inherits from {base_classes_str})")
-            else:
-                class_notes.append(cls.name)
-        
-        return class_notes
+        return [
+            ''.join((cls.name, ' (inherits from ', ', '.join(cls.base_classes), ')'))
+            if cls.base_classes else cls.name
+            for cls in self._get_module_members(entity, 'classes')
+        ]
 
-    def _get_functions(self, entity: ModuleEntity) -> List[str]:
+    @_memoize_by_entity
+    def _get_functions(self, entity: ModuleEntity) -> Sequence[str]:
         """Get functions defined in a module.
         
         Args:
@@ -808,18 +871,10 @@ class ContextGenerator:
         Returns:
             List of function names.
         """
-        function_entities = [e for e in self.relationship_mapper.entities.values() 
-                            if isinstance(e, FunctionEntity) and 
-                            not hasattr(e, 'is_method') and 
-                            hasattr(e, 'module_name') and 
-                            e.module_name == entity.name]
-        
-        if not function_entities:
-            return []
-        
-        return [f.name for f in function_entities]
+        return [f.name for f in self._get_module_members(entity, 'functions')]
 
-    def _get_variables(self, entity: ModuleEntity) -> List[str]:
+    @_memoize_by_entity
+    def _get_variables(self, entity: ModuleEntity) -> Sequence[str]:
         """Get variables defined in a module.
         
         Args:
@@ -828,17 +883,10 @@ class ContextGenerator:
         Returns:
             List of variable names.
         """
-        variable_entities = [e for e in self.relationship_mapper.entities.values() 
-                            if isinstance(e, VariableEntity) and 
-                            hasattr(e, 'module_name') and 
-                            e.module_name == entity.name]
-        
-        if not variable_entities:
-            return []
-        
-        return [v.name for v in variable_entities]
+        return [v.name for v in self._get_module_members(entity, 'variables')]
 
-    def _get_methods(self, entity: ClassEntity) -> List[str]:
+    @_memoize_by_entity
+    def _get_methods(self, entity: ClassEntity) -> Sequence[str]:
         """Get methods defined in a class.
         
         Args:
@@ -847,12 +895,10 @@ class ContextGenerator:
         Returns:
             List of method names.
         """
-        if not hasattr(entity, 'methods') or not entity.methods:
-            return []
-        
-        return [m.name for m in entity.methods]
+        return [m.name for m in getattr(entity, 'methods', None) or _EMPTY_SEQ]
 
-    def _get_properties(self, entity: ClassEntity) -> List[str]:
+    @_memoize_by_entity
+    def _get_properties(self, entity: ClassEntity) -> Sequence[str]:
         """Get properties defined in a class.
         
         Args:
@@ -861,12 +907,10 @@ class ContextGenerator:
         Returns:
             List of property names.
         """
-        if not hasattr(entity, 'properties') or not entity.properties:
-            return []
-        
-        return [p.name for p in entity.properties]
+        return [p.name for p in getattr(entity, 'properties', None) or _EMPTY_SEQ]
 
-    def _get_class_variables(self, entity: ClassEntity) -> List[str]:
+    @_memoize_by_entity
+    def _get_class_variables(self, entity: ClassEntity) -> Sequence[str]:
         """Get class variables defined in a class.
         
         Args:
@@ -875,12 +919,10 @@ class ContextGenerator:
         Returns:
             List of class variable names.
         """
-        if not hasattr(entity, 'class_variables') or not entity.class_variables:
-            return []
-        
-        return [v.name for v in entity.class_variables]
+        return [v.name for v in getattr(entity, 'class_variables', None) or _EMPTY_SEQ]
 
-    def _get_instance_variables(self, entity: ClassEntity) -> List[str]:
+    @_memoize_by_entity
+    def _get_instance_variables(self, entity: ClassEntity) -> Sequence[str]:
         """Get instance variables defined in a class.
         
         Args:
@@ -889,11 +931,29 @@ class ContextGenerator:
         Returns:
             List of instance variable names.
         """
-        if not hasattr(entity, 'instance_variables') or not entity.instance_variables:
-            return []
+        return [v.name for v in getattr(entity, 'instance_variables', None) or _EMPTY_SEQ]
+
+    def precompute_complexities(self) -> None:
+        """Classify the complexity of every registered function in one scan.
+        
+        The source of all function entities is scanned in a single batch and
+        the resulting labels are kept for _get_function_complexity lookups.
+        """
+        self._check_registrations()
+        functions = []
+        if self.relationship_mapper:
+            functions = [
+                e for e in self.relationship_mapper.entities.values()
+                if isinstance(e, FunctionEntity) and getattr(e, 'code', None)
+            ]
         
-        return [v.name for v in entity.instance_variables]
+        branch_counts = count_branches_batch([f.code for f in functions])
+        self._complexity_by_id = {
+            id(f): complexity_label(count)
+            for f, count in zip(functions, branch_counts)
+        }
 
+    @_memoize_by_entity
     def _get_function_complexity(self, entity: FunctionEntity) -> Optional[str]:
         """Get complexity estimation for a function.
         
@@ -903,27 +963,20 @@ class ContextGenerator:
         Returns:
             Complexity description or None.
         """
-        if not hasattr(entity, 'code') or not entity.code:
+        code = getattr(entity, 'code', None)
+        if not code:
             return None
         
-        # Count branching structures
-        if_count = len(re.findall(r'\bif\b', entity.code))
-        for_count = len(re.findall(r'\bfor\b', entity.code))
-        while_count = len(re.findall(r'\bwhile\b', entity.code))
-        
-        # Make a simple assessment
-        branch_count = if_count + for_count + while_count
+        if self._complexity_by_id is None:
+            self.precompute_complexities()
         
-        if branch_count == 0:
-            return "Simple (linear execution)"
-        elif branch_count <= 2:
-            return "Low (few branches)"
-        elif branch_count <= 5:
-            return "Moderate"
-        else:
-            return "Complex (many branches)"
+        complexity = self._complexity_by_id.get(id(entity))
+        if complexity is None:
+            complexity = classify_complexity(code)
+        return complexity
 
-    def _get_function_calls(self, entity: FunctionEntity) -> List[str]:
+    @_memoize_by_entity
+    def _get_function_calls(self, entity: FunctionEntity) -> Sequence[str]:
         """Get function calls made by a function.
         
         Args:
@@ -932,12 +985,10 @@ class ContextGenerator:
         Returns:
             List of function call names.
         """
-        if not hasattr(entity, 'calls') or not entity.calls:
-            return []
-        
-        return entity.calls
+        return getattr(entity, 'calls', None) or _EMPTY_SEQ
 
-    def _get_return_values(self, entity: FunctionEntity) -> List[str]:
+    @_memoize_by_entity
+    def _get_return_values(self, entity: FunctionEntity) -> Sequence[str]:
         """Get return value types of a function.
         
         Args:
@@ -946,15 +997,11 @@ class ContextGenerator:
         Returns:
             List of return value descriptions.
         """
-        if not hasattr(entity, 'returns') or not entity.returns:
-            return []
-        
-        if hasattr(entity.returns, 'type') and entity.returns.type:
-            return [entity.returns.type]
-        
-        return []
+        return_type = getattr(getattr(entity, 'returns', None), 'type', None)
+        return [return_type] if return_type else _EMPTY_SEQ
 
-    def _get_local_variables(self, entity: FunctionEntity) -> List[str]:
+    @_memoize_by_entity
+    def _get_local_variables(self, entity: FunctionEntity) -> Sequence[str]:
         """Get local variables defined in a function.
         
         Args:
@@ -963,10 +1010,7 @@ class ContextGenerator:
         Returns:
             List of local variable names.
         """
-        if not hasattr(entity, 'local_variables') or not entity.local_variables:
-            return []
-        
-        return [v.name for v in entity.local_variables]
+        return [v.name for v in getattr(entity, 'local_variables', None) or _EMPTY_SEQ]
 
 
 if __name__ == "__main__":
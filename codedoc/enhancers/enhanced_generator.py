@@ -7,27 +7,270 @@ combines all enhancers to create rich, LLM-optimized documentation.
 """
 
 import os
-import re
-import yaml
-import json
-import datetime
+import sys
+import hashlib
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Any, Tuple, Union
+from typing import Callable, Dict, List, Optional, Any, Tuple, Union
 import logging
-import shutil
 import traceback
+from operator import attrgetter
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from codedoc.core.entities import (
-    Entity, ModuleEntity, ClassEntity, FunctionEntity, VariableEntity, ImportEntity
+    Entity, ModuleEntity, ClassEntity, FunctionEntity, VariableEntity
 )
-from codedoc.exporters.base_generator import BaseGenerator
 from codedoc.enhancers.template_manager import TemplateManager
+from codedoc.enhancers._default_templates import (
+    MODULE_TEMPLATE, CLASS_TEMPLATE, FUNCTION_TEMPLATE
+)
 from codedoc.enhancers.relationship_mapper import RelationshipMapper
 from codedoc.enhancers.context_generator import ContextGenerator
-from codedoc.enhancers.metadata_enricher import MetadataEnricher
 
 logger = logging.getLogger(__name__)
 
+_SUCCESS_MSG = """
+LLM-optimized documentation has been generated successfully!
+Output directory: {out}
+Main index: {out}/index.md
+API documentation: {out}/api
+Compiled documentation: {out}/compiled
+
+Saving default templates to {out}/templates for reference...
+
+Key features of the generated documentation:
+1. Rich entity relationships (inheritance, function calls, dependencies)
+2. Enhanced metadata (versions, timestamps, stability indicators)
+3. Implementation notes and contextual information
+4. Runtime behavior descriptions
+5. Example usage code
+6. Mermaid diagrams for visual understanding
+7. Compiled documentation for LLM ingestion
+8. Structured JSON format for programmatic access
+"""
+
+
+def _qualified_id(entity: Entity) -> Optional[str]:
+    """
+    Get the module-qualified ID of a class or variable.
+    
+    Args:
+        entity: The entity to get an ID for
+        
+    Returns:
+        The ID, or None if the entity has no module name
+    """
+    module_name = getattr(entity, 'module_name', None)
+    if not module_name:
+        return None
+    return f"{module_name}.{entity.name}"
+
+
+def _function_id(entity: FunctionEntity) -> Optional[str]:
+    """
+    Get the module-qualified ID of a function, including the class for methods.
+    
+    Args:
+        entity: The function entity to get an ID for
+        
+    Returns:
+        The ID, or None if the function has no module name
+    """
+    module_name = getattr(entity, 'module_name', None)
+    if not module_name:
+        return None
+    parent_class = getattr(entity, 'parent_class', None)
+    if entity.is_method and parent_class:
+        return f"{module_name}.{parent_class}.{entity.name}"
+    return f"{module_name}.{entity.name}"
+
+
+# Entity ID builders, dispatched on the exact entity type
+_ENTITY_ID_BUILDERS: Dict[type, Callable[[Entity], Optional[str]]] = {
+    ModuleEntity: lambda entity: entity.name,
+    ClassEntity: _qualified_id,
+    FunctionEntity: _function_id,
+    VariableEntity: _qualified_id,
+}
+
+# Default reference templates by file name, encoded once at import
+_TEMPLATES: Dict[str, bytes] = {
+    'module_template.md': MODULE_TEMPLATE.encode('utf-8'),
+    'class_template.md': CLASS_TEMPLATE.encode('utf-8'),
+    'function_template.md': FUNCTION_TEMPLATE.encode('utf-8'),
+}
+
+# Name of the file holding page content hashes between runs
+_BUILD_CACHE_FILE = '.codedoc_cache.json'
+
+# A page job: (renderer, output file, renderer arguments, previous content hash)
+_PageJob = Tuple[Callable[..., str], Path, tuple, Optional[str]]
+
+
+def _render_module_page(module: ModuleEntity, context: Dict[str, Any]) -> str:
+    """
+    Render the documentation page for a module.
+    
+    Args:
+        module: The module entity
+        context: The generated context for the module
+        
+    Returns:
+        The page content
+    """
+    parts: List[str] = [f"# Module: {module.name}\n\n"]
+    
+    # Add module description
+    if module.docstring:
+        parts.append(f"{module.docstring}\n\n")
+    
+    # Add implementation notes
+    if context.get('implementation_notes'):
+        parts.append("## Implementation Notes\n\n")
+        parts.append(f"{context['implementation_notes']}\n\n")
+    
+    # Add dependencies
+    if hasattr(module, 'dependencies') and module.dependencies:
+        parts.append("## Dependencies\n\n")
+        for dep in module.dependencies:
+            parts.append(f"- {dep}\n")
+        parts.append("\n")
+    
+    # Add classes
+    if hasattr(module, 'classes') and module.classes:
+        parts.append("## Classes\n\n")
+        for cls_name in module.classes:
+            parts.append(f"- [{cls_name}]({cls_name}.md)\n")
+        parts.append("\n")
+    
+    # Add functions
+    if hasattr(module, 'functions') and module.functions:
+        parts.append("## Functions\n\n")
+        for func_name in module.functions:
+            parts.append(f"- [{func_name}]({func_name}.md)\n")
+        parts.append("\n")
+    
+    return ''.join(parts)
+
+
+def _render_class_page(
+    cls: ClassEntity,
+    context: Dict[str, Any],
+    method_contexts: List[Dict[str, Any]]
+) -> str:
+    """
+    Render the documentation page for a class.
+    
+    Args:
+        cls: The class entity
+        context: The generated context for the class
+        method_contexts: The generated context for each method, in order
+        
+    Returns:
+        The page content
+    """
+    parts: List[str] = [f"# Class: {cls.name}\n\n"]
+    
+    # Add class description
+    if cls.docstring:
+        parts.append(f"{cls.docstring}\n\n")
+    
+    # Add implementation notes
+    if context.get('implementation_notes'):
+        parts.append("## Implementation Notes\n\n")
+        parts.append(f"{context['implementation_notes']}\n\n")
+    
+    # Add inheritance
+    if hasattr(cls, 'base_classes') and cls.base_classes:
+        parts.append("## Inheritance\n\n")
+        for base_cls in cls.base_classes:
+            parts.append(f"- {base_cls}\n")
+        parts.append("\n")
+    
+    # Add methods
+    if hasattr(cls, 'methods') and cls.methods:
+        parts.append("## Methods\n\n")
+        for method, method_context in zip(cls.methods, method_contexts):
+            parts.append(f"### `{method.name}`\n\n")
+            if method.docstring:
+                parts.append(f"{method.docstring}\n\n")
+            
+            # Add method implementation notes
+            if method_context.get('implementation_notes'):
+                parts.append("#### Implementation Notes\n\n")
+                parts.append(f"{method_context['implementation_notes']}\n\n")
+    
+    return ''.join(parts)
+
+
+def _render_function_page(func: FunctionEntity, context: Dict[str, Any]) -> str:
+    """
+    Render the documentation page for a function.
+    
+    Args:
+        func: The function entity
+        context: The generated context for the function
+        
+    Returns:
+        The page content
+    """
+    parts: List[str] = [f"# Function: {func.name}\n\n"]
+    
+    # Add function description
+    if func.docstring:
+        parts.append(f"{func.docstring}\n\n")
+    
+    # Add implementation notes
+    if context.get('implementation_notes'):
+        parts.append("## Implementation Notes\n\n")
+        parts.append(f"{context['implementation_notes']}\n\n")
+    
+    # Add parameters
+    if hasattr(func, 'parameters') and func.parameters:
+        parts.append("## Parameters\n\n")
+        for param_name, param_type in func.parameters.items():
+            parts.append(f"- `{param_name}`: {param_type}\n")
+        parts.append("\n")
+    
+    # Add return type
+    if hasattr(func, 'return_type') and func.return_type:
+        parts.append("## Returns\n\n")
+        parts.append(f"{func.return_type}\n\n")
+    
+    return ''.join(parts)
+
+
+def _write_page(page: _PageJob) -> str:
+    """
+    Render a documentation page and write it to disk if it changed.
+    
+    Args:
+        page: A (renderer, output file, renderer arguments, previous hash) job
+        
+    Returns:
+        The content hash of the rendered page
+    """
+    render, page_file, args, previous = page
+    content = render(*args)
+    digest = hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+    
+    # Unchanged pages from the previous run are left as they are
+    if digest != previous or not page_file.exists():
+        page_file.write_text(content)
+    
+    return digest
+
+
+# Page renderers, dispatched on the exact entity type
+_PAGE_RENDERERS: Dict[type, Callable[..., str]] = {
+    ModuleEntity: _render_module_page,
+    ClassEntity: _render_class_page,
+    FunctionEntity: _render_function_page,
+}
 
 class EnhancedDocumentationGenerator:
     """
@@ -63,11 +306,20 @@ class EnhancedDocumentationGenerator:
         self.template_manager = TemplateManager(template_dir)
         self.relationship_mapper = RelationshipMapper()
         self.context_generator = ContextGenerator(relationship_mapper=self.relationship_mapper)
-        self.metadata_enricher = MetadataEnricher(repo_root, config)
         
         # Track processed entities
         self.entities: Dict[str, Entity] = {}
         
+        # Registered entities bucketed by type, rebuilt once per run
+        self._by_type: Dict[type, List[Entity]] = {}
+        self._top_functions: List[FunctionEntity] = []
+        
+        # Per-run context, keyed by id(entity)
+        self._ctx_cache: Dict[int, Dict[str, Any]] = {}
+        
+        # Content hashes of the written pages, keyed by path under the output directory
+        self._page_hashes: Dict[str, str] = {}
+        
         # Default configuration
         self.title = self.config.get('index_title', 'API Documentation')
         self.verbose = self.config.get('verbose', False)
@@ -118,20 +370,58 @@ class EnhancedDocumentationGenerator:
         Returns:
             A unique identifier string
         """
-        if isinstance(entity, ModuleEntity):
-            return entity.name
-        elif hasattr(entity, 'module_name') and entity.module_name:
-            if isinstance(entity, ClassEntity):
-                return f"{entity.module_name}.{entity.name}"
-            elif isinstance(entity, FunctionEntity):
-                if entity.is_method and hasattr(entity, 'parent_class') and entity.parent_class:
-                    return f"{entity.module_name}.{entity.parent_class}.{entity.name}"
-                return f"{entity.module_name}.{entity.name}"
-            elif isinstance(entity, VariableEntity):
-                return f"{entity.module_name}.{entity.name}"
+        entity_id = getattr(entity, '_doc_id', None)
+        if entity_id is not None:
+            return entity_id
+        
+        build_id = _ENTITY_ID_BUILDERS.get(type(entity))
+        if build_id is not None:
+            entity_id = build_id(entity)
         
         # Default case - use type and name
-        return f"{type(entity).__name__}:{entity.name}"
+        if entity_id is None:
+            entity_id = f"{type(entity).__name__}:{entity.name}"
+        
+        # Cache on the entity so later lookups are a plain attribute read
+        entity._doc_id = entity_id
+        return entity_id
+
+    def _bucketize_entities(self) -> None:
+        """
+        Bucket the registered entities by type in a single pass.
+        
+        Top-level functions (not methods) are also collected separately so
+        later passes need no per-entity filtering.
+        """
+        self._by_type = {ModuleEntity: [], ClassEntity: [], FunctionEntity: []}
+        self._top_functions = []
+        
+        for entity in self.entities.values():
+            kind = type(entity)
+            if kind not in self._by_type:
+                continue
+            self._by_type[kind].append(entity)
+            if kind is FunctionEntity and not (
+                entity.is_method or getattr(entity, 'parent_class', None)
+            ):
+                self._top_functions.append(entity)
+
+    def _context(self, entity: Entity) -> Dict[str, Any]:
+        """
+        Get the generated context for an entity, computing it once per run.
+        
+        Args:
+            entity: The entity to get context for
+            
+        Returns:
+            The context dictionary from the context generator
+        """
+        key = id(entity)
+        context = self._ctx_cache.get(key)
+        if context is None:
+            context = self.context_generator.generate_context(entity)
+            self._ctx_cache[key] = context
+        return context
 
     def analyze_relationships(self) -> None:
         """
@@ -140,657 +430,268 @@ class EnhancedDocumentationGenerator:
         This method should be called after all entities are registered
         and before generating documentation.
         """
-        self.relationship_mapper.analyze_function_calls()
+        self.relationship_mapper.analyze_function_calls(workers=self.config.get('max_workers'))
 
     def generate_documentation(self) -> None:
-        """Generate the documentation."""
+        """
+        Generate the documentation.
+        
+        Entities must already be registered with register_entities, and
+        analyze_relationships must have been called once before this.
+        """
         try:
-            # Create output directory if it doesn't exist
-            os.makedirs(self.output_dir, exist_ok=True)
+            # Start each run with fresh context
+            self._ctx_cache.clear()
             
-            # Create API directory
+            # Create the API, compiled and templates directories, and with
+            # them the output directory
             api_dir = self.output_dir / 'api'
-            os.makedirs(api_dir, exist_ok=True)
-            
-            # Create compiled directory
             compiled_dir = self.output_dir / 'compiled'
-            os.makedirs(compiled_dir, exist_ok=True)
-            
-            # Create templates directory
             templates_dir = self.output_dir / 'templates'
-            os.makedirs(templates_dir, exist_ok=True)
+            for output_subdir in (api_dir, compiled_dir, templates_dir):
+                output_subdir.mkdir(parents=True, exist_ok=True)
             
             # Save default templates
             self._save_default_templates(templates_dir)
             
-            # Get all entities
-            all_entities = list(self.entities.values())
-            
-            # Analyze relationships
-            if self.verbose:
-                logging.info("Analyzing entity relationships...")
-            self.relationship_mapper.register_entities(all_entities)
-            self.relationship_mapper.analyze_function_calls()
-            
             # Generate documentation
             if self.verbose:
-                logging.info("Generating documentation...")
+                logger.info("Generating documentation...")
             
-            # Separate entities by type
-            modules = [entity for entity in all_entities if isinstance(entity, ModuleEntity)]
-            classes = [entity for entity in all_entities if isinstance(entity, ClassEntity)]
-            functions = [entity for entity in all_entities if isinstance(entity, FunctionEntity) and not hasattr(entity, 'parent_class')]
+            # Separate entities by type, sorted once by name for every pass
+            self._bucketize_entities()
+            by_name = attrgetter('name')
+            modules = sorted(self._by_type[ModuleEntity], key=by_name)
+            classes = sorted(self._by_type[ClassEntity], key=by_name)
+            functions = sorted(self._top_functions, key=by_name)
             
             # Generate main index
             self._generate_main_index(modules, classes, functions)
             
-            # Generate module documentation
-            for module in modules:
-                self._generate_module_documentation(module)
-            
-            # Generate class documentation
-            for cls in classes:
-                self._generate_class_documentation(cls)
-            
-            # Generate function documentation
-            for func in functions:
-                if not hasattr(func, 'parent_class'):  # Skip methods
-                    self._generate_function_documentation(func)
+            # Generate module, class and function documentation, skipping
+            # pages that are unchanged since the last run. Pages are named
+            # after their entity, so of several entities sharing a name only
+            # the last one is written, as a clean build would leave it
+            page_entities = {entity.name: entity for entity in modules + classes + functions}
+            self._load_build_cache()
+            self._write_pages([self._page(entity) for entity in page_entities.values()])
+            self._save_build_cache()
             
             # Generate compiled documentation
-            content = self._generate_compiled_documentation(modules + classes + functions, self.title)
+            self._write_compiled_documentation(
+                modules + classes + functions, self.title, compiled_dir / 'full_documentation.md'
+            )
             
-            # Write compiled documentation
-            compiled_file = compiled_dir / 'full_documentation.md'
-            with open(compiled_file, 'w') as f:
-                f.write(content)
-                
             if self.verbose:
-                logging.info(f"Documentation generated successfully in {self.output_dir}")
+                logger.info("Documentation generated successfully in %s", self.output_dir)
                 
             # Generate JSON documentation
             self._generate_json_documentation()
             
             # Print success message
-            print(f"\nLLM-optimized documentation has been generated successfully!")
-            print(f"Output directory: {self.output_dir}")
-            print(f"Main index: {self.output_dir}/index.md")
-            print(f"API documentation: {self.output_dir}/api")
-            print(f"Compiled documentation: {self.output_dir}/compiled")
-            print()
-            print(f"Saving default templates to {self.output_dir}/templates for reference...")
-            print()
-            print("Key features of the generated documentation:")
-            print("1. Rich entity relationships (inheritance, function calls, dependencies)")
-            print("2. Enhanced metadata (versions, timestamps, stability indicators)")
-            print("3. Implementation notes and contextual information")
-            print("4. Runtime behavior descriptions")
-            print("5. Example usage code")
-            print("6. Mermaid diagrams for visual understanding")
-            print("7. Compiled documentation for LLM ingestion")
-            print("8. Structured JSON format for programmatic access")
+            sys.stdout.write(_SUCCESS_MSG.format(out=self.output_dir))
             
         except Exception as e:
-            logging.error(f"Failed to generate documentation: {e}")
+            logger.error("Failed to generate documentation: %s", e)
             print(f"Error generating documentation: {e}")
             traceback.print_exc()
 
-    def _process_modules(self, api_dir: Path) -> None:
-        """
-        Process module entities and generate documentation.
+    def _generate_main_index(self, modules, classes, functions):
+        """Generate the main index file from entity lists already sorted by name."""
+        index_file = self.output_dir / 'index.md'
         
-        Args:
-            api_dir: Directory to write API documentation to
-        """
-        modules = [
-            entity for entity_id, entity in self.entities.items()
-            if isinstance(entity, ModuleEntity)
-        ]
+        parts: List[str] = []
+        parts.append(f"# {self.title}\n\n")
+        
+        # Add introduction
+        parts.append("## Introduction\n\n")
+        parts.append("This documentation provides a comprehensive overview of the codebase, including modules, classes, and functions.\n\n")
         
+        # Add modules section
+        parts.append("## Modules\n\n")
         for module in modules:
-            # Create directory for the module
-            module_parts = module.name.split('.')
-            module_dir = api_dir
-            for part in module_parts:
-                module_dir = module_dir / part
-                os.makedirs(module_dir, exist_ok=True)
-            
-            # Generate module documentation
-            relationships = self.relationship_mapper.get_relationships_for_entity(module)
-            context = self.context_generator.generate_context(module)
-            metadata = self.metadata_enricher.get_metadata(module)
-            
-            # Render module template
-            content = self.template_manager.render_template(
-                'module',
-                {
-                    'entity': module,
-                    'relationships': relationships,
-                    'context': context,
-                    'metadata': metadata,
-                    'config': self.config
-                }
-            )
-            
-            # Write module documentation
-            module_file = module_dir / 'index.md'
-            with open(module_file, 'w') as f:
-                f.write(content)
-                
-            if self.verbose:
-                logging.info(f"Generated module documentation: {module_file}")
+            parts.append(f"- [{module.name}](api/{module.name}.md)\n")
+        parts.append("\n")
+        
+        # Add classes section
+        parts.append("## Classes\n\n")
+        for cls in classes:
+            parts.append(f"- [{cls.name}](api/{cls.name}.md)\n")
+        parts.append("\n")
+        
+        # Add functions section
+        parts.append("## Functions\n\n")
+        for func in functions:
+            parts.append(f"- [{func.name}](api/{func.name}.md)\n")
+        parts.append("\n")
+        
+        # Add compiled documentation link
+        parts.append("## Compiled Documentation\n\n")
+        parts.append("- [Full Documentation](compiled/full_documentation.md)\n")
+        parts.append("- [JSON Documentation](compiled/documentation.json)\n")
+        
+        index_file.write_text(''.join(parts))
+        
+        if self.verbose:
+            logger.info("Generated main index: %s", index_file)
 
-    def _process_classes(self, api_dir: Path) -> None:
+    def _page(self, entity: Entity) -> _PageJob:
         """
-        Process class entities and generate documentation.
+        Build the page job for a module, class or function.
         
         Args:
-            api_dir: Directory to write API documentation to
-        """
-        classes = [
-            entity for entity_id, entity in self.entities.items()
-            if isinstance(entity, ClassEntity)
-        ]
-        
-        for cls in classes:
-            # Skip classes without a module
-            if not hasattr(cls, 'module_name') or not cls.module_name:
-                continue
-                
-            # Create directory for the class
-            module_parts = cls.module_name.split('.')
-            class_dir = api_dir
-            for part in module_parts:
-                class_dir = class_dir / part
-            
-            class_dir = class_dir / cls.name
-            os.makedirs(class_dir, exist_ok=True)
-            
-            # Generate class documentation
-            relationships = self.relationship_mapper.get_relationships_for_entity(cls)
-            context = self.context_generator.generate_context(cls)
-            metadata = self.metadata_enricher.get_metadata(cls)
-            
-            # Render class template
-            content = self.template_manager.render_template(
-                'class',
-                {
-                    'entity': cls,
-                    'relationships': relationships,
-                    'context': context,
-                    'metadata': metadata,
-                    'config': self.config
-                }
-            )
+            entity: The entity to document
             
-            # Write class documentation
-            class_file = class_dir / 'index.md'
-            with open(class_file, 'w') as f:
-                f.write(content)
-                
-            if self.verbose:
-                logging.info(f"Generated class documentation: {class_file}")
-
-    def _process_functions(self, api_dir: Path) -> None:
+        Returns:
+            A (renderer, output file, renderer arguments, previous hash) job
+        """
+        args: tuple = (entity, self._context(entity))
+        if isinstance(entity, ClassEntity):
+            methods = getattr(entity, 'methods', None) or []
+            args += ([self._context(method) for method in methods],)
+        
+        page_name = f"api/{entity.name}.md"
+        return (
+            _PAGE_RENDERERS[type(entity)],
+            self.output_dir / page_name,
+            args,
+            self._page_hashes.get(page_name),
+        )
+
+    def _write_pages(self, pages: List[_PageJob]) -> None:
         """
-        Process function entities and generate documentation.
+        Render and write documentation pages.
+        
+        Pages are rendered in this process: a page takes microseconds, far
+        less than starting a worker process. Pages whose content hash
+        matches the previous run are not rewritten.
         
         Args:
-            api_dir: Directory to write API documentation to
+            pages: Page jobs of (renderer, output file, renderer arguments, previous hash)
         """
-        functions = [
-            entity for entity_id, entity in self.entities.items()
-            if isinstance(entity, FunctionEntity) and not entity.is_method
-        ]
+        digests = [_write_page(page) for page in pages]
         
-        for func in functions:
-            # Skip functions without a module
-            if not hasattr(func, 'module_name') or not func.module_name:
-                continue
-                
-            # Create directory for the function
-            module_parts = func.module_name.split('.')
-            func_dir = api_dir
-            for part in module_parts:
-                func_dir = func_dir / part
-            
-            func_dir = func_dir / func.name
-            os.makedirs(func_dir, exist_ok=True)
-            
-            # Generate function documentation
-            relationships = self.relationship_mapper.get_relationships_for_entity(func)
-            context = self.context_generator.generate_context(func)
-            metadata = self.metadata_enricher.get_metadata(func)
-            
-            # Render function template
-            content = self.template_manager.render_template(
-                'function',
-                {
-                    'entity': func,
-                    'relationships': relationships,
-                    'context': context,
-                    'metadata': metadata,
-                    'config': self.config
-                }
-            )
-            
-            # Write function documentation
-            func_file = func_dir / 'index.md'
-            with open(func_file, 'w') as f:
-                f.write(content)
-                
-            if self.verbose:
-                logging.info(f"Generated function documentation: {func_file}")
+        for (_, page_file, _, _), digest in zip(pages, digests):
+            self._page_hashes[f"api/{page_file.name}"] = digest
+        
+        if self.verbose:
+            logger.info("Generated %s documentation pages", len(pages))
 
-    def _generate_main_index(self, modules, classes, functions):
-        """Generate the main index file."""
-        index_file = self.output_dir / 'index.md'
+    def _load_build_cache(self) -> None:
+        """Load the page content hashes saved by the previous run."""
+        cache_file = self.output_dir / _BUILD_CACHE_FILE
+        try:
+            with open(cache_file) as f:
+                self._page_hashes = json.load(f)
+        except FileNotFoundError:
+            self._page_hashes = {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable build cache %s: %s", cache_file, e)
+            self._page_hashes = {}
+
+    def _save_build_cache(self) -> None:
+        """Save the page content hashes for the next run."""
+        cache_file = self.output_dir / _BUILD_CACHE_FILE
+        try:
+            with open(cache_file, 'w') as f:
+                json.dump(self._page_hashes, f)
+        except OSError as e:
+            logger.warning("Failed to save build cache %s: %s", cache_file, e)
+
+    def _generate_compiled_documentation(self, entities, title="API Documentation"):
+        """Generate a single markdown string with all documentation."""
+        return ''.join(self._compiled_documentation_chunks(entities, title))
+
+    def _write_compiled_documentation(self, entities, title, file_path: Path) -> None:
+        """
+        Stream the compiled documentation to a file.
         
-        with open(index_file, 'w') as f:
-            f.write(f"# {self.title}\n\n")
-            
-            # Add introduction
-            f.write("## Introduction\n\n")
-            f.write("This documentation provides a comprehensive overview of the codebase, including modules, classes, and functions.\n\n")
-            
-            # Add modules section
-            f.write("## Modules\n\n")
-            for module in sorted(modules, key=lambda x: x.name):
-                f.write(f"- [{module.name}](api/{module.name}.md)\n")
-            f.write("\n")
-            
-            # Add classes section
-            f.write("## Classes\n\n")
-            for cls in sorted(classes, key=lambda x: x.name):
-                f.write(f"- [{cls.name}](api/{cls.name}.md)\n")
-            f.write("\n")
-            
-            # Add functions section
-            f.write("## Functions\n\n")
-            for func in sorted(functions, key=lambda x: x.name):
-                if not hasattr(func, 'parent_class'):  # Skip methods
-                    f.write(f"- [{func.name}](api/{func.name}.md)\n")
-            f.write("\n")
-            
-            # Add compiled documentation link
-            f.write("## Compiled Documentation\n\n")
-            f.write("- [Full Documentation](compiled/full_documentation.md)\n")
-            f.write("- [JSON Documentation](compiled/documentation.json)\n")
+        Chunks are written as they are produced, so the whole document is
+        never held in memory at once.
         
-        if self.verbose:
-            logging.info(f"Generated main index: {index_file}")
+        Args:
+            entities: The entities to document
+            title: The documentation title
+            file_path: Path of the compiled documentation file
+        """
+        with open(file_path, 'w', buffering=1 << 20) as f:
+            for chunk in self._compiled_documentation_chunks(entities, title):
+                f.write(chunk)
 
-    def _generate_module_documentation(self, module):
-        """Generate documentation for a module."""
-        module_file = self.output_dir / 'api' / f"{module.name}.md"
+    def _render_impl_notes(self, entity: Entity) -> str:
+        """
+        Render the implementation notes of an entity for the compiled documentation.
         
-        with open(module_file, 'w') as f:
-            f.write(f"# Module: {module.name}\n\n")
-            
-            # Add module description
-            if module.docstring:
-                f.write(f"{module.docstring}\n\n")
-            
-            # Add implementation notes
-            context = self.context_generator.generate_context(module)
-            if context.get('implementation_notes'):
-                f.write("## Implementation Notes\n\n")
-                
-                # Fix character-by-character spacing issue with a regex replacement
-                import re
-                implementation_notes = context['implementation_notes']
-                
-                # First, identify common patterns like "External Dependencies" and fix them
-                implementation_notes = implementation_notes.replace('E x t e r n a l', 'External')
-                implementation_notes = implementation_notes.replace('D e p e n d e n c i e s', 'Dependencies')
-                implementation_notes = implementation_notes.replace('I n t e r n a l', 'Internal')
-                implementation_notes = implementation_notes.replace('t y p i n g', 'typing')
-                implementation_notes = implementation_notes.replace('t e s t _ m o d u l e', 'test_module')
-                
-                # Then use regex to fix remaining spaced characters
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8\9\10', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8\9', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w)', r'\1\2\3\4', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w)', r'\1\2\3', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w)', r'\1\2', implementation_notes)
-                
-                if self.verbose:
-                    logging.info(f"Module implementation notes before fix: {context['implementation_notes']}")
-                    logging.info(f"Module implementation notes after fix: {implementation_notes}")
-                
-                f.write(f"{implementation_notes}\n\n")
-            
-            # Add dependencies
-            if hasattr(module, 'dependencies') and module.dependencies:
-                f.write("## Dependencies\n\n")
-                for dep in module.dependencies:
-                    f.write(f"- {dep}\n")
-                f.write("\n")
-            
-            # Add classes
-            if hasattr(module, 'classes') and module.classes:
-                f.write("## Classes\n\n")
-                for cls_name in module.classes:
-                    f.write(f"- [{cls_name}]({cls_name}.md)\n")
-                f.write("\n")
+        Args:
+            entity: The entity whose notes to render
             
-            # Add functions
-            if hasattr(module, 'functions') and module.functions:
-                f.write("## Functions\n\n")
-                for func_name in module.functions:
-                    f.write(f"- [{func_name}]({func_name}.md)\n")
-                f.write("\n")
+        Returns:
+            The formatted notes, or an empty string if the entity has none
+        """
+        notes = getattr(entity, 'implementation_notes', None)
+        if not notes:
+            return ''
         
-        if self.verbose:
-            logging.info(f"Generated module documentation: {module_file}")
+        return f"**Implementation Notes**: {notes}\n\n"
 
-    def _generate_class_documentation(self, cls):
-        """Generate documentation for a class."""
-        class_file = self.output_dir / 'api' / f"{cls.name}.md"
+    def _compiled_documentation_chunks(self, entities, title="API Documentation"):
+        """Yield the compiled markdown documentation, one chunk per entity."""
+        # Partition the entities by section in a single pass
+        modules, classes, functions = [], [], []
+        for entity in entities:
+            if isinstance(entity, ModuleEntity):
+                modules.append(entity)
+            elif isinstance(entity, ClassEntity):
+                classes.append(entity)
+            elif isinstance(entity, FunctionEntity) and not (
+                entity.is_method or getattr(entity, 'parent_class', None)
+            ):
+                functions.append(entity)
+        
+        yield f"# {title} - Compiled Documentation\n\n"
+        
+        # Add modules section
+        yield "## Modules\n\n"
+        for entity in modules:
+            yield f"### {entity.name}\n\n{self._render_impl_notes(entity)}"
         
-        with open(class_file, 'w') as f:
-            f.write(f"# Class: {cls.name}\n\n")
+        # Add classes section
+        yield "## Classes\n\n"
+        for entity in classes:
+            parts = [f"### {entity.name}\n\n"]
             
             # Add class description
-            if cls.docstring:
-                f.write(f"{cls.docstring}\n\n")
+            if entity.docstring:
+                parts.append(f"{entity.docstring}\n\n")
             
-            # Add implementation notes
-            context = self.context_generator.generate_context(cls)
-            if context.get('implementation_notes'):
-                f.write("## Implementation Notes\n\n")
-                
-                # Fix character-by-character spacing issue with a regex replacement
-                import re
-                implementation_notes = context['implementation_notes']
-                
-                # First, identify common patterns like "External Dependencies" and fix them
-                implementation_notes = implementation_notes.replace('E x t e r n a l', 'External')
-                implementation_notes = implementation_notes.replace('D e p e n d e n c i e s', 'Dependencies')
-                implementation_notes = implementation_notes.replace('I n t e r n a l', 'Internal')
-                implementation_notes = implementation_notes.replace('t y p i n g', 'typing')
-                implementation_notes = implementation_notes.replace('t e s t _ m o d u l e', 'test_module')
-                
-                # Then use regex to fix remaining spaced characters
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8\9\10', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8\9', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w)', r'\1\2\3\4', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w)', r'\1\2\3', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w)', r'\1\2', implementation_notes)
-                
-                if self.verbose:
-                    logging.info(f"Class implementation notes before fix: {context['implementation_notes']}")
-                    logging.info(f"Class implementation notes after fix: {implementation_notes}")
-                
-                f.write(f"{implementation_notes}\n\n")
-            
-            # Add inheritance
-            if hasattr(cls, 'base_classes') and cls.base_classes:
-                f.write("## Inheritance\n\n")
-                for base_cls in cls.base_classes:
-                    f.write(f"- {base_cls}\n")
-                f.write("\n")
+            # Add implementation notes if available
+            parts.append(self._render_impl_notes(entity))
             
             # Add methods
-            if hasattr(cls, 'methods') and cls.methods:
-                f.write("## Methods\n\n")
-                for method in cls.methods:
-                    f.write(f"### `{method.name}`\n\n")
+            methods = getattr(entity, 'methods', None)
+            if methods:
+                parts.append("#### Methods\n\n")
+                for method in methods:
+                    parts.append(f"##### `{method.name}`\n\n")
                     if method.docstring:
-                        f.write(f"{method.docstring}\n\n")
+                        parts.append(f"{method.docstring}\n\n")
                     
-                    # Add method implementation notes
-                    method_context = self.context_generator.generate_context(method)
-                    if method_context.get('implementation_notes'):
-                        f.write("#### Implementation Notes\n\n")
-                        
-                        # Fix character-by-character spacing issue with a regex replacement
-                        import re
-                        implementation_notes = method_context['implementation_notes']
-                        
-                        # First, identify common patterns like "External Dependencies" and fix them
-                        implementation_notes = implementation_notes.replace('E x t e r n a l', 'External')
-                        implementation_notes = implementation_notes.replace('D e p e n d e n c i e s', 'Dependencies')
-                        implementation_notes = implementation_notes.replace('I n t e r n a l', 'Internal')
-                        implementation_notes = implementation_notes.replace('t y p i n g', 'typing')
-                        implementation_notes = implementation_notes.replace('t e s t _ m o d u l e', 'test_module')
-                        
-                        # Then use regex to fix remaining spaced characters
-                        implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8\9\10', implementation_notes)
-                        implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8\9', implementation_notes)
-                        implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8', implementation_notes)
-                        implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7', implementation_notes)
-                        implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6', implementation_notes)
-                        implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5', implementation_notes)
-                        implementation_notes = re.sub(r'(\w) (\w) (\w) (\w)', r'\1\2\3\4', implementation_notes)
-                        implementation_notes = re.sub(r'(\w) (\w) (\w)', r'\1\2\3', implementation_notes)
-                        implementation_notes = re.sub(r'(\w) (\w)', r'\1\2', implementation_notes)
-                        
-                        if self.verbose:
-                            logging.info(f"Method implementation notes before fix: {method_context['implementation_notes']}")
-                            logging.info(f"Method implementation notes after fix: {implementation_notes}")
-                        
-                        f.write(f"{implementation_notes}\n\n")
-        
-        if self.verbose:
-            logging.info(f"Generated class documentation: {class_file}")
-
-    def _generate_function_documentation(self, func):
-        """Generate documentation for a function."""
-        function_file = self.output_dir / 'api' / f"{func.name}.md"
-        
-        with open(function_file, 'w') as f:
-            f.write(f"# Function: {func.name}\n\n")
-            
-            # Add function description
-            if func.docstring:
-                f.write(f"{func.docstring}\n\n")
-            
-            # Add implementation notes
-            context = self.context_generator.generate_context(func)
-            if context.get('implementation_notes'):
-                f.write("## Implementation Notes\n\n")
-                
-                # Fix character-by-character spacing issue with a regex replacement
-                import re
-                implementation_notes = context['implementation_notes']
-                
-                # First, identify common patterns like "External Dependencies" and fix them
-                implementation_notes = implementation_notes.replace('E x t e r n a l', 'External')
-                implementation_notes = implementation_notes.replace('D e p e n d e n c i e s', 'Dependencies')
-                implementation_notes = implementation_notes.replace('I n t e r n a l', 'Internal')
-                implementation_notes = implementation_notes.replace('t y p i n g', 'typing')
-                implementation_notes = implementation_notes.replace('t e s t _ m o d u l e', 'test_module')
-                
-                # Then use regex to fix remaining spaced characters
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8\9\10', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8\9', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w) (\w)', r'\1\2\3\4', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w) (\w)', r'\1\2\3', implementation_notes)
-                implementation_notes = re.sub(r'(\w) (\w)', r'\1\2', implementation_notes)
-                
-                if self.verbose:
-                    logging.info(f"Function implementation notes before fix: {context['implementation_notes']}")
-                    logging.info(f"Function implementation notes after fix: {implementation_notes}")
-                
-                f.write(f"{implementation_notes}\n\n")
-            
-            # Add parameters
-            if hasattr(func, 'parameters') and func.parameters:
-                f.write("## Parameters\n\n")
-                for param_name, param_type in func.parameters.items():
-                    f.write(f"- `{param_name}`: {param_type}\n")
-                f.write("\n")
+                    # Add implementation notes if available
+                    parts.append(self._render_impl_notes(method))
             
-            # Add return type
-            if hasattr(func, 'return_type') and func.return_type:
-                f.write("## Returns\n\n")
-                f.write(f"{func.return_type}\n\n")
-        
-        if self.verbose:
-            logging.info(f"Generated function documentation: {function_file}")
-
-    def _generate_compiled_documentation(self, entities, title="API Documentation"):
-        """Generate a single markdown file with all documentation."""
-        content = f"# {title} - Compiled Documentation\n\n"
-        
-        # Add modules section
-        content += "## Modules\n\n"
-        for entity in entities:
-            if isinstance(entity, ModuleEntity):
-                content += f"### {entity.name}\n\n"
-                
-                # Add implementation notes if available
-                if hasattr(entity, 'implementation_notes') and entity.implementation_notes:
-                    # Fix character-by-character spacing issue with a regex replacement
-                    import re
-                    implementation_notes = entity.implementation_notes
-                    
-                    # First, identify common patterns like "External Dependencies" and fix them
-                    implementation_notes = implementation_notes.replace('E x t e r n a l', 'External')
-                    implementation_notes = implementation_notes.replace('D e p e n d e n c i e s', 'Dependencies')
-                    implementation_notes = implementation_notes.replace('I n t e r n a l', 'Internal')
-                    
-                    # Then use regex to fix remaining spaced characters
-                    # This pattern looks for sequences of single characters separated by spaces
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8\9\10', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8\9', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w)', r'\1\2\3\4', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w)', r'\1\2\3', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w)', r'\1\2', implementation_notes)
-                    
-                    if self.verbose:
-                        logging.info(f"Module implementation notes before fix: {entity.implementation_notes}")
-                        logging.info(f"Module implementation notes after fix: {implementation_notes}")
-                    content += f"**Implementation Notes**: {implementation_notes}\n\n"
-        
-        # Add classes section
-        content += "## Classes\n\n"
-        for entity in entities:
-            if isinstance(entity, ClassEntity):
-                content += f"### {entity.name}\n\n"
-                
-                # Add class description
-                if entity.docstring:
-                    content += f"{entity.docstring}\n\n"
-                
-                # Add implementation notes if available
-                if hasattr(entity, 'implementation_notes') and entity.implementation_notes:
-                    # Fix character-by-character spacing issue with a regex replacement
-                    import re
-                    implementation_notes = entity.implementation_notes
-                    
-                    # First, identify common patterns like "External Dependencies" and fix them
-                    implementation_notes = implementation_notes.replace('E x t e r n a l', 'External')
-                    implementation_notes = implementation_notes.replace('D e p e n d e n c i e s', 'Dependencies')
-                    implementation_notes = implementation_notes.replace('I n t e r n a l', 'Internal')
-                    
-                    # Then use regex to fix remaining spaced characters
-                    # This pattern looks for sequences of single characters separated by spaces
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8\9\10', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8\9', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w)', r'\1\2\3\4', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w)', r'\1\2\3', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w)', r'\1\2', implementation_notes)
-                    
-                    if self.verbose:
-                        logging.info(f"Class implementation notes before fix: {entity.implementation_notes}")
-                        logging.info(f"Class implementation notes after fix: {implementation_notes}")
-                    content += f"**Implementation Notes**: {implementation_notes}\n\n"
-                
-                # Add methods
-                if hasattr(entity, 'methods') and entity.methods:
-                    content += "#### Methods\n\n"
-                    for method in entity.methods:
-                        content += f"##### `{method.name}`\n\n"
-                        if method.docstring:
-                            content += f"{method.docstring}\n\n"
-                        
-                        # Add implementation notes if available
-                        if hasattr(method, 'implementation_notes') and method.implementation_notes:
-                            # Fix character-by-character spacing issue with a regex replacement
-                            import re
-                            implementation_notes = method.implementation_notes
-                            
-                            # First, identify common patterns like "External Dependencies" and fix them
-                            implementation_notes = implementation_notes.replace('E x t e r n a l', 'External')
-                            implementation_notes = implementation_notes.replace('D e p e n d e n c i e s', 'Dependencies')
-                            implementation_notes = implementation_notes.replace('I n t e r n a l', 'Internal')
-                            
-                            # Then use regex to fix remaining spaced characters
-                            # This pattern looks for sequences of single characters separated by spaces
-                            implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8\9\10', implementation_notes)
-                            implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8\9', implementation_notes)
-                            implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8', implementation_notes)
-                            implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7', implementation_notes)
-                            implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6', implementation_notes)
-                            implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5', implementation_notes)
-                            implementation_notes = re.sub(r'(\w) (\w) (\w) (\w)', r'\1\2\3\4', implementation_notes)
-                            implementation_notes = re.sub(r'(\w) (\w) (\w)', r'\1\2\3', implementation_notes)
-                            implementation_notes = re.sub(r'(\w) (\w)', r'\1\2', implementation_notes)
-                            
-                            if self.verbose:
-                                logging.info(f"Method implementation notes before fix: {method.implementation_notes}")
-                                logging.info(f"Method implementation notes after fix: {implementation_notes}")
-                            content += f"**Implementation Notes**: {implementation_notes}\n\n"
+            yield ''.join(parts)
         
         # Add functions section
-        content += "## Functions\n\n"
-        for entity in entities:
-            if isinstance(entity, FunctionEntity) and not hasattr(entity, 'parent_class'):
-                content += f"### `{entity.name}`\n\n"
-                if entity.docstring:
-                    content += f"{entity.docstring}\n\n"
-                
-                # Add implementation notes if available
-                if hasattr(entity, 'implementation_notes') and entity.implementation_notes:
-                    # Fix character-by-character spacing issue with a regex replacement
-                    import re
-                    implementation_notes = entity.implementation_notes
-                    
-                    # First, identify common patterns like "External Dependencies" and fix them
-                    implementation_notes = implementation_notes.replace('E x t e r n a l', 'External')
-                    implementation_notes = implementation_notes.replace('D e p e n d e n c i e s', 'Dependencies')
-                    implementation_notes = implementation_notes.replace('I n t e r n a l', 'Internal')
-                    
-                    # Then use regex to fix remaining spaced characters
-                    # This pattern looks for sequences of single characters separated by spaces
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8\9\10', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8\9', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7\8', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6\7', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5\6', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w) (\w)', r'\1\2\3\4\5', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w) (\w)', r'\1\2\3\4', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w) (\w)', r'\1\2\3', implementation_notes)
-                    implementation_notes = re.sub(r'(\w) (\w)', r'\1\2', implementation_notes)
-                    
-                    if self.verbose:
-                        logging.info(f"Function implementation notes before fix: {entity.implementation_notes}")
-                        logging.info(f"Function implementation notes after fix: {implementation_notes}")
-                    content += f"**Implementation Notes**: {implementation_notes}\n\n"
-        
-        return content
+        yield "## Functions\n\n"
+        for entity in functions:
+            parts = [f"### `{entity.name}`\n\n"]
+            if entity.docstring:
+                parts.append(f"{entity.docstring}\n\n")
+            
+            # Add implementation notes if available
+            parts.append(self._render_impl_notes(entity))
+            
+            yield ''.join(parts)
 
     def _generate_json_documentation(self) -> None:
         """
@@ -801,6 +702,15 @@ class EnhancedDocumentationGenerator:
             compiled_dir = self.output_dir / 'compiled'
             os.makedirs(compiled_dir, exist_ok=True)
             
+            # Group relationships by source once, keyed by the mapper's
+            # entity IDs, which were recorded at registration
+            entity_ids = self.relationship_mapper.entity_ids
+            relationships: Dict[str, List[Dict[str, str]]] = {}
+            for source_id, target_id, relationship_type in self.relationship_mapper.relationships:
+                relationships.setdefault(source_id, []).append(
+                    {'target': target_id, 'type': relationship_type}
+                )
+            
             # Collect all entities
             all_entities = []
             for entity in self.entities.values():
@@ -810,48 +720,58 @@ class EnhancedDocumentationGenerator:
                     'type': type(entity).__name__
                 }
                 
-                # Add docstring if available
-                if hasattr(entity, 'docstring'):
-                    entity_dict['docstring'] = entity.docstring
+                # Every entity has a docstring, even if it is None
+                entity_dict['docstring'] = entity.docstring
                 
                 # Add module-specific attributes
                 if isinstance(entity, ModuleEntity):
-                    if hasattr(entity, 'file_path'):
-                        entity_dict['file_path'] = str(entity.file_path)
+                    entity_dict['file_path'] = str(entity.file_path)
                 
-                # Add class-specific attributes
+                # Add class-specific attributes; module_name is only set
+                # on entities that belong to a module
                 elif isinstance(entity, ClassEntity):
-                    if hasattr(entity, 'module_name'):
-                        entity_dict['module_name'] = entity.module_name
-                    if hasattr(entity, 'base_classes'):
-                        entity_dict['base_classes'] = entity.base_classes
+                    module_name = getattr(entity, 'module_name', None)
+                    if module_name is not None:
+                        entity_dict['module_name'] = module_name
+                    entity_dict['base_classes'] = entity.base_classes
                 
                 # Add function-specific attributes
                 elif isinstance(entity, FunctionEntity):
-                    if hasattr(entity, 'module_name'):
-                        entity_dict['module_name'] = entity.module_name
-                    if hasattr(entity, 'is_method'):
-                        entity_dict['is_method'] = entity.is_method
-                    if hasattr(entity, 'parent_class'):
-                        entity_dict['parent_class'] = entity.parent_class
+                    module_name = getattr(entity, 'module_name', None)
+                    if module_name is not None:
+                        entity_dict['module_name'] = module_name
+                    entity_dict['is_method'] = entity.is_method
+                    parent_class = getattr(entity, 'parent_class', None)
+                    if parent_class is not None:
+                        entity_dict['parent_class'] = parent_class
                 
                 # Add relationship data if available
-                entity_id = self.relationship_mapper._get_entity_id(entity)
-                if entity_id in self.relationship_mapper.relationships:
-                    entity_dict['relationships'] = self.relationship_mapper.relationships[entity_id]
+                entity_relationships = relationships.get(entity_ids.get(entity.id))
+                if entity_relationships:
+                    entity_dict['relationships'] = entity_relationships
                 
                 all_entities.append(entity_dict)
             
-            # Write JSON documentation
             json_file = compiled_dir / 'documentation.json'
-            with open(json_file, 'w') as f:
-                json.dump(all_entities, f, indent=2)
+            if orjson is not None:
+                # orjson encodes straight to UTF-8 bytes in native code
+                with open(json_file, 'wb', buffering=1 << 19) as f:
+                    f.write(orjson.dumps(
+                        all_entities,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                        default=str
+                    ))
+            else:
+                # Stream the JSON documentation through a large write buffer
+                with open(json_file, 'w', encoding='utf-8', buffering=1 << 19) as f:
+                    for chunk in json.JSONEncoder(indent=2, default=str).iterencode(all_entities):
+                        f.write(chunk)
                 
             if self.verbose:
-                logging.info(f"Generated JSON documentation: {json_file}")
+                logger.info("Generated JSON documentation: %s", json_file)
                 
         except Exception as e:
-            logging.error(f"Failed to generate JSON documentation: {e}")
+            logger.error("Failed to generate JSON documentation: %s", e)
 
     def _save_default_templates(self, templates_dir: Path) -> None:
         """
@@ -861,89 +781,14 @@ class EnhancedDocumentationGenerator:
             templates_dir: Path to the templates directory
         """
         try:
-            # Create default templates
-            module_template = """# Module: {{module_name}}
-
-{{module_description}}
-
-## Implementation Notes
-
-{{implementation_notes}}
-
-## Dependencies
-
-{{dependencies}}
-
-## Classes
-
-{{classes}}
-
-## Functions
-
-{{functions}}
-"""
-            
-            class_template = """# Class: {{class_name}}
-
-{{class_description}}
-
-## Implementation Notes
-
-{{implementation_notes}}
-
-## Inheritance
-
-{{inheritance}}
-
-## Methods
-
-{{methods}}
-
-## Example Usage
-
-```python
-{{example_usage}}
-```
-"""
-            
-            function_template = """# Function: {{function_name}}
-
-{{function_description}}
-
-## Implementation Notes
-
-{{implementation_notes}}
-
-## Parameters
-
-{{parameters}}
-
-## Returns
-
-{{returns}}
-
-## Example Usage
-
-```python
-{{example_usage}}
-```
-"""
-            
-            # Write templates to files
-            with open(templates_dir / 'module_template.md', 'w') as f:
-                f.write(module_template)
-                
-            with open(templates_dir / 'class_template.md', 'w') as f:
-                f.write(class_template)
-                
-            with open(templates_dir / 'function_template.md', 'w') as f:
-                f.write(function_template)
+            for name, body in _TEMPLATES.items():
+                (templates_dir / name).write_bytes(body)
                 
             if self.verbose:
-                logging.info(f"Saved default templates to {templates_dir}")
+                logger.info("Saved default templates to %s", templates_dir)
                 
         except Exception as e:
-            logging.error(f"Failed to save default templates: {e}")
+            logger.error("Failed to save default templates: %s", e)
 
     def generate_templates(self, output_dir: Union[str, Path]) -> None:
         """
@@ -961,7 +806,6 @@ if __name__ == "__main__":
                       format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     
     # Example usage
-    import sys
     if len(sys.argv) > 1:
         from codedoc.parsers.python_parser import PythonParser
         
@@ -8,15 +8,61 @@ comments, and explanations using Large Language Models.
 import os
 import logging
 import time
+import shutil
+import hashlib
+import tempfile
+from fnmatch import fnmatch
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any, Callable
+from typing import Dict, Iterator, List, Optional, Union, Any, Callable
 
-from codedoc.llm.base import LLMClient, LLMResponse, LLMError
+from codedoc.llm.base import LLMClient, LLMResponse, LLMStreamChunk, LLMError
 from codedoc.llm.prompt_manager import PromptManager, create_default_manager
 
 logger = logging.getLogger(__name__)
 
 
+def _callback_metadata(model: Optional[str],
+                       duration: float,
+                       original_size: int,
+                       enhanced_size: int,
+                       tokens_prompt: int = 0,
+                       tokens_completion: int = 0,
+                       cached: bool = False) -> Dict[str, Any]:
+    """
+    Build the metadata passed to an enhance_file callback.
+    
+    Only called when a callback is given, so runs without one never build it.
+    
+    Args:
+        model: Model that produced the enhancement
+        duration: Time spent generating the enhancement, in seconds
+        original_size: Length of the original file content
+        enhanced_size: Length of the enhanced file content
+        tokens_prompt: Prompt tokens used
+        tokens_completion: Completion tokens used
+        cached: Whether the enhancement was reused from the cache
+        
+    Returns:
+        The callback metadata dictionary
+    """
+    metadata = {
+        "tokens_used": {
+            "prompt_tokens": tokens_prompt,
+            "completion_tokens": tokens_completion,
+            "total_tokens": tokens_prompt + tokens_completion
+        },
+        "model": model,
+        "duration": duration,
+        "original_size": original_size,
+        "enhanced_size": enhanced_size
+    }
+    if cached:
+        metadata["cached"] = True
+    return metadata
+
+
 class FileEnhancer:
     """
     Enhances source code files with improved documentation using LLMs.
@@ -27,7 +73,8 @@ class FileEnhancer:
                  output_dir: Union[str, Path],
                  prompt_manager: Optional[PromptManager] = None,
                  model: Optional[str] = None,
-                 temperature: float = 0.2):
+                 temperature: float = 0.2,
+                 max_concurrency: int = 8):
         """
         Initialize the file enhancer.
         
@@ -37,15 +84,20 @@ class FileEnhancer:
             prompt_manager: Prompt manager for rendering templates (if None, uses default)
             model: Model to use for LLM interactions (if None, uses client default)
             temperature: Temperature for LLM generations (lower for more consistent results)
+            max_concurrency: Maximum number of files enhanced at the same time
         """
         self.llm_client = llm_client
         self.output_dir = Path(output_dir)
         self.prompt_manager = prompt_manager or create_default_manager()
         self.model = model
         self.temperature = temperature
+        self.max_concurrency = max(1, max_concurrency)
         
         # Create output directory if it doesn't exist
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Enhanced outputs keyed by a hash of the prompts and model settings
+        self.cache_dir = self.output_dir / ".cache"
         logger.info(f"File enhancer initialized with output directory: {self.output_dir}")
         
         # Track stats
@@ -55,11 +107,15 @@ class FileEnhancer:
             "files_failed": 0,
             "total_tokens_used": 0,
         }
+        
+        # Files are enhanced concurrently, so stats updates are serialized
+        self._stats_lock = threading.Lock()
     
     def enhance_file(self, 
                      file_path: Union[str, Path], 
                      preserve_structure: bool = True,
-                     callback: Optional[Callable[[str, str, Dict[str, Any]], None]] = None) -> Optional[str]:
+                     callback: Optional[Callable[[str, str, Dict[str, Any]], None]] = None,
+                     cwd: Optional[Path] = None) -> Optional[str]:
         """
         Enhance a single file with improved documentation.
         
@@ -68,95 +124,177 @@ class FileEnhancer:
             preserve_structure: Whether to preserve the original file structure
             callback: Optional callback function to call after enhancement
                      Signature: callback(input_path, output_path, metadata)
+            cwd: Directory the output structure is relative to (if None, uses
+                 the current working directory)
             
         Returns:
             Path to the enhanced file, or None if enhancement failed
         """
         file_path = Path(file_path)
         
-        # Create output directory structure
         try:
-            # Determine output path, handling both absolute and relative paths
-            file_path_abs = file_path.absolute()
-            input_basename = file_path.name
+            # Skip empty files without opening them
+            try:
+                size = file_path.stat().st_size
+            except OSError:
+                size = None
+            if size == 0:
+                logger.warning(f"Skipping empty file: {file_path}")
+                return None
             
-            if preserve_structure:
-                # Create relative path structure
-                try:
-                    rel_path = file_path.relative_to(Path.cwd())
-                    output_path = self.output_dir / rel_path
-                except ValueError:
-                    # If relative_to fails, use just the filename
-                    logger.warning(f"Could not determine relative path for {file_path}, using filename only")
-                    output_path = self.output_dir / input_basename
-            else:
-                # Just use the filename
-                output_path = self.output_dir / input_basename
-                
+            output_path = self._output_path(file_path, preserve_structure, cwd)
             output_path.parent.mkdir(parents=True, exist_ok=True)
+            file_str = str(file_path)
+            output_str = str(output_path)
             
             logger.info(f"Enhancing file: {file_path} -> {output_path}")
             
-            # Read the file content
-            with open(file_path, 'r', encoding='utf-8') as f:
+            # Read the file content with a buffer sized to the file
+            buffering = max(8192, min(size or 0, 1 << 20))
+            with open(file_path, 'r', encoding='utf-8', buffering=buffering) as f:
                 content = f.read()
             
-            # Skip empty files
+            # Skip files with only whitespace
             if not content.strip():
                 logger.warning(f"Skipping empty file: {file_path}")
                 return None
                 
             # Render the prompt template
             prompt_vars = {
-                "file_path": str(file_path),
+                "file_path": file_str,
                 "content": content
             }
             
             # Use the code_enhancement template with system prompt
             prompts = self.prompt_manager.render_with_system("code_enhancement", prompt_vars)
             
-            # Generate enhanced content
+            # Reuse the output of an identical earlier request
+            cache_path = self.cache_dir / self._cache_key(prompts)
+            if cache_path.exists():
+                shutil.copyfile(cache_path, output_path)
+                
+                with self._stats_lock:
+                    self.stats["files_processed"] += 1
+                    self.stats["files_enhanced"] += 1
+                
+                if callback:
+                    callback(file_str, output_str, _callback_metadata(
+                        self.model, 0.0, len(content), cache_path.stat().st_size, cached=True
+                    ))
+                
+                logger.info(f"Reused cached enhancement for {file_path} -> {output_path}")
+                return output_str
+            
+            # Stream the enhanced content to a partial file as it is generated,
+            # so a failed request never leaves a truncated output behind
             start_time = time.time()
-            response = self.llm_client.generate_with_system_prompt(
-                system_prompt=prompts["system"],
-                user_prompt=prompts["user"],
-                model=self.model,
-                temperature=self.temperature
-            )
+            model = self.model
+            tokens_prompt = tokens_completion = enhanced_size = 0
+            partial = tempfile.NamedTemporaryFile('w', encoding='utf-8', buffering=1 << 16,
+                                                  dir=output_path.parent, prefix=output_path.name,
+                                                  suffix='.part', delete=False)
+            partial_path = Path(partial.name)
+            try:
+                with partial as f:
+                    for chunk in self._stream_enhancement(prompts):
+                        f.write(chunk.content)
+                        enhanced_size += len(chunk.content)
+                        tokens_prompt += chunk.tokens_prompt
+                        tokens_completion += chunk.tokens_completion
+                        model = chunk.model or model
+                os.replace(partial_path, output_path)
+            finally:
+                if partial_path.exists():
+                    partial_path.unlink()
             duration = time.time() - start_time
+            tokens_used = tokens_prompt + tokens_completion
             
-            # Write enhanced content to output file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(response.content)
+            # Keep a copy for later runs over unchanged files
+            self.cache_dir.mkdir(exist_ok=True)
+            shutil.copyfile(output_path, cache_path)
                 
             # Update stats
-            self.stats["files_processed"] += 1
-            self.stats["files_enhanced"] += 1
-            self.stats["total_tokens_used"] += response.tokens_used
+            with self._stats_lock:
+                self.stats["files_processed"] += 1
+                self.stats["files_enhanced"] += 1
+                self.stats["total_tokens_used"] += tokens_used
             
             # Call the callback if provided
             if callback:
-                metadata = {
-                    "tokens_used": {
-                        "prompt_tokens": response.tokens_prompt,
-                        "completion_tokens": response.tokens_completion,
-                        "total_tokens": response.tokens_used
-                    },
-                    "model": response.model,
-                    "duration": duration,
-                    "original_size": len(content),
-                    "enhanced_size": len(response.content)
-                }
-                callback(str(file_path), str(output_path), metadata)
+                callback(file_str, output_str, _callback_metadata(
+                    model, duration, len(content), enhanced_size, tokens_prompt, tokens_completion
+                ))
                 
             logger.info(f"Enhanced file saved to {output_path} ({duration:.2f}s)")
-            return str(output_path)
+            return output_str
             
         except Exception as e:
             logger.error(f"Error enhancing file {file_path}: {str(e)}")
-            self.stats["files_failed"] += 1
+            with self._stats_lock:
+                self.stats["files_failed"] += 1
             return None
     
+    def _output_path(self,
+                     file_path: Path,
+                     preserve_structure: bool = True,
+                     cwd: Optional[Path] = None) -> Path:
+        """
+        Determine where the enhanced version of a file is written.
+        
+        Args:
+            file_path: Path to the file to enhance
+            preserve_structure: Whether to preserve the original file structure
+            cwd: Directory the output structure is relative to (if None, uses
+                 the current working directory)
+            
+        Returns:
+            Path of the enhanced file in the output directory
+        """
+        if preserve_structure:
+            # Create relative path structure
+            try:
+                return self.output_dir / file_path.relative_to(cwd or Path.cwd())
+            except ValueError:
+                # If relative_to fails, use just the filename
+                logger.warning(f"Could not determine relative path for {file_path}, using filename only")
+        return self.output_dir / file_path.name
+    
+    def _stream_enhancement(self, prompts: Dict[str, str]) -> Iterator[LLMStreamChunk]:
+        """
+        Stream the enhanced content for the rendered prompts.
+        
+        Clients without native streaming yield their whole response as a
+        single chunk through the LLMClient base implementation.
+        
+        Args:
+            prompts: The rendered system and user prompts
+            
+        Returns:
+            Iterator of LLMStreamChunk objects in the order they are generated
+        """
+        return self.llm_client.generate_with_system_prompt_stream(
+            system_prompt=prompts["system"],
+            user_prompt=prompts["user"],
+            model=self.model,
+            temperature=self.temperature
+        )
+    
+    def _cache_key(self, prompts: Dict[str, str]) -> str:
+        """
+        Build the cache key for an enhancement request.
+        
+        Args:
+            prompts: The rendered system and user prompts
+            
+        Returns:
+            A hex digest of the prompts, model and temperature
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        for part in (prompts["system"], prompts["user"], str(self.model), repr(self.temperature)):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\x00')
+        return digest.hexdigest()
+    
     def enhance_directory(self,
                          input_dir: Union[str, Path],
                          file_patterns: List[str] = ["*.py", "*.js", "*.java"],
@@ -167,6 +305,9 @@ class FileEnhancer:
         """
         Enhance all matching files in a directory.
         
+        Files are enhanced concurrently on up to max_concurrency threads,
+        so the callback may be called from several threads at once.
+        
         Args:
             input_dir: Directory containing files to enhance
             file_patterns: List of glob patterns for files to enhance
@@ -186,17 +327,19 @@ class FileEnhancer:
         # Set default exclude dirs if not provided
         exclude_dirs = exclude_dirs or [".git", "__pycache__", "venv", "env"]
         
-        # Find all matching files
+        exclude_set = frozenset(exclude_dirs)
+        
+        # Find all matching files, pruning excluded directories during the walk
         all_files = []
-        for pattern in file_patterns:
+        for root, dirnames, filenames in os.walk(input_dir):
             if recursive:
-                files = list(input_dir.rglob(pattern))
+                dirnames[:] = [d for d in dirnames if d not in exclude_set]
             else:
-                files = list(input_dir.glob(pattern))
-                
-            # Filter out excluded directories
-            files = [f for f in files if not any(d in str(f) for d in exclude_dirs)]
-            all_files.extend(files)
+                dirnames[:] = []
+            
+            for name in filenames:
+                if any(fnmatch(name, pattern) for pattern in file_patterns):
+                    all_files.append(Path(root) / name)
             
         # Limit number of files if specified
         if max_files:
@@ -204,12 +347,27 @@ class FileEnhancer:
             
         logger.info(f"Found {len(all_files)} files to enhance in {input_dir}")
         
-        # Process each file
+        # Process the files concurrently, overlapping the LLM round-trips
         enhanced_files = []
         failed_files = []
         
+        # Files that map to the same output path are enhanced one after
+        # another, so concurrent workers never write the same file
+        cwd = Path.cwd()
+        groups: Dict[Path, List[Path]] = {}
+        for file_path in all_files:
+            groups.setdefault(self._output_path(file_path, cwd=cwd), []).append(file_path)
+        
+        def enhance_group(group: List[Path]) -> List[Optional[str]]:
+            return [self.enhance_file(file_path, callback=callback, cwd=cwd) for file_path in group]
+        
+        output_paths = {}
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            for group, results in zip(groups.values(), executor.map(enhance_group, groups.values())):
+                output_paths.update(zip(group, results))
+        
         for file_path in all_files:
-            output_path = self.enhance_file(file_path, callback=callback)
+            output_path = output_paths[file_path]
             if output_path:
                 enhanced_files.append(output_path)
             else:
@@ -8,19 +8,254 @@ metadata such as file modification dates, version information, and tags.
 
 import os
 import re
+import sys
 import time
 import datetime
+import shutil
+import sqlite3
+import functools
+import threading
 import subprocess
+from contextlib import closing
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Any, Tuple, Union
+from typing import Callable, Dict, FrozenSet, List, NamedTuple, Set, Optional, Any, Tuple, Union
 import logging
 
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
 from codedoc.core.entities import (
     Entity, ModuleEntity, ClassEntity, FunctionEntity, VariableEntity
 )
+from codedoc.enhancers._process_pool import process_pool, register_background_work
 
 logger = logging.getLogger(__name__)
 
+# Version assignments in setup.py/pyproject.toml and in __init__.py files
+_VERSION_RE = re.compile(r'version\s*=\s*[\'"]([^\'"]+)[\'"]')
+_DUNDER_VERSION_RE = re.compile(r'__version__\s*=\s*[\'"]([^\'"]+)[\'"]')
+
+# Bytes read from the top of a file when looking for a version
+_VERSION_READ_SIZE = 8192
+
+# Directories never searched for a package __init__.py
+_SKIP_DIRS = frozenset({
+    ".git", "__pycache__", "venv", ".venv", "env", "node_modules", "build", "dist"
+})
+
+# Explicit "Tags: a, b" markers in docstrings
+_TAG_RE = re.compile(r'[Tt]ags?\s*:\s*([^\n]+)')
+
+# Docstring keywords and the tags they imply
+_KEYWORD_TO_TAG = {
+    "thread-safe": "threadsafe",
+    "thread safe": "threadsafe",
+    "deprecated": "deprecated",
+    "experimental": "experimental",
+    "example": "example",
+    "utility": "utility",
+    "helper": "helper",
+    "performance": "performance",
+    "optimization": "optimization"
+}
+
+# Calls that mark code as deprecated
+_DEPRECATION_RE = re.compile(r'warnings\.warn|DeprecationWarning')
+
+# Docstring stability markers, most significant first
+_STABILITY_MARKERS = ("deprecated", "experimental", "alpha", "beta", "stable")
+
+# Finds every keyword and stability marker in one pass over a lowercased
+# docstring; the lookahead reports occurrences that overlap one another
+_DOCSTRING_KEYWORD_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(word) for word in (*_KEYWORD_TO_TAG, *_STABILITY_MARKERS)) + '))'
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _docstring_keywords(docstring: str) -> FrozenSet[str]:
+    """
+    Find the tag keywords and stability markers mentioned in a docstring.
+    
+    Args:
+        docstring: The docstring to scan
+        
+    Returns:
+        The keywords and markers found, in lowercase
+    """
+    return frozenset(_DOCSTRING_KEYWORD_RE.findall(docstring.lower()))
+
+# Entity count below which entities are enriched in-process rather than in a pool
+_PARALLEL_MIN_ENTITIES = 256
+
+# Enricher used by a pool worker, installed once per worker process
+_worker_enricher: Optional['MetadataEnricher'] = None
+
+
+class EntityMetadata(NamedTuple):
+    """
+    Metadata about an entity.
+    
+    Fields that could not be determined are None. Being a tuple, an instance
+    is much smaller than the equivalent dictionary, which matters when whole
+    repositories are enriched at once.
+    """
+    last_modified: Optional[str] = None
+    author: Optional[str] = None
+    version: Optional[str] = None
+    stability: Optional[str] = None
+    tags: Optional[List[str]] = None
+    repository: Optional[str] = None
+    source_url: Optional[str] = None
+    deprecation_message: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the metadata to a dictionary.
+        
+        Returns:
+            Dictionary holding only the fields that are set
+        """
+        return {field: value for field, value in zip(self._fields, self) if value is not None}
+
+
+def _init_worker(enricher: 'MetadataEnricher') -> None:
+    """Install the parent's enricher, with its warm caches, in a pool worker."""
+    global _worker_enricher
+    _worker_enricher = enricher
+
+
+def _enrich_group(entities: List[Entity]) -> List[EntityMetadata]:
+    """Enrich a group of entities from the same file in a pool worker."""
+    return [_worker_enricher._enrich_entity(entity) for entity in entities]
+
+
+def _uses_deprecation(entity: Entity) -> bool:
+    """Check whether an entity's code emits deprecation warnings."""
+    code = getattr(entity, 'code', None)
+    return bool(code) and _DEPRECATION_RE.search(code) is not None
+
+
+def _find_deprecated_method(entity: Entity) -> Optional[Entity]:
+    """Find the first method of an entity whose code emits deprecation warnings."""
+    for method in getattr(entity, 'methods', ()):
+        if _uses_deprecation(method):
+            return method
+    return None
+
+
+def _read_head(path: Union[str, Path]) -> str:
+    """Read the start of a text file, ignoring undecodable bytes."""
+    with open(path, 'rb') as f:
+        return f.read(_VERSION_READ_SIZE).decode('utf-8', 'ignore')
+
+
+def _pyproject_version(content: str) -> Optional[str]:
+    """
+    Get the version declared in pyproject.toml content.
+    
+    The file is parsed with tomllib when it is available and the content is
+    complete TOML; otherwise the first version assignment is used.
+    
+    Args:
+        content: Content of the pyproject.toml file
+        
+    Returns:
+        The project or Poetry version, or None if not found
+    """
+    if tomllib is not None:
+        try:
+            data = tomllib.loads(content)
+        except tomllib.TOMLDecodeError:
+            pass
+        else:
+            return (data.get('project', {}).get('version')
+                    or data.get('tool', {}).get('poetry', {}).get('version'))
+    
+    version_match = _VERSION_RE.search(content)
+    return version_match.group(1) if version_match else None
+
+
+@functools.lru_cache(maxsize=16384)
+def _entity_id(kind: type, module_name: Optional[str], name: str,
+               parent_class: Optional[str]) -> str:
+    """
+    Build the unique identifier of an entity from its identifying fields.
+    
+    Args:
+        kind: The entity's class
+        module_name: Name of the module defining the entity
+        name: The entity's name
+        parent_class: Name of the owning class, for methods
+        
+    Returns:
+        A unique identifier string
+    """
+    build_id = _ENTITY_ID_BUILDERS.get(kind)
+    if module_name and build_id is not None:
+        return build_id(module_name, name, parent_class)
+    
+    # Default case - use type and name
+    return f"{kind.__name__}:{name}"
+
+
+def _member_id(module_name: str, name: str, parent_class: Optional[str]) -> str:
+    """Build the ID of a class or variable."""
+    return f"{module_name}.{name}"
+
+
+def _function_id(module_name: str, name: str, parent_class: Optional[str]) -> str:
+    """Build the ID of a function, including the class for methods."""
+    if parent_class:
+        return f"{module_name}.{parent_class}.{name}"
+    return f"{module_name}.{name}"
+
+
+# Entity ID builders by entity type, given the module, name and parent class
+_ENTITY_ID_BUILDERS: Dict[type, Callable[[str, str, Optional[str]], str]] = {
+    ModuleEntity: lambda module_name, name, parent_class: name,
+    ClassEntity: _member_id,
+    FunctionEntity: _function_id,
+    VariableEntity: _member_id,
+}
+
+
+def _module_path(entity: Entity, slash: Callable[[str], str]) -> str:
+    """Get the documentation path of a module."""
+    return slash(entity.name)
+
+
+def _member_path(entity: Entity, slash: Callable[[str], str]) -> str:
+    """Get the documentation path of a class or variable, under its module."""
+    module_name = getattr(entity, 'module_name', None)
+    if module_name:
+        return f"{slash(module_name)}/{entity.name}"
+    return entity.name
+
+
+def _function_path(entity: Entity, slash: Callable[[str], str]) -> str:
+    """Get the documentation path of a function, under its class for methods."""
+    path = entity.name
+    parent_class = getattr(entity, 'parent_class', None)
+    if getattr(entity, 'is_method', False) and parent_class:
+        path = f"{parent_class}/{path}"
+    
+    module_name = getattr(entity, 'module_name', None)
+    if module_name:
+        return f"{slash(module_name)}/{path}"
+    return path
+
+
+# Documentation path builders by entity type
+_ENTITY_PATH_BUILDERS: Dict[type, Callable[[Entity, Callable[[str], str]], str]] = {
+    ModuleEntity: _module_path,
+    ClassEntity: _member_path,
+    FunctionEntity: _function_path,
+    VariableEntity: _member_path,
+}
+
 
 class MetadataEnricher:
     """
@@ -51,20 +286,79 @@ class MetadataEnricher:
         self.repo_root = Path(repo_root) if repo_root else None
         self.config = config or {}
         
-        # Cache for file modification times
+        # Cache for file modification times, keyed by path relative to the repository root
         self.file_mod_times: Dict[str, str] = {}
         
-        # Cache for file authors
+        # Cache for file authors, keyed the same way
         self.file_authors: Dict[str, str] = {}
         
         # Cache for file versions (from git tags)
         self.file_versions: Dict[str, str] = {}
         
+        # Cache of file paths relative to the repository root
+        self._rel_paths: Dict[str, Optional[str]] = {}
+        
+        # Cache of dotted module names converted to paths
+        self._module_slash: Dict[str, str] = {}
+        
+        # Cache for metadata shared by all entities in a file
+        self._file_meta: Dict[str, EntityMetadata] = {}
+        
+        # Latest git tag, shared by every file in the repository
+        self._git_version: Optional[str] = None
+        self._git_version_checked = False
+        
+        # Whether repo_root is inside a git work tree, checked once so that no
+        # git process is started for source trees without history
+        self._has_git = self._detect_git()
+        
         # Extract package version if available
         self.package_version = self._detect_package_version()
         
         # Detect repository URL if available
         self.repo_url = self._detect_repo_url()
+        
+        # Prefix of links to files on the repository's hosting provider
+        self._source_url_prefix = self._detect_source_url_prefix()
+        
+        # Fill the date and author caches on a background thread, overlapping
+        # git with parsing; lookups wait for it, after which the caches are
+        # only read and need no lock
+        self._git_ready = threading.Event()
+        if self._has_git:
+            register_background_work(self._git_ready)
+            threading.Thread(
+                target=self._prime_git_cache, name='codedoc-git-prefetch', daemon=True
+            ).start()
+        else:
+            self._git_ready.set()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Get the state to pickle, once the git caches are filled."""
+        self._git_ready.wait()
+        state = self.__dict__.copy()
+        del state['_git_ready']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore a pickled enricher, whose git caches are already filled."""
+        self.__dict__.update(state)
+        self._git_ready = threading.Event()
+        self._git_ready.set()
+
+    def _detect_git(self) -> bool:
+        """
+        Check whether the repository root is inside a git work tree.
+        
+        Returns:
+            True if git is installed and the root or one of its parents
+            contains a .git entry
+        """
+        if not self.repo_root or not shutil.which('git'):
+            return False
+        
+        root = self.repo_root.resolve()
+        return any((directory / '.git').exists() for directory in (root, *root.parents))
 
     def _detect_package_version(self) -> Optional[str]:
         """
@@ -76,32 +370,30 @@ class MetadataEnricher:
         if not self.repo_root:
             return None
         
+        # Versions are set near the top of each file, so only the head is read
+        
         # Check for version in setup.py
         setup_py = self.repo_root / 'setup.py'
         if setup_py.exists():
-            with open(setup_py, 'r') as f:
-                content = f.read()
-                version_match = re.search(r'version\s*=\s*[\'"]([^\'"]+)[\'"]', content)
-                if version_match:
-                    return version_match.group(1)
+            version_match = _VERSION_RE.search(_read_head(setup_py))
+            if version_match:
+                return version_match.group(1)
         
         # Check for version in pyproject.toml
         pyproject_toml = self.repo_root / 'pyproject.toml'
         if pyproject_toml.exists():
-            with open(pyproject_toml, 'r') as f:
-                content = f.read()
-                version_match = re.search(r'version\s*=\s*[\'"]([^\'"]+)[\'"]', content)
-                if version_match:
-                    return version_match.group(1)
+            content = _read_head(pyproject_toml)
+            version = _pyproject_version(content)
+            if version:
+                return version
         
         # Check for version in __init__.py files
-        if self.repo_root:
-            for init_file in self.repo_root.glob('**/__init__.py'):
-                with open(init_file, 'r') as f:
-                    content = f.read()
-                    version_match = re.search(r'__version__\s*=\s*[\'"]([^\'"]+)[\'"]', content)
-                    if version_match:
-                        return version_match.group(1)
+        for dirpath, dirnames, filenames in os.walk(self.repo_root):
+            dirnames[:] = [d for d in dirnames if d not in _SKIP_DIRS]
+            if '__init__.py' in filenames:
+                version_match = _DUNDER_VERSION_RE.search(_read_head(os.path.join(dirpath, '__init__.py')))
+                if version_match:
+                    return version_match.group(1)
         
         return None
 
@@ -112,7 +404,7 @@ class MetadataEnricher:
         Returns:
             The repository URL or None if not found
         """
-        if not self.repo_root:
+        if not self._has_git:
             return None
         
         try:
@@ -144,50 +436,259 @@ class MetadataEnricher:
         
         return None
 
-    def get_file_modification_time(self, file_path: Union[str, Path]) -> str:
+    def _detect_source_url_prefix(self) -> Optional[str]:
         """
-        Get the last modification time of a file in ISO format.
+        Build the prefix of links to files in the hosted repository.
+        
+        Returns:
+            The URL prefix that a relative file path is appended to, or None if
+            the repository is not hosted on GitHub or GitLab
+        """
+        if not self.repo_url:
+            return None
+        
+        # Format URL based on common hosting providers
+        if 'github.com' in self.repo_url:
+            blob_path = 'blob'
+        elif 'gitlab.com' in self.repo_url:
+            blob_path = '-/blob'
+        else:
+            return None
+        
+        return f"{self.repo_url}/{blob_path}/{self._detect_default_branch()}/"
+
+    def _detect_default_branch(self) -> str:
+        """
+        Detect the default branch of the origin remote.
+        
+        Returns:
+            The branch that origin/HEAD points to, or 'main' if it is not set
+        """
+        try:
+            result = subprocess.run(
+                ['git', 'symbolic-ref', '--short', 'refs/remotes/origin/HEAD'],
+                cwd=self.repo_root,
+                capture_output=True,
+                text=True,
+                check=False
+            )
+            
+            if result.returncode == 0 and result.stdout.strip():
+                return result.stdout.strip().split('/', 1)[-1]
+        except Exception as e:
+            logger.warning(f"Failed to detect default branch: {e}")
+        
+        return 'main'
+
+    def _detect_git_version(self) -> Optional[str]:
+        """
+        Detect the version of the repository from its git tags.
+        
+        Returns:
+            The most recent tag at HEAD, or else the most recent reachable
+            tag, or None if there is none
+        """
+        if not self._has_git:
+            return None
+        
+        try:
+            result = subprocess.run(
+                ['git', 'tag', '--sort=-creatordate', '--points-at', 'HEAD'],
+                cwd=self.repo_root,
+                capture_output=True,
+                text=True,
+                check=False
+            )
+            
+            if result.returncode == 0 and result.stdout.strip():
+                # Use the most recent tag
+                return result.stdout.strip().split('\n')[0]
+            
+            # If no tag at HEAD, try to find the most recent tag
+            result = subprocess.run(
+                ['git', 'describe', '--tags', '--abbrev=0'],
+                cwd=self.repo_root,
+                capture_output=True,
+                text=True,
+                check=False
+            )
+            
+            if result.returncode == 0 and result.stdout.strip():
+                return result.stdout.strip()
+        except Exception as e:
+            logger.warning(f"Failed to get git version: {e}")
+        
+        return None
+
+    def _rel(self, file_path: Union[str, Path]) -> Optional[str]:
+        """
+        Get a file's path relative to the repository root, caching the result.
         
         Args:
             file_path: Path to the file
             
         Returns:
-            ISO formatted date string
+            The relative path with forward slashes, as git reports it, or None
+            if there is no repository root or the file lies outside it
         """
-        path_str = str(file_path)
+        key = str(file_path)
+        if key in self._rel_paths:
+            return self._rel_paths[key]
         
-        # Check cache first
-        if path_str in self.file_mod_times:
-            return self.file_mod_times[path_str]
+        rel_path = None
+        if self.repo_root:
+            try:
+                rel_path = Path(file_path).relative_to(self.repo_root).as_posix()
+            except ValueError:
+                pass
+        
+        self._rel_paths[key] = rel_path
+        return rel_path
+
+    def _prime_git_cache(self) -> None:
+        """Fill the git caches, then wake the lookups waiting for them."""
+        try:
+            self._load_git_metadata()
+        finally:
+            self._git_ready.set()
+
+    def _load_git_metadata(self) -> None:
+        """
+        Fill the modification time and author caches from git.
+        
+        When the ``metadata_cache`` setting names a SQLite file, dates and
+        authors saved by earlier runs are reused for every file whose blob is
+        unchanged, and the history is only walked if some tracked file has no
+        saved entry.
+        """
+        cache_file = self.config.get('metadata_cache')
+        blobs = self._tracked_blobs() if cache_file else {}
+        if not blobs:
+            self._read_git_log()
+            return
         
+        walked = False
         try:
-            # Try to get the modification time from git
-            if self.repo_root:
-                rel_path = Path(file_path).relative_to(self.repo_root)
-                result = subprocess.run(
-                    ['git', 'log', '-1', '--format=%ai', '--', str(rel_path)],
-                    cwd=self.repo_root,
-                    capture_output=True,
-                    text=True,
-                    check=False
+            # The cache may live in an output directory that is not created yet
+            Path(cache_file).parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(str(cache_file))) as db:
+                db.execute(
+                    'CREATE TABLE IF NOT EXISTS file_meta '
+                    '(path TEXT PRIMARY KEY, blob_sha TEXT, last_modified TEXT, author TEXT)'
                 )
+                for path, blob_sha, date, author in db.execute('SELECT * FROM file_meta'):
+                    if blobs.get(path) == blob_sha:
+                        # Rows from the same commit repeat the date and author
+                        self.file_mod_times[path] = sys.intern(date)
+                        self.file_authors[path] = sys.intern(author)
                 
-                if result.returncode == 0 and result.stdout.strip():
-                    # Parse the git date format and convert to ISO
-                    date_str = result.stdout.strip()
-                    dt = datetime.datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S %z')
-                    iso_date = dt.isoformat()
-                    self.file_mod_times[path_str] = iso_date
-                    return iso_date
+                if any(path not in self.file_mod_times for path in blobs):
+                    self._read_git_log()
+                    walked = True
+                    db.executemany(
+                        'INSERT OR REPLACE INTO file_meta VALUES (?, ?, ?, ?)',
+                        [(path, blob_sha, self.file_mod_times[path], self.file_authors[path])
+                         for path, blob_sha in blobs.items() if path in self.file_mod_times]
+                    )
+                    db.commit()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Failed to use metadata cache {cache_file}: {e}")
+            if not walked:
+                self._read_git_log()
+
+    def _tracked_blobs(self) -> Dict[str, str]:
+        """
+        Get the blob hash of every file tracked at HEAD.
+        
+        Returns:
+            Dictionary mapping paths relative to the repository root to blob
+            hashes, empty if git is unavailable
+        """
+        try:
+            result = subprocess.run(
+                ['git', '-c', 'core.quotePath=off', 'ls-tree', '-r', 'HEAD'],
+                cwd=self.repo_root,
+                capture_output=True,
+                text=True,
+                check=False
+            )
         except Exception as e:
-            logger.warning(f"Failed to get git modification time for {file_path}: {e}")
+            logger.warning(f"Failed to list git files: {e}")
+            return {}
+        
+        if result.returncode != 0:
+            return {}
+        
+        blobs = {}
+        for line in result.stdout.splitlines():
+            info, _, path = line.partition('\t')
+            blobs[path] = info.rsplit(' ', 1)[-1]
+        return blobs
+
+    def _read_git_log(self) -> None:
+        """
+        Fill the modification time and author caches from a single git log walk.
+        
+        History is walked newest first, so the first commit seen for a path is
+        the last one that touched it. Paths are keyed exactly as git reports
+        them, relative to the repository root (see _rel). Paths that already
+        have an entry are left unchanged.
+        """
+        # Stream the output so that it is parsed while git is still walking,
+        # without holding the whole log in memory
+        try:
+            proc = subprocess.Popen(
+                ['git', '-c', 'core.quotePath=off', 'log', '--relative', '--name-only',
+                 '--format=format:%x1e%aI%x00%an <%ae>', 'HEAD'],
+                cwd=self.repo_root,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                errors='replace',
+                bufsize=1 << 20
+            )
+        except Exception as e:
+            logger.warning(f"Failed to read git history: {e}")
+            return
+        
+        date = author = None
+        with proc:
+            for line in proc.stdout:
+                line = line.rstrip('\n')
+                if line.startswith('\x1e'):
+                    # Paths from one commit share its strings; authors repeat
+                    # across commits, so one copy of each is kept
+                    date, _, author = line[1:].partition('\x00')
+                    author = sys.intern(author)
+                elif line and date is not None and line not in self.file_mod_times:
+                    self.file_mod_times[line] = date
+                    self.file_authors[line] = author
+
+    def get_file_modification_time(self, file_path: Union[str, Path]) -> str:
+        """
+        Get the last modification time of a file in ISO format.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            ISO formatted date string
+        """
+        key = self._rel(file_path) or str(file_path)
+        
+        if not self._git_ready.is_set():
+            self._git_ready.wait()
+        
+        # Check cache first
+        if key in self.file_mod_times:
+            return self.file_mod_times[key]
         
         # Fall back to file system modification time
         try:
             mtime = os.path.getmtime(file_path)
             dt = datetime.datetime.fromtimestamp(mtime, tz=datetime.timezone.utc)
             iso_date = dt.isoformat()
-            self.file_mod_times[path_str] = iso_date
+            self.file_mod_times[key] = iso_date
             return iso_date
         except Exception as e:
             logger.warning(f"Failed to get file system modification time for {file_path}: {e}")
@@ -206,38 +707,17 @@ class MetadataEnricher:
         Returns:
             Author name and email, or None if not found
         """
-        path_str = str(file_path)
-        
-        # Check cache first
-        if path_str in self.file_authors:
-            return self.file_authors[path_str]
+        if not self._git_ready.is_set():
+            self._git_ready.wait()
         
-        try:
-            # Try to get the author from git
-            if self.repo_root:
-                rel_path = Path(file_path).relative_to(self.repo_root)
-                result = subprocess.run(
-                    ['git', 'log', '-1', '--format=%an <%ae>', '--', str(rel_path)],
-                    cwd=self.repo_root,
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
-                
-                if result.returncode == 0 and result.stdout.strip():
-                    author = result.stdout.strip()
-                    self.file_authors[path_str] = author
-                    return author
-        except Exception as e:
-            logger.warning(f"Failed to get git author for {file_path}: {e}")
-        
-        return None
+        return self.file_authors.get(self._rel(file_path) or str(file_path))
 
     def get_file_version(self, file_path: Union[str, Path]) -> Optional[str]:
         """
         Get the version associated with a file.
         
-        This attempts to find the latest git tag that affects this file.
+        This uses the package version if one was found, and otherwise the
+        latest git tag of the repository.
         
         Args:
             file_path: Path to the file
@@ -256,81 +736,40 @@ class MetadataEnricher:
             self.file_versions[path_str] = self.package_version
             return self.package_version
         
-        try:
-            # Try to get the version from git tags
-            if self.repo_root:
-                rel_path = Path(file_path).relative_to(self.repo_root)
-                result = subprocess.run(
-                    ['git', 'tag', '--sort=-creatordate', '--points-at', 'HEAD'],
-                    cwd=self.repo_root,
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
-                
-                if result.returncode == 0 and result.stdout.strip():
-                    # Use the most recent tag
-                    tag = result.stdout.strip().split('\n')[0]
-                    self.file_versions[path_str] = tag
-                    return tag
-                
-                # If no tag at HEAD, try to find the most recent tag
-                result = subprocess.run(
-                    ['git', 'describe', '--tags', '--abbrev=0'],
-                    cwd=self.repo_root,
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
-                
-                if result.returncode == 0 and result.stdout.strip():
-                    tag = result.stdout.strip()
-                    self.file_versions[path_str] = tag
-                    return tag
-        except Exception as e:
-            logger.warning(f"Failed to get git version for {file_path}: {e}")
+        # Otherwise use the repository's tag, which is looked up only once
+        if not self._git_version_checked:
+            self._git_version = self._detect_git_version()
+            self._git_version_checked = True
         
-        return None
+        if self._git_version:
+            self.file_versions[path_str] = self._git_version
+        return self._git_version
 
-    def detect_stability(self, entity: Entity) -> Optional[str]:
+    def detect_stability(self, entity: Entity, check_methods: bool = True) -> Optional[str]:
         """
         Detect the stability of an entity based on various heuristics.
         
         Args:
             entity: The entity to analyze
+            check_methods: Whether to scan a class's methods for deprecation
+                warnings; callers that have already done so pass False
             
         Returns:
             Stability indicator ('stable', 'experimental', 'deprecated', etc.) or None
         """
-        # Check for stability markers in docstring or code
-        docstring = entity.docstring or ""
-        
-        # Check for explicit stability markers
-        if "deprecated" in docstring.lower():
-            return "deprecated"
-        
-        if "experimental" in docstring.lower():
-            return "experimental"
-        
-        if "alpha" in docstring.lower():
-            return "alpha"
-        
-        if "beta" in docstring.lower():
-            return "beta"
-        
-        if "stable" in docstring.lower():
-            return "stable"
+        # Check for explicit stability markers in the docstring
+        keywords = _docstring_keywords(entity.docstring or "")
+        for marker in _STABILITY_MARKERS:
+            if marker in keywords:
+                return marker
         
         # For functions and methods, check for usage of warnings.warn
-        if isinstance(entity, FunctionEntity) and entity.code:
-            if "warnings.warn" in entity.code or "DeprecationWarning" in entity.code:
-                return "deprecated"
+        if isinstance(entity, FunctionEntity) and _uses_deprecation(entity):
+            return "deprecated"
         
         # For classes, check if any methods use warnings
-        if isinstance(entity, ClassEntity):
-            for method in entity.methods:
-                if hasattr(method, 'code') and method.code and ("warnings.warn" in method.code or "DeprecationWarning" in method.code):
-                    return "deprecated"
+        if check_methods and isinstance(entity, ClassEntity) and _find_deprecated_method(entity):
+            return "deprecated"
         
         # Check for underscore prefixes in name (internal/private API)
         if entity.name.startswith('_') and not (entity.name.startswith('__') and entity.name.endswith('__')):
@@ -349,154 +788,183 @@ class MetadataEnricher:
         Returns:
             List of extracted tags
         """
-        tags = []
+        tags: Set[str] = set()
         docstring = entity.docstring or ""
         
         # Look for explicit tag markers in docstring
-        tag_matches = re.findall(r'[Tt]ags?\s*:\s*([^\n]+)', docstring)
-        for match in tag_matches:
+        for match in _TAG_RE.findall(docstring):
             # Split by commas and clean up each tag
-            for tag in match.split(','):
-                clean_tag = tag.strip().lower()
-                if clean_tag:
-                    tags.append(clean_tag)
+            tags.update(tag.strip().lower() for tag in match.split(','))
+        tags.discard('')
         
         # Add category-based tags
         if isinstance(entity, ClassEntity):
-            tags.append("class")
+            tags.add("class")
             
             # Check for common patterns in class names
-            if entity.name.endswith('Exception') or entity.name.endswith('Error'):
-                tags.append("exception")
+            if entity.name.endswith(('Exception', 'Error')):
+                tags.add("exception")
             elif entity.name.endswith('Manager'):
-                tags.append("manager")
+                tags.add("manager")
             elif entity.name.endswith('Factory'):
-                tags.append("factory")
+                tags.add("factory")
             elif entity.name.endswith('Service'):
-                tags.append("service")
+                tags.add("service")
             
             # Check for base classes patterns
             if any('test' in base.lower() for base in entity.base_classes):
-                tags.append("test")
+                tags.add("test")
             
         elif isinstance(entity, FunctionEntity):
-            if entity.is_method:
-                tags.append("method")
-            else:
-                tags.append("function")
+            tags.add("method" if entity.is_method else "function")
             
             # Check for test functions
             if entity.name.startswith('test_'):
-                tags.append("test")
+                tags.add("test")
             
             # Check for async functions
-            if entity.is_async:
-                tags.append("async")
+            if getattr(entity, 'is_async', False):
+                tags.add("async")
         
         # Check for specific keywords in the docstring
-        keyword_to_tag = {
-            "thread-safe": "threadsafe",
-            "thread safe": "threadsafe",
-            "deprecated": "deprecated",
-            "experimental": "experimental",
-            "example": "example",
-            "utility": "utility",
-            "helper": "helper",
-            "performance": "performance",
-            "optimization": "optimization"
-        }
-        
-        for keyword, tag in keyword_to_tag.items():
-            if keyword in docstring.lower():
-                tags.append(tag)
-        
-        return list(set(tags))  # Deduplicate tags
+        tags.update(_KEYWORD_TO_TAG[keyword] for keyword in _docstring_keywords(docstring)
+                    if keyword in _KEYWORD_TO_TAG)
+        
+        return list(tags)
 
-    def enrich_entity(self, entity: Entity) -> Dict[str, Any]:
+    def _file_metadata(self, file_path: Union[str, Path]) -> EntityMetadata:
         """
-        Enrich an entity with additional metadata.
+        Get the metadata shared by every entity defined in a file.
+        
+        The result is computed once per file and reused for later entities.
         
         Args:
-            entity: The entity to enrich
+            file_path: Path to the file
             
         Returns:
-            Dictionary of metadata
+            The file-level metadata fields
         """
-        metadata = {}
-        
-        # Get file-based metadata if we have a file path
-        if hasattr(entity, 'file_path') and entity.file_path:
-            # Get modification time
-            metadata['last_modified'] = self.get_file_modification_time(entity.file_path)
-            
-            # Get author information
-            author = self.get_file_author(entity.file_path)
-            if author:
-                metadata['author'] = author
-            
-            # Get version information
-            version = self.get_file_version(entity.file_path)
-            if version:
-                metadata['version'] = version
+        key = str(file_path)
+        metadata = self._file_meta.get(key)
+        if metadata is not None:
+            return metadata
+        
+        # Add a direct link to the file on common hosting providers
+        source_url = None
+        if self._source_url_prefix:
+            rel_path = self._rel(file_path)
+            if rel_path is None:
+                logger.warning(f"Failed to generate source URL: {file_path} is outside {self.repo_root}")
+            else:
+                source_url = self._source_url_prefix + rel_path
         
-        # Add stability indicator
-        stability = self.detect_stability(entity)
-        if stability:
-            metadata['stability'] = stability
+        metadata = EntityMetadata(
+            last_modified=self.get_file_modification_time(file_path),
+            author=self.get_file_author(file_path) or None,
+            version=self.get_file_version(file_path) or None,
+            repository=self.repo_url,
+            source_url=source_url,
+        )
         
-        # Add tags
-        tags = self.extract_tags(entity)
-        if tags:
-            metadata['tags'] = tags
+        self._file_meta[key] = metadata
+        return metadata
+
+    def enrich_entity(self, entity: Entity) -> Dict[str, Any]:
+        """
+        Enrich an entity with additional metadata.
         
-        # Add repository information
-        if self.repo_url:
-            metadata['repository'] = self.repo_url
+        Args:
+            entity: The entity to enrich
             
-            # If we have a file path, add a direct link to the file
-            if hasattr(entity, 'file_path') and entity.file_path and self.repo_root:
-                try:
-                    rel_path = Path(entity.file_path).relative_to(self.repo_root)
-                    
-                    # Format URL based on common hosting providers
-                    if 'github.com' in self.repo_url:
-                        file_url = f"{self.repo_url}/blob/main/{rel_path}"
-                        if hasattr(entity, 'line_number') and entity.line_number:
-                            file_url += f"#L{entity.line_number}"
-                        metadata['source_url'] = file_url
-                    elif 'gitlab.com' in self.repo_url:
-                        file_url = f"{self.repo_url}/-/blob/main/{rel_path}"
-                        if hasattr(entity, 'line_number') and entity.line_number:
-                            file_url += f"#L{entity.line_number}"
-                        metadata['source_url'] = file_url
-                except Exception as e:
-                    logger.warning(f"Failed to generate source URL: {e}")
-        
-        # Check for deprecation warnings in method code
-        for method in entity.methods:
-            if hasattr(method, 'code') and method.code and ("warnings.warn" in method.code or "DeprecationWarning" in method.code):
-                metadata['stability'] = 'deprecated'
-                metadata['deprecation_message'] = f"This class contains deprecated methods ({method.name})."
-                break
+        Returns:
+            Dictionary of the metadata fields that are set
+        """
+        return self._enrich_entity(entity).to_dict()
+
+    def _enrich_entity(self, entity: Entity) -> EntityMetadata:
+        """
+        Build the metadata of an entity as a compact tuple.
         
-        return metadata
+        Args:
+            entity: The entity to enrich
+            
+        Returns:
+            The entity's metadata
+        """
+        # Start from the metadata shared by the entity's file
+        if hasattr(entity, 'file_path') and entity.file_path:
+            file_metadata = self._file_metadata(entity.file_path)
+        else:
+            file_metadata = EntityMetadata(repository=self.repo_url)
+        
+        # Add stability indicator, scanning method code for deprecation only once
+        deprecation_message = None
+        deprecated_method = _find_deprecated_method(entity)
+        if deprecated_method:
+            stability = 'deprecated'
+            deprecation_message = f"This class contains deprecated methods ({deprecated_method.name})."
+        else:
+            stability = self.detect_stability(entity, check_methods=False)
+        
+        # Point the source link at the entity's line
+        source_url = file_metadata.source_url
+        if source_url and hasattr(entity, 'line_number') and entity.line_number:
+            source_url += f"#L{entity.line_number}"
+        
+        return file_metadata._replace(
+            stability=stability or None,
+            tags=self.extract_tags(entity) or None,
+            source_url=source_url,
+            deprecation_message=deprecation_message,
+        )
 
-    def enrich_entities(self, entities: List[Entity]) -> Dict[str, Dict[str, Any]]:
+    def enrich_entities(self, entities: List[Entity],
+                        workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
         """
         Enrich multiple entities with additional metadata.
         
+        Large batches are spread over a process pool. Entities from the same
+        file are sent to the same worker, and each worker starts from a copy
+        of this enricher whose git caches have already been filled.
+        
         Args:
             entities: List of entities to enrich
+            workers: Number of worker processes (defaults to the
+                ``max_workers`` setting, then the CPU count)
             
         Returns:
             Dictionary mapping entity IDs to metadata dictionaries
         """
+        workers = workers or self.config.get('max_workers') or os.cpu_count() or 1
+        
+        if workers <= 1 or len(entities) < _PARALLEL_MIN_ENTITIES:
+            all_metadata = [self._enrich_entity(entity) for entity in entities]
+        else:
+            # Fill the caches once here so that workers inherit them
+            self._git_ready.wait()
+            if not self._git_version_checked:
+                self._git_version = self._detect_git_version()
+                self._git_version_checked = True
+            
+            groups: Dict[Any, List[int]] = {}
+            for index, entity in enumerate(entities):
+                groups.setdefault(getattr(entity, 'file_path', None), []).append(index)
+            
+            tasks = [[entities[index] for index in group] for group in groups.values()]
+            chunksize = max(1, len(tasks) // (4 * workers))
+            
+            all_metadata: List[EntityMetadata] = [None] * len(entities)
+            with process_pool(workers, initializer=_init_worker,
+                              initargs=(self,)) as executor:
+                results = executor.map(_enrich_group, tasks, chunksize=chunksize)
+                for group, group_metadata in zip(groups.values(), results):
+                    for index, metadata in zip(group, group_metadata):
+                        all_metadata[index] = metadata
+        
         result = {}
         
-        for entity in entities:
-            entity_id = self._get_entity_id(entity)
-            metadata = self.enrich_entity(entity)
-            result[entity_id] = metadata
+        for entity, metadata in zip(entities, all_metadata):
+            result[self._get_entity_id(entity)] = metadata.to_dict()
         
         return result
 
@@ -510,20 +978,8 @@ class MetadataEnricher:
         Returns:
             A unique identifier string
         """
-        if entity.module_name:
-            if isinstance(entity, ModuleEntity):
-                return entity.name
-            elif isinstance(entity, ClassEntity):
-                return f"{entity.module_name}.{entity.name}"
-            elif isinstance(entity, FunctionEntity):
-                if entity.is_method and entity.parent_class:
-                    return f"{entity.module_name}.{entity.parent_class}.{entity.name}"
-                return f"{entity.module_name}.{entity.name}"
-            elif isinstance(entity, VariableEntity):
-                return f"{entity.module_name}.{entity.name}"
-        
-        # Default case - use type and name
-        return f"{type(entity).__name__}:{entity.name}"
+        parent_class = getattr(entity, 'parent_class', None) if getattr(entity, 'is_method', False) else None
+        return _entity_id(type(entity), getattr(entity, 'module_name', None), entity.name, parent_class)
 
     def get_metadata(self, entity: Entity) -> Dict[str, Any]:
         """
@@ -533,36 +989,24 @@ class MetadataEnricher:
             entity: The entity to get metadata for
             
         Returns:
-            A dictionary of metadata
+            A dictionary of the metadata fields that are set
         """
         return self.enrich_entity(entity)
 
+    def _slash(self, module_name: str) -> str:
+        """Convert a dotted module name to a path, caching the result."""
+        path = self._module_slash.get(module_name)
+        if path is None:
+            path = module_name.replace('.', '/')
+            self._module_slash[module_name] = path
+        return path
+
     def _get_entity_path(self, entity: Entity) -> str:
         """Get the path to the entity in the documentation."""
-        if isinstance(entity, ModuleEntity):
-            return entity.name.replace('.', '/')
-        
-        if isinstance(entity, ClassEntity):
-            if hasattr(entity, 'module_name') and entity.module_name:
-                return f"{entity.module_name.replace('.', '/')}/{entity.name}"
-            return entity.name
-        
-        if isinstance(entity, FunctionEntity):
-            if hasattr(entity, 'is_method') and entity.is_method and hasattr(entity, 'parent_class') and entity.parent_class:
-                if hasattr(entity, 'module_name') and entity.module_name:
-                    return f"{entity.module_name.replace('.', '/')}/{entity.parent_class}/{entity.name}"
-                return f"{entity.parent_class}/{entity.name}"
-            
-            if hasattr(entity, 'module_name') and entity.module_name:
-                return f"{entity.module_name.replace('.', '/')}/{entity.name}"
-            return entity.name
-        
-        if isinstance(entity, VariableEntity):
-            if hasattr(entity, 'module_name') and entity.module_name:
-                return f"{entity.module_name.replace('.', '/')}/{entity.name}"
-            return entity.name
-        
-        return str(entity.name)
+        build_path = _ENTITY_PATH_BUILDERS.get(type(entity))
+        if build_path is None:
+            return str(entity.name)
+        return build_path(entity, self._slash)
 
 
 if __name__ == "__main__":
@@ -8,15 +8,149 @@ and module dependencies.
 """
 
 import os
+import sys
 import ast
 import re
+import functools
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Any, Tuple, Union
-import networkx as nx
+from typing import Dict, FrozenSet, Iterable, List, Set, Optional, Any, Tuple, Union
 
 from codedoc.core.entities import (
     Entity, ModuleEntity, ClassEntity, FunctionEntity, VariableEntity
 )
+from codedoc.enhancers._call_visitor import FunctionCallVisitor, _ModuleCallVisitor
+from codedoc.enhancers._process_pool import process_pool
+
+# Module named by "import x" and "from x import y" statements
+_IMPORT_RE = re.compile(r'import\s+([\w.]+)')
+_FROM_RE = re.compile(r'from\s+([\w.]+)')
+
+# Below this many characters of module source, call analysis stays in-process.
+# Modules are walked at roughly 2M characters a second while starting a pool
+# costs tens of milliseconds or more, so only very large trees gain from workers
+# (see tools/benchmark_call_analysis.py)
+_PARALLEL_MIN_SOURCE_CHARS = 16 << 20
+
+
+def _walk_module(task: Tuple[str, Union[str, ast.AST], FrozenSet[str]]) -> Dict[str, List[str]]:
+    """
+    Collect the calls made by each known function of a module.
+    
+    Args:
+        task: The module name, its source code or AST, and the full names of
+            its registered functions
+        
+    Returns:
+        Called names by the full name of the calling function
+    """
+    module_name, module_code, function_names = task
+    if isinstance(module_code, str):
+        try:
+            module_code = ast.parse(module_code)
+        except SyntaxError:
+            return {}
+    
+    visitor = _ModuleCallVisitor(module_name, function_names)
+    visitor.visit(module_code)
+    return visitor.calls
+
+
+@functools.lru_cache(maxsize=8192)
+def _short_name(full_name: str) -> str:
+    """
+    Get a shortened name for display in diagrams.
+    
+    Args:
+        full_name: The fully qualified name
+        
+    Returns:
+        class.method for methods, otherwise the last part of the name
+    """
+    parts = full_name.split('.')
+    
+    # For methods (module.class.method), return class.method
+    if len(parts) >= 3:
+        return f"{parts[-2]}.{parts[-1]}"
+    
+    # For other entities, return the last part
+    return parts[-1]
+
+
+class _DiGraph:
+    """
+    Minimal directed graph with successor and predecessor adjacency.
+    
+    Neighbours are kept as dict keys rather than sets so they are returned in
+    the order the edges were added, which keeps generated documentation stable.
+    """
+    
+    def __init__(self):
+        """
+        Initialize an empty graph.
+        """
+        self.succ: Dict[str, Dict[str, None]] = {}
+        self.pred: Dict[str, Dict[str, None]] = {}
+    
+    def add_node(self, node: str) -> None:
+        """
+        Add a node without any edges.
+        
+        Args:
+            node: The node to add
+        """
+        self.succ.setdefault(node, {})
+        self.pred.setdefault(node, {})
+    
+    def add_edge(self, source: str, target: str) -> None:
+        """
+        Add an edge, adding both nodes if needed.
+        
+        Args:
+            source: The node the edge starts at
+            target: The node the edge ends at
+        """
+        self.succ.setdefault(source, {})[target] = None
+        self.pred.setdefault(source, {})
+        self.succ.setdefault(target, {})
+        self.pred.setdefault(target, {})[source] = None
+    
+    def add_edges_from(self, edges: Iterable[Tuple[str, str]]) -> None:
+        """
+        Add several edges.
+        
+        Args:
+            edges: (source, target) pairs to add
+        """
+        for source, target in edges:
+            self.add_edge(source, target)
+    
+    def successors(self, node: str) -> Iterable[str]:
+        """
+        Get the nodes a node has edges to.
+        
+        Args:
+            node: The node to look up
+            
+        Returns:
+            The successor nodes, in the order their edges were added
+        """
+        return self.succ.get(node, ())
+    
+    def predecessors(self, node: str) -> Iterable[str]:
+        """
+        Get the nodes with edges to a node.
+        
+        Args:
+            node: The node to look up
+            
+        Returns:
+            The predecessor nodes, in the order their edges were added
+        """
+        return self.pred.get(node, ())
+    
+    def __contains__(self, node: str) -> bool:
+        """Check whether a node is in the graph."""
+        return node in self.succ
 
 
 class RelationshipMapper:
@@ -38,27 +172,84 @@ class RelationshipMapper:
         Initialize the relationship mapper.
         """
         self.entities: Dict[str, Entity] = {}
-        self.entity_ids: Dict[str, str] = {}  # Maps entity objects to their IDs
+        self.entity_ids: Dict[str, str] = {}  # Maps entity.id to the entity's full name
         self.relationships: List[Tuple[str, str, str]] = []  # (source_id, target_id, relationship_type)
-        self.import_graph = nx.DiGraph()
-        self.inheritance_graph = nx.DiGraph()
-        self.call_graph = nx.DiGraph()
+        self._relationship_set: Set[Tuple[str, str, str]] = set()
+        self.import_graph = _DiGraph()
+        self.inheritance_graph = _DiGraph()
+        self.call_graph = _DiGraph()
         
         # Map of file paths to ModuleEntity objects
         self.modules: Dict[str, ModuleEntity] = {}
         
         # Track parent-child relationships for nested entities
         self.parent_map: Dict[str, str] = {}
+        
+        # IDs of entities already registered, so registration is idempotent
+        self._registered_ids: Set[str] = set()
+        
+        # Full names of registered functions by short name, in registration order
+        self._name_index: Dict[str, List[str]] = {}
+        
+        # Full names of the methods of each class, by the class's full name
+        self._methods_by_class: Dict[str, List[str]] = {}
+        
+        # Classes, module-level functions and variables of each module
+        self._by_module: Dict[str, Dict[str, List[Entity]]] = {}
+        
+        # Bumped whenever register_entities adds entities, so caches built
+        # from the registered entities can tell when they are stale
+        self.registration_version = 0
+        
+        # Resolved call targets by (call, caller module, caller class)
+        self._resolve_cache: Dict[Tuple[str, Optional[str], Optional[str]], Optional[str]] = {}
+        
+        # Dictionary forms of entities, by entity ID
+        self._to_dict_cache: Dict[str, Dict[str, Any]] = {}
+        
+        # Edges waiting to be added to each graph by finalize()
+        self._import_edges: List[Tuple[str, str]] = []
+        self._inherit_edges: List[Tuple[str, str]] = []
+        self._call_edges: List[Tuple[str, str]] = []
 
     def register_entities(self, entities: List[Entity]) -> None:
         """
         Register entities to be analyzed for relationships.
         
+        Entities that are already registered are skipped.
+        
         Args:
             entities: List of entities to register
         """
+        registered = len(self._registered_ids)
         for entity in entities:
+            if entity.id in self._registered_ids:
+                continue
+            self._registered_ids.add(entity.id)
             self._register_entity(entity)
+        
+        # New entities can change how calls resolve
+        if len(self._registered_ids) != registered:
+            self._resolve_cache.clear()
+            self.registration_version += 1
+        self.finalize()
+    
+    def finalize(self) -> None:
+        """
+        Add buffered edges to the import, inheritance and call graphs.
+        
+        Edges are collected in lists while entities and relationships are
+        registered and added here in one batch per graph.
+        """
+        if self._import_edges:
+            self.import_graph.add_edges_from(self._import_edges)
+            self._import_edges.clear()
+        if self._inherit_edges:
+            self.inheritance_graph.add_edges_from(self._inherit_edges)
+            self._inherit_edges.clear()
+        if self._call_edges:
+            self.call_graph.add_edges_from(self._call_edges)
+            self._call_edges.clear()
     
     def _register_entity(self, entity: Entity) -> None:
         """
@@ -67,48 +258,87 @@ class RelationshipMapper:
         Args:
             entity: The entity to register
         """
-        # Register by full name
-        full_name = self._get_full_name(entity)
+        # Intern module names so the per-module filters compare by identity
+        if isinstance(entity, ModuleEntity):
+            entity.name = sys.intern(entity.name)
+        elif getattr(entity, 'module_name', None):
+            entity.module_name = sys.intern(entity.module_name)
+        if getattr(entity, 'parent_class', None):
+            entity.parent_class = sys.intern(entity.parent_class)
+        
+        # Register by full name, cached on the entity for later lookups. The
+        # name is interned so the entity map, graphs and relationships share it
+        full_name = sys.intern(self._get_full_name(entity))
+        entity._full_name = full_name
         self.entities[full_name] = entity
+        self.entity_ids[entity.id] = full_name
+        
+        # Index module members by module
+        module_name = getattr(entity, 'module_name', None)
+        if module_name:
+            if isinstance(entity, ClassEntity):
+                bucket = 'classes'
+            elif isinstance(entity, FunctionEntity) and not entity.is_method:
+                bucket = 'functions'
+            elif isinstance(entity, VariableEntity):
+                bucket = 'variables'
+            else:
+                bucket = None
+            if bucket:
+                members = self._by_module.get(module_name)
+                if members is None:
+                    members = self._by_module[module_name] = {
+                        'classes': [], 'functions': [], 'variables': []
+                    }
+                members[bucket].append(entity)
         
         # Register modules separately
         if isinstance(entity, ModuleEntity):
             self.modules[entity.file_path] = entity
             
             # Add module to import graph
-            self.import_graph.add_node(full_name, entity=entity)
+            self.import_graph.add_node(full_name)
             
             # Process imports
             for imp in entity.imports:
                 # Extract the module being imported
                 imported_module = self._extract_module_from_import(imp)
                 if imported_module:
-                    self.import_graph.add_edge(full_name, imported_module)
+                    self._import_edges.append((full_name, imported_module))
         
         # Add class to inheritance graph
         if isinstance(entity, ClassEntity):
-            self.inheritance_graph.add_node(full_name, entity=entity)
+            self.inheritance_graph.add_node(full_name)
             
             # Process base classes
             for base in entity.base_classes:
                 # If base class is a direct name, try to resolve it within the same module
-                if '.' not in base and hasattr(entity, 'module_name') and entity.module_name:
+                if '.' not in base and getattr(entity, 'module_name', None):
                     qualified_base = f"{entity.module_name}.{base}"
                     if qualified_base in self.entities:
-                        self.inheritance_graph.add_edge(full_name, qualified_base)
+                        self._inherit_edges.append((full_name, qualified_base))
                     else:
-                        self.inheritance_graph.add_edge(full_name, base)
+                        self._inherit_edges.append((full_name, base))
                 else:
-                    self.inheritance_graph.add_edge(full_name, base)
+                    self._inherit_edges.append((full_name, base))
         
         # Add function to call graph
         if isinstance(entity, FunctionEntity):
-            self.call_graph.add_node(full_name, entity=entity)
+            self.call_graph.add_node(full_name)
+            self._name_index.setdefault(entity.name, []).append(full_name)
+            class_name = sys.intern(self._get_full_name_for_parent(entity))
+            entity._parent_full_name = class_name
+            
+            # Cache what _is_external_call compares on the entity
+            entity._module_prefix = getattr(entity, 'module_name', None)
+            entity._parent_class_full = None
             
             # For methods, track parent class
-            if entity.is_method and hasattr(entity, 'parent_class') and entity.parent_class:
-                class_name = self._get_full_name_for_parent(entity)
+            if entity.is_method and getattr(entity, 'parent_class', None):
                 self.parent_map[full_name] = class_name
+                entity._parent_class_full = class_name
+                if class_name:
+                    self._methods_by_class.setdefault(class_name, []).append(full_name)
 
     def _get_full_name(self, entity: Entity) -> str:
         """
@@ -120,20 +350,42 @@ class RelationshipMapper:
         Returns:
             The fully qualified name
         """
+        full_name = getattr(entity, '_full_name', None)
+        if full_name is not None:
+            return full_name
+        
         # For modules, use the module name
         if isinstance(entity, ModuleEntity):
             return entity.name
         
         # For other entities, use module.name
-        if hasattr(entity, 'module_name') and entity.module_name:
+        module_name = getattr(entity, 'module_name', None)
+        if module_name:
             # For methods, include the class name
-            if isinstance(entity, FunctionEntity) and entity.is_method and hasattr(entity, 'parent_class') and entity.parent_class:
-                return f"{entity.module_name}.{entity.parent_class}.{entity.name}"
-            return f"{entity.module_name}.{entity.name}"
+            if isinstance(entity, FunctionEntity) and entity.is_method:
+                parent_class = getattr(entity, 'parent_class', None)
+                if parent_class:
+                    return f"{module_name}.{parent_class}.{entity.name}"
+            return f"{module_name}.{entity.name}"
         
         # If no module name, just use the entity name
         return entity.name
 
+    def _get_entity_id(self, entity: Entity) -> str:
+        """
+        Get the ID relationships are recorded under for an entity.
+        
+        Args:
+            entity: The entity to get the ID for
+            
+        Returns:
+            The full name the entity was registered under
+        """
+        entity_id = self.entity_ids.get(entity.id)
+        if entity_id is None:
+            entity_id = self._get_full_name(entity)
+        return entity_id
+
     def _get_full_name_for_parent(self, entity: Entity) -> str:
         """
         Get the fully qualified name for a parent entity.
@@ -144,8 +396,15 @@ class RelationshipMapper:
         Returns:
             The fully qualified parent name
         """
-        if isinstance(entity, FunctionEntity) and hasattr(entity, 'parent_class') and entity.parent_class and hasattr(entity, 'module_name') and entity.module_name:
-            return f"{entity.module_name}.{entity.parent_class}"
+        parent_name = getattr(entity, '_parent_full_name', None)
+        if parent_name is not None:
+            return parent_name
+        
+        if isinstance(entity, FunctionEntity):
+            parent_class = getattr(entity, 'parent_class', None)
+            module_name = getattr(entity, 'module_name', None)
+            if parent_class and module_name:
+                return f"{module_name}.{parent_class}"
         return ""
 
     def _extract_module_from_import(self, import_stmt: str) -> str:
@@ -164,35 +423,93 @@ class RelationshipMapper:
             
         # Handle string import statements
         if isinstance(import_stmt, str):
-            # Handle "import x"
-            if import_stmt.startswith('import '):
-                parts = import_stmt[7:].split()
-                if parts and parts[0] != 'as':
-                    return parts[0].split('.')[0]
+            # Handle "import x", keeping only the top-level package
+            match = _IMPORT_RE.match(import_stmt)
+            if match:
+                return match.group(1).split('.', 1)[0]
             
             # Handle "from x import y"
-            elif import_stmt.startswith('from '):
-                parts = import_stmt[5:].split(' import ')
-                if len(parts) > 0:
-                    return parts[0]
+            match = _FROM_RE.match(import_stmt)
+            if match:
+                return match.group(1)
         
         return ""
 
-    def analyze_function_calls(self):
+    def analyze_function_calls(self, workers: Optional[int] = None) -> None:
         """
         Analyze function calls within functions to identify relationships.
+        
+        Modules with source code or an AST are walked once for all of their
+        functions. They are spread over a process pool only when there is so
+        much source that walking it outweighs starting the workers. Workers
+        are sent the source code where the module has it, since it pickles
+        far smaller than the AST. Functions with an AST that no module walk
+        found are visited one at a time.
+        
+        Args:
+            workers: Number of worker processes (defaults to the CPU count)
         """
+        function_names: Dict[str, Set[str]] = {}
+        for entity_id, entity in self.entities.items():
+            if isinstance(entity, FunctionEntity) and getattr(entity, 'module_name', None):
+                function_names.setdefault(entity.module_name, set()).add(entity_id)
+        
+        tasks = []
+        for module in self.modules.values():
+            module_code = getattr(module, 'code', None) or getattr(module, 'ast_node', None)
+            if module_code is not None:
+                names = frozenset(function_names.get(module.name, ()))
+                tasks.append((module.name, module_code, names))
+        
+        workers = workers or os.cpu_count() or 1
+        source_chars = sum(len(code) for _, code, _ in tasks if isinstance(code, str))
+        if workers <= 1 or source_chars < _PARALLEL_MIN_SOURCE_CHARS:
+            module_calls = [_walk_module(task) for task in tasks]
+        else:
+            chunksize = max(1, len(tasks) // (4 * workers))
+            with process_pool(workers) as executor:
+                module_calls = list(executor.map(_walk_module, tasks, chunksize=chunksize))
+        
+        # Merge the collected calls here, in module order
+        walked_functions = set()
+        for calls_by_function in module_calls:
+            walked_functions.update(calls_by_function)
+            for entity_id, calls in calls_by_function.items():
+                self._add_call_relationships(entity_id, self.entities[entity_id], calls)
+        
+        # Functions the module walks did not find are visited on their own
         for entity_id, entity in self.entities.items():
-            if isinstance(entity, FunctionEntity) and hasattr(entity, 'ast_node') and entity.ast_node:
+            if (isinstance(entity, FunctionEntity) and getattr(entity, 'ast_node', None)
+                    and entity_id not in walked_functions):
                 visitor = FunctionCallVisitor()
                 visitor.visit(entity.ast_node)
-                
-                for call_name in visitor.function_calls:
-                    # Check if the call is to a known function
-                    for target_id, target_entity in self.entities.items():
-                        if isinstance(target_entity, FunctionEntity) and target_entity.name == call_name:
-                            self._add_relationship(entity_id, target_id, "calls")
-                            break
+                self._add_call_relationships(entity_id, entity, visitor.function_calls)
+        
+        self.finalize()
+
+    def _add_call_relationships(self, entity_id: str, entity: FunctionEntity, calls: Iterable[str]) -> None:
+        """
+        Record "calls" relationships from a function to the functions it calls.
+        
+        Args:
+            entity_id: The full name of the calling function
+            entity: The calling function
+            calls: Names of the called functions, as written at the call sites
+        """
+        # Record each called name once, in call order
+        for call_name in dict.fromkeys(calls):
+            # Dotted calls are resolved against the caller's module and class
+            if '.' in call_name:
+                if getattr(entity, 'module_name', None):
+                    target_id = self._resolve_call_target(call_name, entity)
+                    if target_id:
+                        self._add_relationship(entity_id, target_id, "calls")
+                continue
+            
+            # Otherwise use the first known function with that name
+            target_ids = self._name_index.get(call_name)
+            if target_ids:
+                self._add_relationship(entity_id, target_ids[0], "calls")
 
     def _resolve_call_target(self, call: str, caller: Entity) -> Optional[str]:
         """
@@ -205,9 +522,36 @@ class RelationshipMapper:
         Returns:
             The fully qualified name of the target function, or None if it can't be resolved
         """
+        module_name = getattr(caller, 'module_name', None)
+        parent_class = None
+        if isinstance(caller, FunctionEntity) and caller.is_method:
+            parent_class = getattr(caller, 'parent_class', None)
+        
+        # Results are cached until more entities are registered
+        key = (call, module_name, parent_class)
+        if key in self._resolve_cache:
+            return self._resolve_cache[key]
+        
+        target = self._find_call_target(call, module_name, parent_class)
+        self._resolve_cache[key] = target
+        return target
+
+    def _find_call_target(self, call: str, module_name: Optional[str], parent_class: Optional[str]) -> Optional[str]:
+        """
+        Look up the registered function a call refers to.
+        
+        Args:
+            call: The function call as a string
+            module_name: Module of the calling entity
+            parent_class: Class of the calling method, if it is a method
+            
+        Returns:
+            The fully qualified name of the target function, interned so it is
+            the registered name object, or None if it can't be resolved
+        """
         # If call already has a full path
         if call in self.entities:
-            return call
+            return sys.intern(call)
         
         # If call has a dot, it might be a module.function or class.method
         if '.' in call:
@@ -219,28 +563,28 @@ class RelationshipMapper:
                 class_name, method_name = parts
                 
                 # If caller is in a module, try module.class.method
-                if caller.module_name:
-                    qualified_name = f"{caller.module_name}.{class_name}.{method_name}"
+                if module_name:
+                    qualified_name = f"{module_name}.{class_name}.{method_name}"
                     if qualified_name in self.entities:
-                        return qualified_name
+                        return sys.intern(qualified_name)
                     
                     # Also try as a direct reference to a module.function
                     qualified_name = f"{class_name}.{method_name}"
                     if qualified_name in self.entities:
-                        return qualified_name
+                        return sys.intern(qualified_name)
         
         # If it's a simple name, it might be in the same module
-        elif caller.module_name:
+        elif module_name:
             # Check if it's a function in the same module
-            qualified_name = f"{caller.module_name}.{call}"
+            qualified_name = f"{module_name}.{call}"
             if qualified_name in self.entities:
-                return qualified_name
+                return sys.intern(qualified_name)
             
             # If caller is a method, check if it's a method in the same class
-            if isinstance(caller, FunctionEntity) and caller.is_method and caller.parent_class:
-                qualified_name = f"{caller.module_name}.{caller.parent_class}.{call}"
+            if parent_class:
+                qualified_name = f"{module_name}.{parent_class}.{call}"
                 if qualified_name in self.entities:
-                    return qualified_name
+                    return sys.intern(qualified_name)
         
         return None
 
@@ -254,63 +598,40 @@ class RelationshipMapper:
         Returns:
             A dictionary with relationship types as keys and lists of related entities as values
         """
-        # Find all classes in this module
-        module_classes = [
-            entity for entity_id, entity in self.entities.items()
-            if isinstance(entity, ClassEntity) and hasattr(entity, 'module_name') and entity.module_name == module_name
-        ]
-        
-        # Find all functions in this module
-        module_functions = [
-            entity for entity_id, entity in self.entities.items()
-            if isinstance(entity, FunctionEntity) and 
-               not entity.is_method and 
-               hasattr(entity, 'module_name') and 
-               entity.module_name == module_name
-        ]
-        
-        # Find all variables in this module
-        module_variables = [
-            entity for entity_id, entity in self.entities.items()
-            if isinstance(entity, VariableEntity) and 
-               hasattr(entity, 'module_name') and 
-               entity.module_name == module_name
-        ]
+        # Classes, module-level functions and variables of this module
+        members = self._by_module.get(module_name, {})
         
         # Collect all relationships
         relationships = {
             "imports": [],
             "imported_by": [],
-            "classes": [self._entity_to_dict(cls) for cls in module_classes],
-            "functions": [self._entity_to_dict(func) for func in module_functions],
-            "variables": [self._entity_to_dict(var) for var in module_variables],
+            "classes": [self._entity_to_dict(cls) for cls in members.get('classes', ())],
+            "functions": [self._entity_to_dict(func) for func in members.get('functions', ())],
+            "variables": [self._entity_to_dict(var) for var in members.get('variables', ())],
         }
         
-        # Add import relationships
-        for source, target, rel_type in self.relationships:
-            source_entity = self.entities.get(source)
+        # Add import relationships between registered modules
+        self.finalize()
+        for target in self.import_graph.successors(module_name):
             target_entity = self.entities.get(target)
-            
-            if not source_entity or not target_entity:
-                continue
-                
-            if rel_type == "imports":
-                # This module imports another module
-                if isinstance(source_entity, ModuleEntity) and source_entity.name == module_name:
-                    relationships["imports"].append(self._entity_to_dict(target_entity))
-                
-                # This module is imported by another module
-                if isinstance(target_entity, ModuleEntity) and target_entity.name == module_name:
-                    relationships["imported_by"].append(self._entity_to_dict(source_entity))
+            if isinstance(target_entity, ModuleEntity):
+                relationships["imports"].append(self._entity_to_dict(target_entity))
+        
+        for source in self.import_graph.predecessors(module_name):
+            source_entity = self.entities.get(source)
+            if isinstance(source_entity, ModuleEntity):
+                relationships["imported_by"].append(self._entity_to_dict(source_entity))
         
         return relationships
 
-    def get_class_relationships(self, class_name: str) -> Dict[str, Any]:
+    def get_class_relationships(self, class_name: str, include_diagram: bool = True) -> Dict[str, Any]:
         """
         Get relationships for a class.
         
         Args:
             class_name: The fully qualified name of the class
+            include_diagram: Whether to build the Mermaid class_hierarchy
+                statements, which are left empty otherwise
             
         Returns:
             A dictionary containing relationship information
@@ -323,6 +644,8 @@ class RelationshipMapper:
             'class_hierarchy': []
         }
         
+        self.finalize()
+        
         # Get inheritance relationships
         if class_name in self.inheritance_graph:
             results['inherits_from'] = [
@@ -332,8 +655,9 @@ class RelationshipMapper:
                 str(derived) for derived in self.inheritance_graph.predecessors(class_name)
                 if derived != class_name  # Skip self-inheritance
             ]
-            
-            # Generate Mermaid class diagram statements
+        
+        # Generate Mermaid class diagram statements
+        if include_diagram:
             class_short = class_name.split('.')[-1]
             
             # Add base classes
@@ -346,41 +670,33 @@ class RelationshipMapper:
                 derived_short = derived.split('.')[-1]
                 results['class_hierarchy'].append(f"{class_short} <|-- {derived_short}")
         
-        # Find method calls
-        class_methods = [
-            name for name, entity in self.entities.items()
-            if isinstance(entity, FunctionEntity) and 
-               entity.is_method and 
-               self._get_full_name_for_parent(entity) == class_name
-        ]
-        
-        # Collect all uses (what this class's methods call)
-        uses = set()
-        for method in class_methods:
-            if method in self.call_graph:
-                for target in self.call_graph.successors(method):
-                    if self._is_external_call(method, target):
-                        uses.add(target)
-        
-        # Collect all used_by (what calls this class's methods)
-        used_by = set()
-        for method in class_methods:
-            if method in self.call_graph:
-                for source in self.call_graph.predecessors(method):
-                    if self._is_external_call(source, method):
-                        used_by.add(source)
+        # Collect what this class's methods call and what calls them in one
+        # pass, keeping the order in which they are found
+        uses: Dict[str, None] = {}
+        used_by: Dict[str, None] = {}
+        successors = self.call_graph.successors
+        predecessors = self.call_graph.predecessors
+        for method in self._methods_by_class.get(class_name, ()):
+            for target in successors(method):
+                if self._is_external_call(method, target):
+                    uses[target] = None
+            for source in predecessors(method):
+                if self._is_external_call(source, method):
+                    used_by[source] = None
         
         results['uses'] = list(uses)
         results['used_by'] = list(used_by)
         
         return results
 
-    def get_function_relationships(self, function_name: str) -> Dict[str, Any]:
+    def get_function_relationships(self, function_name: str, include_diagram: bool = True) -> Dict[str, Any]:
         """
         Get relationships for a function.
         
         Args:
             function_name: The fully qualified name of the function
+            include_diagram: Whether to build the Mermaid call_graph
+                statements, which are left empty otherwise
             
         Returns:
             A dictionary containing relationship information
@@ -393,6 +709,8 @@ class RelationshipMapper:
             'call_graph': []
         }
         
+        self.finalize()
+        
         # Get call relationships
         if function_name in self.call_graph:
             # Get calls made by this function
@@ -405,17 +723,18 @@ class RelationshipMapper:
             results['function_calls']['called_by'] = called_by
             
             # Generate Mermaid flow diagram statements
-            func_short = self._get_short_name(function_name)
-            
-            # Add function calls
-            for call in calls:
-                call_short = self._get_short_name(call)
-                results['call_graph'].append(f"{func_short} --> {call_short}")
-            
-            # Add callers
-            for caller in called_by:
-                caller_short = self._get_short_name(caller)
-                results['call_graph'].append(f"{caller_short} --> {func_short}")
+            if include_diagram:
+                func_short = self._get_short_name(function_name)
+                
+                # Add function calls
+                for call in calls:
+                    call_short = self._get_short_name(call)
+                    results['call_graph'].append(f"{func_short} --> {call_short}")
+                
+                # Add callers
+                for caller in called_by:
+                    caller_short = self._get_short_name(caller)
+                    results['call_graph'].append(f"{caller_short} --> {func_short}")
         
         return results
 
@@ -446,6 +765,24 @@ class RelationshipMapper:
         Returns:
             True if the call is between different entities
         """
+        # Registered functions carry their module and parent class
+        source_entity = self.entities.get(source)
+        target_entity = self.entities.get(target)
+        if hasattr(source_entity, '_parent_class_full') and hasattr(target_entity, '_parent_class_full'):
+            source_parent = source_entity._parent_class_full
+            target_parent = target_entity._parent_class_full
+            
+            # Calls involving a method are external unless both share a class
+            if source_parent is not None or target_parent is not None:
+                return source_parent != target_parent
+            
+            # Calls between functions are external across modules
+            source_module = source_entity._module_prefix
+            target_module = target_entity._module_prefix
+            if source_module and target_module:
+                return source_module != target_module
+            return True
+        
         # If the source is in parent_map (a method), compare the class with the target
         if source in self.parent_map:
             source_parent = self.parent_map[source]
@@ -484,21 +821,16 @@ class RelationshipMapper:
         Returns:
             A shortened name suitable for display
         """
-        parts = full_name.split('.')
-        
-        # For methods (module.class.method), return class.method
-        if len(parts) >= 3:
-            return f"{parts[-2]}.{parts[-1]}"
-        
-        # For other entities, return the last part
-        return parts[-1]
+        return _short_name(full_name)
 
-    def get_relationships_for_entity(self, entity: Entity) -> Dict[str, Any]:
+    def get_relationships_for_entity(self, entity: Entity, include_diagram: bool = True) -> Dict[str, Any]:
         """
         Get relationships for an entity.
         
         Args:
             entity: The entity to get relationships for
+            include_diagram: Whether to build Mermaid diagram statements for
+                classes and functions
             
         Returns:
             A dictionary containing relationship information
@@ -508,9 +840,9 @@ class RelationshipMapper:
         if isinstance(entity, ModuleEntity):
             return self.get_module_relationships(full_name)
         elif isinstance(entity, ClassEntity):
-            return self.get_class_relationships(full_name)
+            return self.get_class_relationships(full_name, include_diagram)
         elif isinstance(entity, FunctionEntity):
-            return self.get_function_relationships(full_name)
+            return self.get_function_relationships(full_name, include_diagram)
         elif isinstance(entity, VariableEntity):
             return self.get_variable_relationships(full_name)
         else:
@@ -520,113 +852,71 @@ class RelationshipMapper:
         """
         Convert an entity to a dictionary representation.
         
+        The dictionary is built once per entity and shared by later calls, so
+        callers must not modify it.
+        
         Args:
             entity: The entity to convert
             
         Returns:
             A dictionary representation of the entity
         """
+        result = self._to_dict_cache.get(entity.id)
+        if result is not None:
+            return result
+        
         result = {
             "name": entity.name,
             "type": type(entity).__name__,
         }
         
         # Add module name if available
-        if hasattr(entity, "module_name") and entity.module_name:
-            result["module_name"] = entity.module_name
+        module_name = getattr(entity, "module_name", None)
+        if module_name:
+            result["module_name"] = module_name
             
         # Add class-specific attributes
         if isinstance(entity, ClassEntity):
-            if hasattr(entity, "base_classes") and entity.base_classes:
+            if entity.base_classes:
                 result["base_classes"] = entity.base_classes
                 
         # Add function-specific attributes
         if isinstance(entity, FunctionEntity):
-            if hasattr(entity, "is_method") and entity.is_method:
+            if entity.is_method:
                 result["is_method"] = entity.is_method
-            if hasattr(entity, "parent_class") and entity.parent_class:
-                result["parent_class"] = entity.parent_class
-                
+            parent_class = getattr(entity, "parent_class", None)
+            if parent_class:
+                result["parent_class"] = parent_class
+        
+        self._to_dict_cache[entity.id] = result
         return result
 
     def _add_relationship(self, source_id: str, target_id: str, relationship_type: str) -> None:
         """
         Add a relationship between two entities.
         
+        Relationships that were already added are ignored.
+        
         Args:
             source_id: The ID of the source entity
             target_id: The ID of the target entity
             relationship_type: The type of relationship
         """
-        # Add to the appropriate graph
+        relationship = (source_id, target_id, relationship_type)
+        if relationship in self._relationship_set:
+            return
+        self._relationship_set.add(relationship)
+        
+        # Buffer the edge for the appropriate graph
         if relationship_type == "inherits":
-            self.inheritance_graph.add_edge(source_id, target_id)
+            self._inherit_edges.append((source_id, target_id))
         elif relationship_type == "calls":
-            self.call_graph.add_edge(source_id, target_id)
+            self._call_edges.append((source_id, target_id))
         elif relationship_type == "imports":
-            self.import_graph.add_edge(source_id, target_id)
+            self._import_edges.append((source_id, target_id))
             
         # Add to the general relationships list
-        self.relationships.append((source_id, target_id, relationship_type))
-
-
-class FunctionCallVisitor(ast.NodeVisitor):
-    """
-    AST visitor that identifies function calls in code.
-    """
-    
-    def __init__(self):
-        """
-        Initialize the visitor.
-        """
-        self.function_calls: Set[str] = set()
-
-    def visit_Call(self, node: ast.Call) -> None:
-        """
-        Visit a function call node in the AST.
-        
-        Args:
-            node: The AST node representing a function call
-        """
-        # Extract the call target
-        if isinstance(node.func, ast.Name):
-            # Simple function call: func()
-            self.function_calls.add(node.func.id)
-        elif isinstance(node.func, ast.Attribute):
-            # Attribute call: obj.method()
-            # Convert to a dotted path
-            path = self._get_attribute_path(node.func)
-            if path:
-                self.function_calls.add(path)
-        
-        # Continue visiting children
-        self.generic_visit(node)
-
-    def _get_attribute_path(self, node: ast.Attribute) -> str:
-        """
-        Convert an attribute node to a dotted path.
-        
-        Args:
-            node: The attribute node
-            
-        Returns:
-            The dotted path as a string
-        """
-        parts = []
-        
-        current = node
-        while isinstance(current, ast.Attribute):
-            parts.append(current.attr)
-            current = current.value
-        
-        if isinstance(current, ast.Name):
-            parts.append(current.id)
-        else:
-            # If it's not a simple chain of attributes, return just the method name
-            return node.attr
-        
-        # Reverse and join with dots
-        return '.'.join(reversed(parts))
+        self.relationships.append(relationship)
 
 
 if __name__ == "__main__":
@@ -584,9 +584,12 @@ flowchart TD
         
         if self.template_dir and self.template_dir.exists():
             # Load templates from files
+            # Templates are compiled once below, so never re-check the files
             self.env = Environment(
                 loader=FileSystemLoader(self.template_dir),
-                autoescape=select_autoescape(['html', 'xml'])
+                autoescape=select_autoescape(['html', 'xml']),
+                auto_reload=False,
+                cache_size=-1
             )
             self._load_templates_from_dir()
         else:
@@ -669,7 +672,8 @@ flowchart TD
         if not template:
             raise ValueError(f"Template '{template_name}' not found")
         
-        return template.render(**context)
+        # Pass the mapping through as-is rather than unpacking it into a copy
+        return template.render(context)
 
     def render_for_entity(self, 
                          entity: Entity, 
@@ -5,7 +5,7 @@ This module provides interfaces and implementations for interacting with Large L
 like OpenAI GPT and Google Gemini, handling authentication, prompt management, and response processing.
 """
 
-from codedoc.llm.base import LLMClient, LLMResponse, LLMError
+from codedoc.llm.base import LLMClient, LLMResponse, LLMStreamChunk, LLMError
 from codedoc.llm.openai_client import OpenAIClient
 from codedoc.llm.responses_client import ResponsesClient
 from codedoc.llm.gemini_client import GeminiClient
@@ -14,6 +14,7 @@ from codedoc.llm.prompt_manager import PromptManager
 __all__ = [
     'LLMClient',
     'LLMResponse',
+    'LLMStreamChunk',
     'LLMError',
     'OpenAIClient',
     'ResponsesClient',
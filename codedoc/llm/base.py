@@ -7,7 +7,7 @@ including response handling, error management, and the core client interface.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterator, List, Optional, Any, Union
 
 
 class LLMError(Exception):
@@ -45,6 +45,16 @@ class LLMResponse:
         return self.tokens_prompt + self.tokens_completion
 
 
+@dataclass
+class LLMStreamChunk:
+    """A piece of a streamed LLM response."""
+    
+    content: str
+    model: Optional[str] = None
+    tokens_prompt: int = 0
+    tokens_completion: int = 0
+
+
 class LLMClient(ABC):
     """Abstract base class for LLM API clients."""
     
@@ -96,4 +106,54 @@ class LLMClient(ABC):
         Returns:
             Model name as a string
         """
-        pass 
\ No newline at end of file
+        pass 
+    
+    def generate_with_system_prompt_stream(self,
+                                           system_prompt: str,
+                                           user_prompt: str,
+                                           model: Optional[str] = None,
+                                           temperature: float = 0.7,
+                                           **kwargs) -> Iterator[LLMStreamChunk]:
+        """
+        Generate a response with a system prompt, yielding it in chunks.
+        
+        Token usage is reported on the chunks that carry it, usually the
+        last one. Clients without native streaming yield the whole response
+        as a single chunk.
+        
+        Args:
+            system_prompt: Instructions to the model about how to behave
+            user_prompt: The user's input/question
+            model: The specific model to use
+            temperature: Sampling temperature (0.0 to 1.0)
+            **kwargs: Additional model-specific parameters
+            
+        Yields:
+            LLMStreamChunk objects in the order they are generated
+            
+        Raises:
+            LLMError: If the API request fails
+        """
+        if hasattr(self, 'generate_with_system_prompt'):
+            response = self.generate_with_system_prompt(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                model=model,
+                temperature=temperature,
+                **kwargs
+            )
+        else:
+            response = self.generate(
+                user_prompt,
+                system_prompt=system_prompt,
+                model=model,
+                temperature=temperature,
+                **kwargs
+            )
+        
+        yield LLMStreamChunk(
+            content=response.content,
+            model=response.model,
+            tokens_prompt=response.tokens_prompt,
+            tokens_completion=response.tokens_completion
+        )
@@ -7,7 +7,7 @@ handling authentication, prompt formatting, and response processing.
 
 import os
 import logging
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterator, List, Optional, Any, Union
 import time
 from functools import wraps
 
@@ -16,7 +16,7 @@ import openai
 from openai import OpenAI
 from openai.types.chat import ChatCompletion
 
-from codedoc.llm.base import LLMClient, LLMResponse, LLMError
+from codedoc.llm.base import LLMClient, LLMResponse, LLMStreamChunk, LLMError
 
 logger = logging.getLogger(__name__)
 
@@ -216,6 +216,91 @@ class OpenAIClient(LLMClient):
             logger.error(f"Error generating response with system prompt: {str(e)}")
             raise LLMError(f"Error generating response with system prompt: {str(e)}")
     
+    def generate_with_system_prompt_stream(self,
+                                           system_prompt: str,
+                                           user_prompt: str,
+                                           model: Optional[str] = None,
+                                           max_tokens: Optional[int] = None,
+                                           temperature: float = 0.7,
+                                           **kwargs) -> Iterator[LLMStreamChunk]:
+        """
+        Generate a response with a system prompt, yielding content as it arrives.
+        
+        Opening the stream is retried like the other API calls, but an error
+        after chunks have started arriving is raised as is and not retried,
+        since the chunks already yielded cannot be taken back.
+        
+        Args:
+            system_prompt: Instructions to the model about how to behave
+            user_prompt: The user's input/question
+            model: The specific model to use (defaults to DEFAULT_MODEL)
+            max_tokens: Maximum number of tokens to generate
+            temperature: Controls randomness (0.0 = deterministic, 1.0 = creative)
+            **kwargs: Additional parameters to pass to the API
+            
+        Yields:
+            LLMStreamChunk objects; the final chunk carries the token usage
+            
+        Raises:
+            LLMError: If the API call fails or returns an error
+        """
+        model = model or DEFAULT_MODEL
+        max_tokens = max_tokens or DEFAULT_MAX_TOKENS
+        
+        logger.debug(f"Streaming response with system prompt, model {model}")
+        
+        try:
+            stream = self._create_stream(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **kwargs
+            )
+            
+            for event in stream:
+                if event.choices:
+                    content = event.choices[0].delta.content
+                    if content:
+                        yield LLMStreamChunk(content=content, model=model)
+                
+                # Usage arrives on a final event without choices
+                if event.usage:
+                    yield LLMStreamChunk(
+                        content="",
+                        model=model,
+                        tokens_prompt=event.usage.prompt_tokens,
+                        tokens_completion=event.usage.completion_tokens
+                    )
+            
+        except Exception as e:
+            logger.error(f"Error streaming response with system prompt: {str(e)}")
+            raise LLMError(f"Error streaming response with system prompt: {str(e)}")
+    
+    @retry_on_error()
+    def _create_stream(self, **kwargs):
+        """
+        Open a streaming chat completion.
+        
+        The request is retried like the other API calls; once it returns,
+        chunks have not been consumed yet, so a retry never repeats output.
+        Errors raised while the stream is read are not retried.
+        
+        Args:
+            **kwargs: Parameters to pass to the API
+            
+        Returns:
+            The chat completion stream
+        """
+        return self.client.chat.completions.create(
+            stream=True,
+            stream_options={"include_usage": True},
+            **kwargs
+        )
+    
     def calculate_tokens(self, text: str) -> int:
         """
         Calculate the number of tokens in the given text using OpenAI's tokenizer.
@@ -17,6 +17,11 @@ import jinja2
 
 logger = logging.getLogger(__name__)
 
+# Separator between the system and user parts of a template
+_SYSTEM_USER_SPLIT_RE = re.compile(r'\n===\n')
+_SYSTEM_PREFIX_RE = re.compile(r'^SYSTEM:\s*')
+_USER_PREFIX_RE = re.compile(r'^USER:\s*')
+
 
 class PromptManager:
     """
@@ -33,6 +38,12 @@ class PromptManager:
                            If not provided, default templates will be loaded.
         """
         self.templates = {}
+        
+        # Compiled templates and system/user template pairs keyed by
+        # template source, so each template is parsed once
+        self._compiled: Dict[str, Any] = {}
+        self._compiled_split: Dict[str, Any] = {}
+        
         self.jinja_env = jinja2.Environment(
             loader=jinja2.FileSystemLoader("."),
             autoescape=False,
@@ -179,6 +190,21 @@ Provide a detailed complexity analysis including cyclomatic complexity, cognitiv
             except Exception as e:
                 logger.error(f"Error loading YAML template {file_path}: {str(e)}")
     
+    def _compile(self, template_str: str) -> jinja2.Template:
+        """
+        Compile a template, reusing the result for the same source.
+        
+        Args:
+            template_str: The template source
+            
+        Returns:
+            The compiled Jinja template
+        """
+        template = self._compiled.get(template_str)
+        if template is None:
+            template = self._compiled[template_str] = self.jinja_env.from_string(template_str)
+        return template
+    
     def render_template(self, name: str, variables: Dict[str, Any]) -> str:
         """
         Render a template with the provided variables.
@@ -196,8 +222,7 @@ Provide a detailed complexity analysis including cyclomatic complexity, cognitiv
         if name not in self.templates:
             raise ValueError(f"Template '{name}' not found")
         
-        template_str = self.templates[name]
-        template = self.jinja_env.from_string(template_str)
+        template = self._compile(self.templates[name])
         return template.render(**variables)
     
     def render_with_system(self, name: str, variables: Dict[str, Any]) -> Dict[str, str]:
@@ -219,20 +244,26 @@ Provide a detailed complexity analysis including cyclomatic complexity, cognitiv
         
         template_str = self.templates[name]
         
-        # Split template into system and user parts
-        parts = re.split(r'\n===\n', template_str, maxsplit=1)
-        if len(parts) != 2:
-            raise ValueError(f"Template '{name}' does not have valid system/user split (use '==='')")
-        
-        system_part, user_part = parts
-        
-        # Remove "SYSTEM:" and "USER:" prefixes if present
-        system_part = re.sub(r'^SYSTEM:\s*', '', system_part.strip())
-        user_part = re.sub(r'^USER:\s*', '', user_part.strip())
+        split = self._compiled_split.get(template_str)
+        if split is None:
+            # Split template into system and user parts
+            parts = _SYSTEM_USER_SPLIT_RE.split(template_str, maxsplit=1)
+            if len(parts) != 2:
+                raise ValueError(f"Template '{name}' does not have valid system/user split (use '==='')")
+            
+            system_part, user_part = parts
+            
+            # Remove "SYSTEM:" and "USER:" prefixes if present
+            system_part = _SYSTEM_PREFIX_RE.sub('', system_part.strip())
+            user_part = _USER_PREFIX_RE.sub('', user_part.strip())
+            
+            split = self._compiled_split[template_str] = (
+                self.jinja_env.from_string(system_part),
+                self.jinja_env.from_string(user_part),
+            )
         
         # Render both parts
-        system_template = self.jinja_env.from_string(system_part)
-        user_template = self.jinja_env.from_string(user_part)
+        system_template, user_template = split
         
         return {
             "system": system_template.render(**variables).strip(),
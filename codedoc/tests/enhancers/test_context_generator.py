@@ -0,0 +1,192 @@
+"""
+Tests for the context generator.
+"""
+
+import pytest
+
+from codedoc.core.entities import (
+    ModuleEntity, ClassEntity, FunctionEntity, VariableEntity, ImportEntity
+)
+from codedoc.enhancers.relationship_mapper import RelationshipMapper
+from codedoc.enhancers import _complexity
+from codedoc.enhancers._complexity import classify_complexity, count_branches_batch
+from codedoc.enhancers.context_generator import ContextGenerator
+
+
+@pytest.fixture
+def module_entities():
+    """Create a small module with a class, a function and a variable."""
+    module = ModuleEntity(name="pkg.mod", file_path="pkg/mod.py")
+
+    cls = ClassEntity(name="Widget", base_classes=["Base"])
+    cls.module_name = "pkg.mod"
+
+    func = FunctionEntity(name="build")
+    func.module_name = "pkg.mod"
+
+    var = VariableEntity(name="DEFAULT")
+    var.module_name = "pkg.mod"
+
+    return [module, cls, func, var]
+
+
+@pytest.fixture
+def context_generator(module_entities):
+    """Create a context generator backed by a populated relationship mapper."""
+    mapper = RelationshipMapper()
+    mapper.register_entities(module_entities)
+    return ContextGenerator(relationship_mapper=mapper)
+
+
+class TestContextGenerator:
+    """Tests for the ContextGenerator class."""
+
+    def test_get_classes(self, context_generator, module_entities):
+        """Test listing the classes of a module."""
+        module = module_entities[0]
+        assert context_generator._get_classes(module) == ["Widget (inherits from Base)"]
+
+    def test_get_functions_excludes_methods(self, context_generator, module_entities):
+        """Test that module functions are listed without class methods."""
+        method = FunctionEntity(name="run", is_method=True)
+        method.module_name = "pkg.mod"
+        method.parent_class = "Widget"
+        context_generator.relationship_mapper.register_entities([method])
+        assert context_generator._get_functions(module_entities[0]) == ["build"]
+
+    def test_get_module_members(self, context_generator, module_entities):
+        """Test that module members are bucketed by module and entity type."""
+        module = module_entities[0]
+        assert context_generator._get_variables(module) == ["DEFAULT"]
+        assert context_generator._get_module_members(module, 'functions') == [module_entities[2]]
+        assert not context_generator._get_module_members(ModuleEntity(name="pkg.empty"), 'classes')
+
+    def test_caches_cleared_when_entities_registered(self, context_generator, module_entities):
+        """Test that entities registered after first use are picked up."""
+        module = module_entities[0]
+        assert context_generator._get_functions(module) == ["build"]
+        context_generator.precompute_complexities()
+
+        func = FunctionEntity(name="later")
+        func.module_name = "pkg.mod"
+        func.code = "def later():\n    if x:\n        return 1\n"
+        context_generator.relationship_mapper.register_entities([func])
+
+        assert context_generator._get_functions(module) == ["build", "later"]
+        assert context_generator._get_function_complexity(func) == "Low (few branches)"
+        assert id(func) in context_generator._complexity_by_id
+
+    def test_get_helpers_are_memoized(self, context_generator, module_entities):
+        """Test that repeated queries for the same entity reuse the first result."""
+        module = module_entities[0]
+        first = context_generator._get_classes(module)
+        assert context_generator._get_classes(module) is first
+
+        # Registering entities invalidates the cached result
+        late = ClassEntity(name="Late")
+        late.module_name = "pkg.mod"
+        context_generator.relationship_mapper.register_entities([late])
+
+        assert context_generator._get_classes(module) == ["Widget (inherits from Base)", "Late"]
+
+    def test_get_class_members(self, context_generator, module_entities):
+        """Test listing class members, including attributes the entity lacks."""
+        cls = module_entities[1]
+        cls.methods = [FunctionEntity(name="run", is_method=True)]
+        assert context_generator._get_methods(cls) == ["run"]
+        assert context_generator._get_properties(cls) == []
+        assert context_generator._get_instance_variables(cls) == []
+        assert context_generator._get_function_calls(cls.methods[0]) == ()
+        assert context_generator._get_return_values(cls.methods[0]) == ()
+
+    def test_implementation_notes_keep_word_spacing(self, context_generator):
+        """Test that implementation notes are emitted as built, one note per line."""
+        module = ModuleEntity(name="pkg.other")
+        module.imports = [ImportEntity("os"), ImportEntity("typing")]
+        assert context_generator.generate_implementation_notes(module) == (
+            "External Dependencies: os, typing"
+        )
+
+        cls = ClassEntity(name="Widget", base_classes=["Base", "Mixin"])
+        cls.methods = [FunctionEntity(name="run", is_method=True)]
+        assert context_generator.generate_implementation_notes(cls) == (
+            "Base Classes: Base, Mixin\nMethods: run"
+        )
+
+    def test_examples_keep_code_layout(self, context_generator, module_entities):
+        """Test that generated examples keep their spaces and line breaks."""
+        func = module_entities[2]
+        assert context_generator.generate_examples(func).endswith(
+            "# Call the build function\nresult = build()"
+        )
+
+        cls = module_entities[1]
+        cls.methods = []
+        assert context_generator.generate_examples(cls).startswith(
+            "from pkg.mod import Widget\n\n# Create an instance of Widget\n"
+        )
+
+    def test_get_dependencies(self, context_generator):
+        """Test splitting imports into external and internal dependencies."""
+        module = ModuleEntity(name="pkg.other")
+        module.imports = [ImportEntity("os"), ImportEntity(".sibling"), ImportEntity("typing")]
+        assert context_generator._get_external_dependencies(module) == ["os", "typing"]
+        assert context_generator._get_internal_dependencies(module) == [".sibling"]
+
+        legacy = ModuleEntity(name="pkg.legacy")
+        legacy.imports = ["import os", "from . import sibling", "import .relative"]
+        assert context_generator._get_external_dependencies(legacy) == ["import os"]
+        assert context_generator._get_internal_dependencies(legacy) == [
+            "from . import sibling", "import .relative"
+        ]
+
+    def test_get_function_complexity(self, context_generator):
+        """Test branch counting for the complexity estimate."""
+        func = FunctionEntity(name="loop")
+        func.code = "def loop(xs):\n    for x in xs:\n        if x:\n            while x:\n                x -= 1\n"
+        assert context_generator._get_function_complexity(func) == "Moderate"
+
+        simple = FunctionEntity(name="simple")
+        simple.code = "def simple():\n    return 'iffy format'\n"
+        assert context_generator._get_function_complexity(simple) == "Simple (linear execution)"
+
+        for code, label in [
+            ("if a: pass\nif b: pass", "Low (few branches)"),
+            ("if a: pass\n" * 5, "Moderate"),
+            ("if a: pass\n" * 6, "Complex (many branches)"),
+        ]:
+            func = FunctionEntity(name="branchy")
+            func.code = code
+            assert context_generator._get_function_complexity(func) == label
+
+    def test_precompute_complexities(self, context_generator, module_entities):
+        """Test that registered functions are classified in one batch."""
+        func = module_entities[2]
+        func.code = "def build():\n    if x:\n        return 1\n"
+        context_generator.precompute_complexities()
+        assert context_generator._complexity_by_id == {id(func): "Low (few branches)"}
+        assert context_generator._get_function_complexity(func) == "Low (few branches)"
+
+
+@pytest.mark.parametrize("use_hyperscan", [True, False])
+def test_count_branches_batch(monkeypatch, use_hyperscan):
+    """Test batched branch counting with and without Hyperscan."""
+    if use_hyperscan:
+        pytest.importorskip("hyperscan")
+    else:
+        monkeypatch.setattr(_complexity, "hyperscan", None)
+    _complexity._branch_database.cache_clear()
+
+    codes = ["if a:\n    for b in c:\n        while d: pass", "iffy = fortune", ""]
+    try:
+        assert count_branches_batch(codes) == [3, 0, 0]
+    finally:
+        _complexity._branch_database.cache_clear()
+
+
+def test_classify_complexity():
+    """Test the complexity labels at each branch count threshold."""
+    assert classify_complexity("return x") == "Simple (linear execution)"
+    assert classify_complexity("if a: pass\n" * 2) == "Low (few branches)"
+    assert classify_complexity("if a: pass\n" * 5) == "Moderate"
+    assert classify_complexity("if a: pass\n" * 6) == "Complex (many branches)"
@@ -0,0 +1,186 @@
+"""
+Tests for the enhanced documentation generator.
+"""
+
+import json
+
+import pytest
+from pathlib import Path
+
+from codedoc.core.entities import ModuleEntity, ClassEntity, FunctionEntity, ImportEntity
+from codedoc.enhancers import enhanced_generator
+from codedoc.enhancers._default_templates import CLASS_TEMPLATE
+from codedoc.enhancers.enhanced_generator import EnhancedDocumentationGenerator
+
+
+@pytest.fixture
+def entities():
+    """Create a module with a class, a method and a top-level function."""
+    module = ModuleEntity(name="pkg", file_path="pkg/__init__.py", docstring="A package.")
+    module.imports = [ImportEntity("os"), ImportEntity("typing")]
+
+    method = FunctionEntity(name="run", is_method=True, docstring="Run the widget.")
+    method.module_name = "pkg"
+    method.parent_class = "Widget"
+
+    cls = ClassEntity(name="Widget", base_classes=["Base"])
+    cls.methods = [method]
+    cls.module_name = "pkg"
+
+    func = FunctionEntity(name="build", docstring="Build a widget.")
+    func.module_name = "pkg"
+
+    return [module, cls, method, func]
+
+
+@pytest.fixture
+def generator(temp_dir, entities):
+    """Create a generator with the sample entities registered."""
+    generator = EnhancedDocumentationGenerator(output_dir=Path(temp_dir) / "docs")
+    generator.register_entities(entities)
+    generator.analyze_relationships()
+    return generator
+
+
+class TestEnhancedDocumentationGenerator:
+    """Tests for the EnhancedDocumentationGenerator class."""
+
+    def test_generate_documentation(self, generator, capsys):
+        """Test that the index, entity pages and compiled outputs are written."""
+        generator.generate_documentation()
+        out = capsys.readouterr().out
+        assert out.startswith("\nLLM-optimized documentation has been generated successfully!\n")
+        assert f"Main index: {generator.output_dir}/index.md\n" in out
+
+        output_dir = generator.output_dir
+        assert (output_dir / "index.md").exists()
+        assert (output_dir / "api" / "pkg.md").exists()
+        assert (output_dir / "api" / "Widget.md").exists()
+        assert (output_dir / "api" / "build.md").exists()
+        assert not (output_dir / "api" / "run.md").exists()
+        assert (output_dir / "compiled" / "full_documentation.md").exists()
+        assert (output_dir / "templates" / "class_template.md").read_text() == CLASS_TEMPLATE
+
+    def test_entities_are_listed_by_name(self, generator, entities):
+        """Test that the index and compiled outputs list entities sorted by name."""
+        extra = FunctionEntity(name="assemble", docstring="Assemble a widget.")
+        extra.module_name = "pkg"
+        generator.register_entities([extra])
+        generator.generate_documentation()
+
+        index = (generator.output_dir / "index.md").read_text()
+        assert index.index("[assemble]") < index.index("[build]")
+
+        content = (generator.output_dir / "compiled" / "full_documentation.md").read_text()
+        assert content.index("### `assemble`") < content.index("### `build`")
+
+    def test_implementation_notes_keep_word_spacing(self, generator):
+        """Test that implementation notes are written without being re-spaced."""
+        generator.generate_documentation()
+
+        content = (generator.output_dir / "api" / "pkg.md").read_text()
+        assert "External Dependencies: os, typing" in content
+
+        content = (generator.output_dir / "api" / "Widget.md").read_text()
+        assert "Base Classes: Base\nMethods: run" in content
+
+    def test_context_is_computed_once_per_run(self, generator, entities, monkeypatch):
+        """Test that context lookups for the same entity reuse the first result."""
+        calls = []
+        generate_context = generator.context_generator.generate_context
+
+        def counting_generate_context(entity):
+            calls.append(entity)
+            return generate_context(entity)
+
+        monkeypatch.setattr(generator.context_generator, "generate_context", counting_generate_context)
+
+        module = entities[0]
+        assert generator._context(module) is generator._context(module)
+        assert calls == [module]
+
+    def test_unchanged_pages_are_not_rewritten(self, generator, entities):
+        """Test that pages are only rewritten when their content changes."""
+        generator.generate_documentation()
+        assert (generator.output_dir / ".codedoc_cache.json").exists()
+
+        # A page whose content hash is unchanged is left untouched
+        page = generator.output_dir / "api" / "build.md"
+        page.write_text("untouched")
+        generator.generate_documentation()
+        assert page.read_text() == "untouched"
+
+        entities[3].docstring = "Build a better widget."
+        generator.generate_documentation()
+        assert "Build a better widget." in page.read_text()
+
+    def test_same_named_entities_rebuild_like_a_clean_build(self, generator):
+        """Test that entities sharing a page name leave the same page on every run."""
+        for module_name in ("a", "b"):
+            func = FunctionEntity(name="main", docstring=f"from {module_name}")
+            func.module_name = module_name
+            generator.register_entities([func])
+
+        generator.generate_documentation()
+        page = generator.output_dir / "api" / "main.md"
+        clean = page.read_text()
+        assert "from b" in clean
+
+        generator.generate_documentation()
+        generator.generate_documentation()
+        assert page.read_text() == clean
+
+    def test_get_entity_id(self, generator, entities):
+        """Test entity IDs for each entity type and their caching on the entity."""
+        module, cls, method, func = entities
+        assert generator._get_entity_id(module) == "pkg"
+        assert generator._get_entity_id(cls) == "pkg.Widget"
+        assert generator._get_entity_id(method) == "pkg.Widget.run"
+        assert generator._get_entity_id(func) == "pkg.build"
+        assert generator._get_entity_id(ImportEntity("os")) == "ImportEntity:os"
+        assert generator._get_entity_id(ClassEntity(name="Loose")) == "ClassEntity:Loose"
+        assert cls._doc_id == "pkg.Widget"
+
+    def test_compiled_documentation(self, generator, entities):
+        """Test that the streamed compiled file matches the in-memory document."""
+        generator.generate_documentation()
+
+        modules, classes, functions = entities[:1], entities[1:2], entities[3:]
+        expected = generator._generate_compiled_documentation(modules + classes + functions, generator.title)
+        content = (generator.output_dir / "compiled" / "full_documentation.md").read_text()
+        assert content == expected
+        assert "##### `run`\n\nRun the widget.\n\n" in content
+        assert "### `build`\n\nBuild a widget.\n\n" in content
+
+        # Methods are listed under their class, not as top-level functions
+        loose_method = FunctionEntity(name="helper", is_method=True)
+        content = generator._generate_compiled_documentation(functions + [loose_method], generator.title)
+        assert "`helper`" not in content
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_json_documentation(self, generator, monkeypatch, use_orjson):
+        """Test the JSON documentation, including relationships, with and without orjson."""
+        if use_orjson:
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setattr(enhanced_generator, "orjson", None)
+        generator.relationship_mapper._add_relationship("pkg.build", "pkg.Widget.run", "calls")
+        generator.generate_documentation()
+
+        entities = json.loads((generator.output_dir / "compiled" / "documentation.json").read_text())
+        by_name = {entity["name"]: entity for entity in entities}
+        assert by_name["pkg"]["file_path"] == "pkg/__init__.py"
+        assert by_name["Widget"]["base_classes"] == ["Base"]
+        assert by_name["run"]["parent_class"] == "Widget"
+        assert by_name["build"]["relationships"] == [{"target": "pkg.Widget.run", "type": "calls"}]
+        assert "relationships" not in by_name["Widget"]
+
+    def test_render_impl_notes(self, generator, entities):
+        """Test rendering implementation notes for the compiled documentation."""
+        module, cls = entities[:2]
+        assert generator._render_impl_notes(module) == ""
+
+        cls.implementation_notes = "Base Classes: Base\nMethods: run"
+        assert generator._render_impl_notes(cls) == (
+            "**Implementation Notes**: Base Classes: Base\nMethods: run\n\n"
+        )
@@ -0,0 +1,169 @@
+"""
+Tests for the file enhancer.
+"""
+
+import pytest
+
+from codedoc.llm.base import LLMClient, LLMResponse, LLMStreamChunk, LLMError
+from codedoc.enhancers.file_enhancer import FileEnhancer
+
+
+class FakeLLMClient(LLMClient):
+    """LLM client that echoes the user prompt under an 'enhanced' marker."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt, system_prompt=None, **kwargs):
+        return self.generate_with_system_prompt(system_prompt, prompt)
+
+    def count_tokens(self, text):
+        return len(text.split())
+
+    def get_model_name(self):
+        return "fake-model"
+
+    def generate_with_system_prompt(self, system_prompt, user_prompt, model=None, temperature=0.5):
+        self.calls += 1
+        return LLMResponse(
+            content=f"# enhanced\n{user_prompt}",
+            model="fake-model",
+            tokens_used=10,
+            tokens_prompt=6,
+            tokens_completion=4,
+        )
+
+
+class FakeStreamingClient:
+    """LLM client that streams a fixed response in small chunks."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def generate_with_system_prompt_stream(self, system_prompt, user_prompt, model=None, temperature=0.5):
+        yield LLMStreamChunk(content="# enhanced\n", model="fake-model")
+        if self.fail:
+            raise LLMError("connection dropped")
+        yield LLMStreamChunk(content="x = 1\n", model="fake-model")
+        yield LLMStreamChunk(content="", model="fake-model", tokens_prompt=6, tokens_completion=4)
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    """Create a directory with a few source files and an excluded directory."""
+    source_dir = tmp_path / "src"
+    (source_dir / "__pycache__").mkdir(parents=True)
+    for i in range(5):
+        (source_dir / f"mod{i}.py").write_text(f"x = {i}\n")
+    (source_dir / "__pycache__" / "cached.py").write_text("y = 1\n")
+    return source_dir
+
+
+class TestFileEnhancer:
+    """Tests for the FileEnhancer class."""
+
+    def test_enhance_directory(self, tmp_path, source_dir):
+        """Test that every matching file is enhanced and counted once."""
+        client = FakeLLMClient()
+        enhancer = FileEnhancer(client, tmp_path / "out", max_concurrency=4)
+
+        result = enhancer.enhance_directory(source_dir, file_patterns=["*.py"])
+
+        assert result["stats"]["files_enhanced"] == 5
+        assert result["stats"]["total_tokens_used"] == 50
+        assert result["failed_files"] == []
+        assert client.calls == 5
+        assert enhancer.stats["files_processed"] == 5
+
+    def test_enhance_directory_prunes_excluded_dirs(self, tmp_path, source_dir):
+        """Test that only directories named in exclude_dirs are skipped."""
+        (source_dir / "environment").mkdir()
+        (source_dir / "environment" / "settings.py").write_text("DEBUG = False\n")
+        enhancer = FileEnhancer(FakeLLMClient(), tmp_path / "out")
+
+        result = enhancer.enhance_directory(source_dir, file_patterns=["*.py"])
+        assert result["stats"]["files_processed"] == 6
+
+        result = enhancer.enhance_directory(source_dir, file_patterns=["*.py"], recursive=False)
+        assert result["stats"]["files_processed"] == 5
+
+    def test_enhance_directory_serializes_shared_output_paths(self, tmp_path):
+        """Test that files mapping to the same output path do not race."""
+        source_dir = tmp_path / "src"
+        for package in ("a", "b"):
+            (source_dir / package).mkdir(parents=True)
+            (source_dir / package / "__init__.py").write_text(f"NAME = {package!r}\n")
+        enhancer = FileEnhancer(FakeLLMClient(), tmp_path / "out", max_concurrency=4)
+
+        result = enhancer.enhance_directory(source_dir, file_patterns=["*.py"])
+
+        assert result["stats"]["files_enhanced"] == 2
+        assert result["failed_files"] == []
+        assert list((tmp_path / "out").glob("__init__.py*")) == [tmp_path / "out" / "__init__.py"]
+
+    def test_unchanged_files_reuse_cached_output(self, tmp_path, source_dir):
+        """Test that a second run over unchanged files does not call the LLM."""
+        client = FakeLLMClient()
+        enhancer = FileEnhancer(client, tmp_path / "out")
+        source = source_dir / "mod0.py"
+
+        first = enhancer.enhance_file(source)
+        second = enhancer.enhance_file(source)
+        assert client.calls == 1
+        assert first == second
+
+        source.write_text("x = 42\n")
+        enhancer.enhance_file(source)
+        assert client.calls == 2
+        assert "x = 42" in (tmp_path / "out" / "mod0.py").read_text()
+
+    def test_enhance_file_preserves_structure_relative_to_cwd(self, tmp_path, source_dir):
+        """Test that output paths mirror the input path relative to cwd."""
+        enhancer = FileEnhancer(FakeLLMClient(), tmp_path / "out")
+
+        output_path = enhancer.enhance_file(source_dir / "mod1.py", cwd=tmp_path)
+        assert output_path == str(tmp_path / "out" / "src" / "mod1.py")
+
+    def test_enhance_file_streams_response(self, tmp_path, source_dir):
+        """Test that streamed chunks and their token usage are written and counted."""
+        enhancer = FileEnhancer(FakeStreamingClient(), tmp_path / "out")
+        calls = []
+
+        output_path = enhancer.enhance_file(
+            source_dir / "mod0.py", callback=lambda *args: calls.append(args)
+        )
+        assert (tmp_path / "out" / "mod0.py").read_text() == "# enhanced\nx = 1\n"
+        assert enhancer.stats["total_tokens_used"] == 10
+        assert calls[0][1] == output_path
+        assert calls[0][2] == {
+            "tokens_used": {"prompt_tokens": 6, "completion_tokens": 4, "total_tokens": 10},
+            "model": "fake-model",
+            "duration": calls[0][2]["duration"],
+            "original_size": len("x = 0\n"),
+            "enhanced_size": len("# enhanced\nx = 1\n"),
+        }
+
+        # A cache hit reports no token usage
+        enhancer.enhance_file(source_dir / "mod0.py", callback=lambda *args: calls.append(args))
+        assert calls[1][2]["cached"] is True
+        assert calls[1][2]["tokens_used"]["total_tokens"] == 0
+
+    def test_failed_stream_leaves_no_partial_output(self, tmp_path, source_dir):
+        """Test that an interrupted stream does not leave a truncated file."""
+        enhancer = FileEnhancer(FakeStreamingClient(fail=True), tmp_path / "out")
+
+        assert enhancer.enhance_file(source_dir / "mod0.py") is None
+        assert enhancer.stats["files_failed"] == 1
+        assert list((tmp_path / "out").glob("mod0.py*")) == []
+
+    def test_empty_files_are_skipped(self, tmp_path, source_dir):
+        """Test that empty and whitespace-only files are skipped without an LLM call."""
+        client = FakeLLMClient()
+        enhancer = FileEnhancer(client, tmp_path / "out")
+        (source_dir / "__init__.py").write_text("")
+        (source_dir / "blank.py").write_text("\n  \n")
+
+        assert enhancer.enhance_file(source_dir / "__init__.py") is None
+        assert enhancer.enhance_file(source_dir / "blank.py") is None
+        assert client.calls == 0
+        assert not (tmp_path / "out" / "__init__.py").exists()
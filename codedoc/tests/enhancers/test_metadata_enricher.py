@@ -0,0 +1,269 @@
+"""
+Tests for the metadata enricher.
+"""
+
+import os
+import pickle
+import subprocess
+
+import pytest
+from pathlib import Path
+
+from codedoc.core.entities import ModuleEntity, ClassEntity, FunctionEntity, ImportEntity
+from codedoc.enhancers import metadata_enricher
+from codedoc.enhancers.metadata_enricher import MetadataEnricher
+
+
+def _git(repo, *args, author="Alice <alice@example.com>", date="2024-01-02T03:04:05+00:00"):
+    """Run a git command in the repository as the given author."""
+    name, email = author[:-1].split(" <")
+    env = dict(os.environ, GIT_AUTHOR_NAME=name, GIT_AUTHOR_EMAIL=email,
+               GIT_COMMITTER_NAME=name, GIT_COMMITTER_EMAIL=email,
+               GIT_AUTHOR_DATE=date, GIT_COMMITTER_DATE=date)
+    subprocess.run(["git", *args], cwd=repo, env=env, check=True, capture_output=True)
+
+
+@pytest.fixture
+def git_repo(temp_dir):
+    """Create a repository with two files last touched by different commits."""
+    repo = Path(temp_dir) / "repo"
+    (repo / "pkg").mkdir(parents=True)
+    (repo / "pkg" / "a.py").write_text("A = 1\n")
+    (repo / "pkg" / "b.py").write_text("B = 1\n")
+    _git(repo, "init", "-q")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "Initial commit")
+
+    (repo / "pkg" / "b.py").write_text("B = 2\n")
+    _git(repo, "commit", "-q", "-am", "Update b", author="Bob <bob@example.com>",
+         date="2024-02-03T04:05:06+00:00")
+    return repo
+
+
+@pytest.fixture
+def git_calls(monkeypatch):
+    """Record the git commands run by the metadata enricher."""
+    calls = []
+    popen = subprocess.Popen
+
+    def counting_popen(args, **kwargs):
+        calls.append(args)
+        return popen(args, **kwargs)
+
+    # subprocess.run starts its process through Popen as well
+    monkeypatch.setattr(metadata_enricher.subprocess, "Popen", counting_popen)
+    return calls
+
+
+class TestMetadataEnricher:
+    """Tests for the MetadataEnricher class."""
+
+    def test_git_history_is_read_once(self, git_repo, git_calls):
+        """Test that dates and authors for every file come from one git log call."""
+        enricher = MetadataEnricher(git_repo)
+
+        a, b = git_repo / "pkg" / "a.py", git_repo / "pkg" / "b.py"
+        assert enricher.get_file_modification_time(a) == "2024-01-02T03:04:05+00:00"
+        assert enricher.get_file_author(a) == "Alice <alice@example.com>"
+        assert enricher.get_file_modification_time(b) == "2024-02-03T04:05:06+00:00"
+        assert enricher.get_file_author(str(b)) == "Bob <bob@example.com>"
+        assert enricher.file_authors["pkg/b.py"] == "Bob <bob@example.com>"
+        assert sum("log" in args for args in git_calls) == 1
+
+    def test_metadata_cache_skips_git_log(self, git_repo, temp_dir, git_calls):
+        """Test that saved dates and authors are reused while file blobs are unchanged."""
+        config = {"metadata_cache": Path(temp_dir) / "metadata.sqlite"}
+        b = git_repo / "pkg" / "b.py"
+        assert MetadataEnricher(git_repo, config).get_file_author(b) == "Bob <bob@example.com>"
+        assert any("log" in args for args in git_calls)
+
+        git_calls.clear()
+        enricher = MetadataEnricher(git_repo, config)
+        assert enricher.get_file_author(b) == "Bob <bob@example.com>"
+        assert enricher.get_file_modification_time(b) == "2024-02-03T04:05:06+00:00"
+        assert not any("log" in args for args in git_calls)
+
+        # A changed blob invalidates the saved entry
+        b.write_text("B = 3\n")
+        _git(git_repo, "commit", "-q", "-am", "Update b again", date="2024-03-04T05:06:07+00:00")
+        enricher = MetadataEnricher(git_repo, config)
+        assert enricher.get_file_author(b) == "Alice <alice@example.com>"
+        assert enricher.get_file_modification_time(git_repo / "pkg" / "a.py") == "2024-01-02T03:04:05+00:00"
+        assert enricher.file_authors["pkg/a.py"] is enricher.file_authors["pkg/b.py"]
+
+    def test_metadata_cache_creates_its_directory(self, git_repo, temp_dir, git_calls):
+        """Test that a first run saves the cache into a directory that does not exist yet."""
+        cache_file = Path(temp_dir) / "docs" / "metadata.sqlite"
+        config = {"metadata_cache": cache_file}
+        assert MetadataEnricher(git_repo, config).get_file_author(git_repo / "pkg" / "b.py")
+        assert cache_file.exists()
+
+        git_calls.clear()
+        MetadataEnricher(git_repo, config).get_file_author(git_repo / "pkg" / "b.py")
+        assert not any("log" in args for args in git_calls)
+
+    def test_git_version_is_detected_once(self, git_repo, git_calls):
+        """Test that the repository tag is looked up once and shared by all files."""
+        _git(git_repo, "tag", "v1.2.0")
+        git_calls.clear()
+        enricher = MetadataEnricher(git_repo)
+
+        assert enricher.get_file_version(git_repo / "pkg" / "a.py") == "v1.2.0"
+        assert enricher.get_file_version(git_repo / "pkg" / "b.py") == "v1.2.0"
+        assert sum("tag" in args or "describe" in args for args in git_calls) == 1
+
+    def test_file_metadata_is_shared_per_file(self, git_repo, monkeypatch):
+        """Test that file-level metadata is computed once and copied per entity."""
+        _git(git_repo, "remote", "add", "origin", "git@github.com:acme/pkg.git")
+        enricher = MetadataEnricher(git_repo)
+
+        calls = []
+        get_file_author = enricher.get_file_author
+        monkeypatch.setattr(enricher, "get_file_author", lambda path: calls.append(path) or get_file_author(path))
+
+        path = str(git_repo / "pkg" / "a.py")
+        first, second = ClassEntity(name="Widget", file_path=path), ClassEntity(name="Gadget", file_path=path)
+        first.methods, second.methods = [], []
+        second.line_number = 12
+
+        assert enricher.enrich_entity(first)["source_url"] == "https://github.com/acme/pkg/blob/main/pkg/a.py"
+        assert enricher.enrich_entity(second)["source_url"] == "https://github.com/acme/pkg/blob/main/pkg/a.py#L12"
+        assert enricher.enrich_entity(first)["source_url"] == "https://github.com/acme/pkg/blob/main/pkg/a.py"
+        assert calls == [path]
+
+    def test_source_url_uses_default_branch(self, git_repo):
+        """Test that source links point at the branch origin/HEAD refers to."""
+        _git(git_repo, "remote", "add", "origin", "https://gitlab.com/acme/pkg.git")
+        _git(git_repo, "symbolic-ref", "refs/remotes/origin/HEAD", "refs/remotes/origin/develop")
+
+        cls = ClassEntity(name="Widget", file_path=str(git_repo / "pkg" / "a.py"))
+        assert MetadataEnricher(git_repo).enrich_entity(cls)["source_url"] == (
+            "https://gitlab.com/acme/pkg/-/blob/develop/pkg/a.py"
+        )
+
+    def test_pickled_enricher_keeps_git_caches(self, git_repo):
+        """Test that an enricher sent to a worker process arrives with its caches filled."""
+        enricher = pickle.loads(pickle.dumps(MetadataEnricher(git_repo)))
+        assert enricher.file_authors["pkg/a.py"] == "Alice <alice@example.com>"
+        assert enricher.get_file_author(git_repo / "pkg" / "b.py") == "Bob <bob@example.com>"
+
+    def test_untracked_file_falls_back_to_mtime(self, git_repo):
+        """Test that files outside the git history use the file system time."""
+        untracked = git_repo / "pkg" / "new.py"
+        untracked.write_text("")
+        os.utime(untracked, (0, 0))
+
+        enricher = MetadataEnricher(git_repo)
+        assert enricher.get_file_modification_time(untracked) == "1970-01-01T00:00:00+00:00"
+        assert enricher.get_file_author(untracked) is None
+
+    def test_without_repo_root(self, temp_dir):
+        """Test that no git history is read when there is no repository root."""
+        path = Path(temp_dir) / "loose.py"
+        path.write_text("")
+
+        enricher = MetadataEnricher()
+        assert enricher.get_file_author(path) is None
+        assert enricher.get_file_modification_time(path)
+
+    def test_enrich_entities_in_parallel(self, git_repo, monkeypatch):
+        """Test that metadata computed by the process pool matches the serial result."""
+        entities = []
+        for module in ("a", "b"):
+            for name in ("Widget", "Gadget"):
+                cls = ClassEntity(name=name, file_path=str(git_repo / "pkg" / f"{module}.py"))
+                cls.module_name = f"pkg.{module}"
+                cls.methods = []
+                entities.append(cls)
+
+        serial = MetadataEnricher(git_repo).enrich_entities(entities, workers=1)
+        assert serial["pkg.b.Gadget"]["author"] == "Bob <bob@example.com>"
+
+        monkeypatch.setattr(metadata_enricher, "_PARALLEL_MIN_ENTITIES", 0)
+        parallel = MetadataEnricher(git_repo).enrich_entities(entities, workers=2)
+        assert list(parallel) == list(serial)
+        assert parallel == serial
+
+    def test_extract_tags(self):
+        """Test tags from explicit markers, docstring keywords and class names."""
+        cls = ClassEntity(name="ParseError", docstring="Tags: Parsing, io\n\nA thread-safe helper.")
+        assert sorted(MetadataEnricher().extract_tags(cls)) == [
+            "class", "exception", "helper", "io", "parsing", "threadsafe"
+        ]
+
+    def test_detect_stability(self):
+        """Test that the most significant stability marker in a docstring wins."""
+        enricher = MetadataEnricher()
+        assert enricher.detect_stability(ClassEntity(name="A", docstring="Stable soon; EXPERIMENTAL.")) == "experimental"
+        assert enricher.detect_stability(ClassEntity(name="B", docstring="Moved to betamax.")) == "beta"
+
+        internal = ClassEntity(name="_Hidden")
+        internal.methods = []
+        assert enricher.detect_stability(internal) == "internal"
+
+    def test_package_version_from_init(self, temp_dir):
+        """Test reading __version__ from a package, skipping virtual environments."""
+        root = Path(temp_dir)
+        (root / ".venv" / "dep").mkdir(parents=True)
+        (root / ".venv" / "dep" / "__init__.py").write_text('__version__ = "9.9.9"\n')
+        assert MetadataEnricher(root).package_version is None
+
+        (root / "pkg").mkdir()
+        (root / "pkg" / "__init__.py").write_text('"""Package."""\n\n__version__ = "0.3.1"\n')
+        assert MetadataEnricher(root).package_version == "0.3.1"
+
+    def test_entity_ids_and_paths(self):
+        """Test entity IDs and documentation paths for each entity type."""
+        module = ModuleEntity(name="pkg.mod")
+        cls = ClassEntity(name="Widget")
+        cls.module_name = "pkg.mod"
+        method = FunctionEntity(name="run", is_method=True)
+        method.module_name = "pkg.mod"
+        method.parent_class = "Widget"
+
+        enricher = MetadataEnricher()
+        assert enricher._get_entity_id(module) == "ModuleEntity:pkg.mod"
+        assert enricher._get_entity_id(cls) == "pkg.mod.Widget"
+        assert enricher._get_entity_id(method) == "pkg.mod.Widget.run"
+        assert enricher._get_entity_path(module) == "pkg/mod"
+        assert enricher._get_entity_path(cls) == "pkg/mod/Widget"
+        assert enricher._get_entity_path(method) == "pkg/mod/Widget/run"
+        assert enricher._get_entity_path(FunctionEntity(name="build")) == "build"
+        assert enricher._get_entity_path(ImportEntity("os")) == "os"
+
+    def test_package_version_from_pyproject(self, temp_dir):
+        """Test reading the project version rather than other version settings."""
+        root = Path(temp_dir)
+        (root / "pyproject.toml").write_text(
+            '[tool.black]\ntarget-version = "py38"\n\n[project]\nname = "pkg"\nversion = "1.4.0"\n'
+        )
+        assert MetadataEnricher(root).package_version == "1.4.0"
+
+    def test_enrich_entity_types(self):
+        """Test enriching modules, functions and classes with deprecated methods."""
+        enricher = MetadataEnricher()
+
+        module = ModuleEntity(name="pkg.mod")
+        assert enricher.get_metadata(module) == {"stability": "stable"}
+
+        func = FunctionEntity(name="build")
+        func.code = "def build():\n    warnings.warn('old', DeprecationWarning)\n"
+        assert enricher.get_metadata(func) == {"stability": "deprecated", "tags": ["function"]}
+
+        method = FunctionEntity(name="run", is_method=True)
+        method.code = func.code
+        cls = ClassEntity(name="Widget", docstring="An experimental widget.")
+        cls.methods = [FunctionEntity(name="stop", is_method=True), method]
+        metadata = enricher.enrich_entity(cls)
+        assert metadata["stability"] == "deprecated"
+        assert metadata["deprecation_message"] == "This class contains deprecated methods (run)."
+
+    def test_no_git_processes_outside_a_repository(self, temp_dir, git_calls):
+        """Test that a source tree without git history never starts git."""
+        path = Path(temp_dir) / "pkg.py"
+        path.write_text("")
+
+        enricher = MetadataEnricher(temp_dir)
+        enricher.enrich_entity(ClassEntity(name="Widget", file_path=str(path)))
+        assert enricher.get_file_version(path) is None
+        assert git_calls == []
@@ -0,0 +1,24 @@
+"""
+Tests for the shared process pool helper.
+"""
+
+import os
+import threading
+
+from codedoc.enhancers._process_pool import process_pool, register_background_work
+
+
+class TestProcessPool:
+    """Tests for process_pool and register_background_work."""
+
+    def test_pool_waits_for_background_work(self):
+        """Test that a pool is only created once registered threads are done."""
+        done = threading.Event()
+        register_background_work(done)
+        timer = threading.Timer(0.1, done.set)
+        timer.start()
+
+        with process_pool(1) as executor:
+            assert done.is_set()
+            assert executor.submit(os.getpid).result() != os.getpid()
+        timer.join()
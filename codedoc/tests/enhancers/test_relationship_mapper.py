@@ -0,0 +1,330 @@
+"""
+Tests for the relationship mapper.
+"""
+
+import ast
+
+import pytest
+
+from codedoc.core.entities import (
+    ModuleEntity, ClassEntity, FunctionEntity, VariableEntity, ImportEntity
+)
+from codedoc.enhancers import relationship_mapper
+from codedoc.enhancers.relationship_mapper import (
+    FunctionCallVisitor, RelationshipMapper, _DiGraph
+)
+
+
+@pytest.fixture
+def entities():
+    """Create a module with a class and a function."""
+    module = ModuleEntity(name="pkg.mod", file_path="pkg/mod.py")
+    module.imports = [ImportEntity("os")]
+
+    cls = ClassEntity(name="Widget", base_classes=["Base"])
+    cls.module_name = "pkg.mod"
+
+    func = FunctionEntity(name="build")
+    func.module_name = "pkg.mod"
+
+    return [module, cls, func]
+
+
+class TestRelationshipMapper:
+    """Tests for the RelationshipMapper class."""
+
+    def test_register_entities(self, entities):
+        """Test that entities are registered under their full names."""
+        mapper = RelationshipMapper()
+        mapper.register_entities(entities)
+
+        assert set(mapper.entities) == {"pkg.mod", "pkg.mod.Widget", "pkg.mod.build"}
+        assert mapper.modules == {"pkg/mod.py": entities[0]}
+        assert mapper._get_entity_id(entities[1]) == "pkg.mod.Widget"
+        assert mapper.entity_ids[entities[2].id] == "pkg.mod.build"
+
+    def test_register_entities_is_idempotent(self, entities, monkeypatch):
+        """Test that registering the same entities again does no work."""
+        mapper = RelationshipMapper()
+        mapper.register_entities(entities)
+
+        registered = []
+        monkeypatch.setattr(mapper, "_register_entity", registered.append)
+        mapper.register_entities(entities)
+
+        assert registered == []
+
+    def test_analyze_function_calls(self, entities):
+        """Test that calls are matched to registered functions and methods."""
+        func = entities[2]
+        func.ast_node = ast.parse("def build():\n    helper()\n    Widget.run()\n    helper()\n    unknown()\n").body[0]
+
+        helper = FunctionEntity(name="helper")
+        helper.module_name = "pkg.mod"
+        method = FunctionEntity(name="run", is_method=True)
+        method.module_name = "pkg.mod"
+        method.parent_class = "Widget"
+
+        mapper = RelationshipMapper()
+        mapper.register_entities(entities + [helper, method])
+        mapper.analyze_function_calls()
+
+        assert sorted(mapper.relationships) == [
+            ("pkg.mod.build", "pkg.mod.Widget.run", "calls"),
+            ("pkg.mod.build", "pkg.mod.helper", "calls"),
+        ]
+
+    def test_analyze_function_calls_walks_modules(self, entities):
+        """Test that a module's AST is walked once for all of its functions."""
+        entities[0].ast_node = ast.parse(
+            "class Widget(Base):\n"
+            "    def run(self):\n"
+            "        build()\n"
+            "def build():\n"
+            "    def inner():\n"
+            "        Widget.run()\n"
+            "    return inner\n"
+        )
+        method = FunctionEntity(name="run", is_method=True)
+        method.module_name = "pkg.mod"
+        method.parent_class = "Widget"
+
+        mapper = RelationshipMapper()
+        mapper.register_entities(entities + [method])
+        mapper.analyze_function_calls()
+
+        assert sorted(mapper.relationships) == [
+            ("pkg.mod.Widget.run", "pkg.mod.build", "calls"),
+            ("pkg.mod.build", "pkg.mod.Widget.run", "calls"),
+        ]
+
+    def test_analyze_function_calls_nested_classes(self, entities):
+        """Test that calls made by methods of nested classes are recorded."""
+        entities[0].code = (
+            "class Widget(Base):\n"
+            "    class Part:\n"
+            "        def fit(self):\n"
+            "            build()\n"
+            "        class Bolt:\n"
+            "            def turn(self):\n"
+            "                build()\n"
+            "def build():\n"
+            "    pass\n"
+        )
+        fit = FunctionEntity(name="fit", is_method=True)
+        fit.module_name = "pkg.mod"
+        fit.parent_class = "Part"
+
+        # A method the module walk cannot name is visited from its own AST
+        turn = FunctionEntity(name="turn", is_method=True)
+        turn.module_name = "pkg.mod"
+        turn.parent_class = "Widget.Part.Bolt.Extra"
+        turn.ast_node = ast.parse("def turn(self):\n    build()\n").body[0]
+
+        mapper = RelationshipMapper()
+        mapper.register_entities(entities + [fit, turn])
+        mapper.analyze_function_calls()
+
+        assert sorted(mapper.relationships) == [
+            ("pkg.mod.Part.fit", "pkg.mod.build", "calls"),
+            ("pkg.mod.Widget.Part.Bolt.Extra.turn", "pkg.mod.build", "calls"),
+        ]
+
+
+    def test_entities_without_module_name(self):
+        """Test names and call resolution for entities without a module."""
+        loose = FunctionEntity(name="loose")
+        mapper = RelationshipMapper()
+        mapper.register_entities([loose])
+
+        assert mapper._get_full_name(loose) == "loose"
+        assert mapper._get_full_name_for_parent(loose) == ""
+        assert mapper._resolve_call_target("other", loose) is None
+        assert mapper._entity_to_dict(loose) == {"name": "loose", "type": "FunctionEntity"}
+
+
+    def test_resolve_call_target_cache(self, entities):
+        """Test that resolved calls are cached until new entities are registered."""
+        mapper = RelationshipMapper()
+        mapper.register_entities(entities)
+        func = entities[2]
+        assert mapper._resolve_call_target("helper", func) is None
+
+        helper = FunctionEntity(name="helper")
+        helper.module_name = "pkg.mod"
+        mapper.register_entities([helper])
+        target = mapper._resolve_call_target("helper", func)
+        assert target == "pkg.mod.helper"
+        assert target is next(name for name in mapper.entities if name == target)
+        assert mapper._get_short_name("pkg.mod.Widget.run") == "Widget.run"
+        assert mapper._get_short_name("build") == "build"
+
+
+    def test_analyze_function_calls_in_parallel(self, entities, monkeypatch):
+        """Test that modules walked by the process pool give the serial result."""
+        entities[0].code = "def build():\n    helper()\n"
+        helper = FunctionEntity(name="helper")
+        helper.module_name = "pkg.mod"
+
+        serial = RelationshipMapper()
+        serial.register_entities(entities + [helper])
+        serial.analyze_function_calls(workers=1)
+        assert serial.relationships == [("pkg.mod.build", "pkg.mod.helper", "calls")]
+
+        monkeypatch.setattr(relationship_mapper, "_PARALLEL_MIN_SOURCE_CHARS", 0)
+        parallel = RelationshipMapper()
+        parallel.register_entities(entities + [helper])
+        parallel.analyze_function_calls(workers=2)
+        assert parallel.relationships == serial.relationships
+
+
+    def test_edges_are_added_on_finalize(self, entities):
+        """Test that buffered edges reach the graphs once finalized."""
+        entities[0].imports = ["import os.path"]
+        mapper = RelationshipMapper()
+        mapper.register_entities(entities)
+        assert list(mapper.import_graph.successors("pkg.mod")) == ["os"]
+        assert list(mapper.inheritance_graph.successors("pkg.mod.Widget")) == ["Base"]
+
+        mapper._add_relationship("pkg.mod.build", "pkg.mod.Widget", "calls")
+        mapper._add_relationship("pkg.mod.build", "pkg.mod.Widget", "calls")
+        assert mapper.relationships == [("pkg.mod.build", "pkg.mod.Widget", "calls")]
+        assert mapper._call_edges == [("pkg.mod.build", "pkg.mod.Widget")]
+        assert "pkg.mod.Widget" not in mapper.call_graph
+        assert mapper.get_function_relationships("pkg.mod.build")["function_calls"]["calls"] == [
+            "pkg.mod.Widget"
+        ]
+
+
+    def test_get_module_relationships(self, entities):
+        """Test that module members are listed by kind, without methods."""
+        method = FunctionEntity(name="run", is_method=True)
+        method.module_name = "pkg.mod"
+        method.parent_class = "Widget"
+        var = VariableEntity(name="DEFAULT")
+        var.module_name = "pkg.mod"
+
+        mapper = RelationshipMapper()
+        mapper.register_entities(entities + [method, var])
+
+        relationships = mapper.get_module_relationships("pkg.mod")
+        assert [c["name"] for c in relationships["classes"]] == ["Widget"]
+        assert [f["name"] for f in relationships["functions"]] == ["build"]
+        assert [v["name"] for v in relationships["variables"]] == ["DEFAULT"]
+        assert mapper.get_module_relationships("pkg.other")["classes"] == []
+        assert mapper.get_module_relationships("pkg.mod")["classes"][0] is relationships["classes"][0]
+
+    def test_module_import_relationships(self, entities):
+        """Test that imports between registered modules are listed both ways."""
+        other = ModuleEntity(name="pkg", file_path="pkg/__init__.py")
+
+        mapper = RelationshipMapper()
+        mapper.register_entities(entities + [other])
+        mapper._add_relationship("pkg.mod", "pkg", "imports")
+        mapper._add_relationship("pkg.mod", "os", "imports")
+
+        assert [m["name"] for m in mapper.get_module_relationships("pkg.mod")["imports"]] == ["pkg"]
+        assert [m["name"] for m in mapper.get_module_relationships("pkg")["imported_by"]] == ["pkg.mod"]
+
+
+    def test_full_names_are_cached(self, entities):
+        """Test that registration caches full and parent names on the entity."""
+        method = FunctionEntity(name="run", is_method=True)
+        method.module_name = "pkg.mod"
+        method.parent_class = "Widget"
+
+        mapper = RelationshipMapper()
+        mapper.register_entities(entities + [method])
+        assert method._full_name == "pkg.mod.Widget.run"
+        assert method._parent_full_name == "pkg.mod.Widget"
+        assert mapper.parent_map == {"pkg.mod.Widget.run": "pkg.mod.Widget"}
+
+        method.parent_class = "Gadget"
+        assert mapper._get_full_name(method) == "pkg.mod.Widget.run"
+        assert mapper._get_full_name_for_parent(method) == "pkg.mod.Widget"
+
+
+    def test_get_class_relationships(self, entities):
+        """Test that calls into and out of a class's methods are collected."""
+        method = FunctionEntity(name="run", is_method=True)
+        method.module_name = "pkg.mod"
+        method.parent_class = "Widget"
+        helper = FunctionEntity(name="helper")
+        helper.module_name = "pkg.util"
+
+        mapper = RelationshipMapper()
+        mapper.register_entities(entities + [method, helper])
+        assert mapper._methods_by_class == {"pkg.mod.Widget": ["pkg.mod.Widget.run"]}
+
+        mapper._add_relationship("pkg.mod.Widget.run", "pkg.util.helper", "calls")
+        mapper._add_relationship("pkg.util.helper", "pkg.mod.Widget.run", "calls")
+        mapper._add_relationship("pkg.mod.Widget.run", "pkg.mod.build", "calls")
+        mapper._add_relationship("pkg.mod.build", "pkg.util.helper", "calls")
+        relationships = mapper.get_class_relationships("pkg.mod.Widget", include_diagram=False)
+        assert relationships["uses"] == ["pkg.util.helper", "pkg.mod.build"]
+        assert relationships["used_by"] == ["pkg.util.helper"]
+        assert relationships["inherits_from"] == ["Base"]
+        assert relationships["class_hierarchy"] == []
+
+        diagram = mapper.get_class_relationships("pkg.mod.Widget")
+        assert diagram["class_hierarchy"] == ["Base <|-- Widget"]
+        assert mapper.get_relationships_for_entity(entities[1])["class_hierarchy"] == ["Base <|-- Widget"]
+        assert mapper.get_function_relationships("pkg.mod.build")["call_graph"] == [
+            "mod.build --> util.helper", "Widget.run --> mod.build"
+        ]
+
+
+    def test_is_external_call(self, entities):
+        """Test external call checks for registered and unregistered names."""
+        run = FunctionEntity(name="run", is_method=True)
+        run.module_name = "pkg.mod"
+        run.parent_class = "Widget"
+        stop = FunctionEntity(name="stop", is_method=True)
+        stop.module_name = "pkg.mod"
+        stop.parent_class = "Widget"
+        helper = FunctionEntity(name="helper")
+        helper.module_name = "pkg.mod"
+
+        mapper = RelationshipMapper()
+        mapper.register_entities(entities + [run, stop, helper])
+
+        assert not mapper._is_external_call("pkg.mod.Widget.run", "pkg.mod.Widget.stop")
+        assert mapper._is_external_call("pkg.mod.Widget.run", "pkg.mod.helper")
+        assert not mapper._is_external_call("pkg.mod.build", "pkg.mod.helper")
+        assert mapper._is_external_call("pkg.mod.build", "pkg.other.helper")
+        assert not mapper._is_external_call("pkg.other.a", "pkg.other.b")
+
+
+    def test_extract_module_from_import(self):
+        """Test extracting the imported module from import statements."""
+        mapper = RelationshipMapper()
+        assert mapper._extract_module_from_import("import os.path as osp") == "os"
+        assert mapper._extract_module_from_import("import os, sys") == "os"
+        assert mapper._extract_module_from_import("from pkg.sub import name") == "pkg.sub"
+        assert mapper._extract_module_from_import("from . import sibling") == "."
+        assert mapper._extract_module_from_import("x = 1") == ""
+
+
+class TestDiGraph:
+    """Tests for the _DiGraph adjacency structure."""
+
+    def test_edges_and_nodes(self):
+        """Test neighbour order, node containment and missing nodes."""
+        graph = _DiGraph()
+        graph.add_node("lonely")
+        graph.add_edges_from([("a", "c"), ("a", "b"), ("a", "c")])
+
+        assert "lonely" in graph and "b" in graph and "z" not in graph
+        assert list(graph.successors("a")) == ["c", "b"]
+        assert list(graph.predecessors("b")) == ["a"]
+        assert list(graph.successors("z")) == []
+
+
+class TestFunctionCallVisitor:
+    """Tests for the FunctionCallVisitor class."""
+
+    def test_call_names(self):
+        """Test the names recorded for plain, dotted and computed calls."""
+        visitor = FunctionCallVisitor()
+        visitor.visit(ast.parse("run()\nos.path.join()\nmake().build()\na.b.c.d.e.f.g.h()\n"))
+        assert sorted(visitor.function_calls) == ["build", "make", "os.path.join", "run"]
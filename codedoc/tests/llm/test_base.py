@@ -3,7 +3,7 @@ Tests for the base LLM client.
 """
 
 import pytest
-from codedoc.llm.base import LLMClient, LLMResponse, LLMError
+from codedoc.llm.base import LLMClient, LLMResponse, LLMStreamChunk, LLMError
 
 
 class TestLLMResponse:
@@ -80,4 +80,32 @@ class TestLLMClient:
         
         assert isinstance(response, LLMResponse)
         assert response.content == "Test response"
-        assert response.tokens_used == 100 
\ No newline at end of file
+        assert response.tokens_used == 100 
+
+    def test_generate_with_system_prompt_stream_default(self):
+        """Test that clients without native streaming yield the whole response as one chunk."""
+        class ConcreteLLMClient(LLMClient):
+            """Concrete implementation without a streaming override."""
+            
+            def generate(self, prompt, system_prompt=None, temperature=0.7, 
+                         max_tokens=None, stop_sequences=None, **kwargs):
+                return LLMResponse(
+                    content="Test response",
+                    model="test-model",
+                    tokens_used=100,
+                    tokens_prompt=50,
+                    tokens_completion=50
+                )
+                
+            def count_tokens(self, text):
+                return len(text.split())
+                
+            def get_model_name(self):
+                return "test-model"
+        
+        client = ConcreteLLMClient()
+        chunks = list(client.generate_with_system_prompt_stream("Be brief.", "Test prompt"))
+        
+        assert chunks == [LLMStreamChunk(
+            content="Test response", model="test-model", tokens_prompt=50, tokens_completion=50
+        )]
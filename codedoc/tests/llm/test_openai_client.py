@@ -3,6 +3,7 @@ Tests for the OpenAI LLM client.
 """
 
 import os
+import openai
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -108,6 +109,32 @@ class TestOpenAIClient:
             # Verify the error
             assert "API error" in str(exc_info.value)
     
+    def test_stream_retries_connection_errors(self):
+        """Test that opening a stream is retried before any chunk is consumed."""
+        with patch('codedoc.llm.openai_client.OpenAI') as mock_openai, \
+             patch('codedoc.llm.openai_client.time.sleep'):
+            event = MagicMock()
+            event.choices = [MagicMock()]
+            event.choices[0].delta.content = "Generated text"
+            event.usage = None
+            
+            mock_client = MagicMock()
+            mock_client.chat.completions.create.side_effect = [
+                openai.APIConnectionError(request=MagicMock()),
+                iter([event])
+            ]
+            mock_openai.return_value = mock_client
+            
+            client = OpenAIClient(api_key="test_api_key")
+            chunks = list(client.generate_with_system_prompt_stream(
+                system_prompt="System instructions",
+                user_prompt="User request"
+            ))
+            
+            assert [chunk.content for chunk in chunks] == ["Generated text"]
+            assert mock_client.chat.completions.create.call_count == 2
+            assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+    
     @patch.dict(os.environ, {}, clear=True)
     def test_missing_api_key(self):
         """Test error when API key is missing."""
@@ -100,6 +100,23 @@ USER: I need help with {{ task }}.
         
         assert result == "Hello, !"
     
+    def test_templates_are_compiled_once(self):
+        """Test that rendering reuses compiled templates until the source changes."""
+        manager = PromptManager()
+        manager.templates["test_template"] = "SYSTEM: Be {{ tone }}.\n===\nUSER: Hi {{ name }}."
+        
+        first = manager.render_with_system("test_template", {"tone": "brief", "name": "Ada"})
+        second = manager.render_with_system("test_template", {"tone": "kind", "name": "Bob"})
+        assert first == {"system": "Be brief.", "user": "Hi Ada."}
+        assert second == {"system": "Be kind.", "user": "Hi Bob."}
+        assert len(manager._compiled_split) == 1
+        
+        # Plain rendering of the same source is cached separately
+        assert manager.render_template("test_template", {"tone": "x", "name": "y"}).startswith("SYSTEM: Be x.")
+        
+        manager.templates["test_template"] = "SYSTEM: New.\n===\nUSER: {{ name }}"
+        assert manager.render_with_system("test_template", {"name": "Cy"})["user"] == "Cy"
+    
     def test_create_default_manager(self):
         """Test the create_default_manager function."""
         manager = create_default_manager()
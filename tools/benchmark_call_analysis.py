@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark serial and pooled call analysis in the relationship mapper.
+
+This script builds synthetic modules from the project's own source files,
+runs RelationshipMapper.analyze_function_calls on them in-process and on a
+process pool, and reports the source size at which the pool starts to pay
+off. It backs the _PARALLEL_MIN_SOURCE_CHARS threshold.
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from codedoc.core.entities import ModuleEntity
+from codedoc.enhancers import relationship_mapper
+from codedoc.enhancers.relationship_mapper import RelationshipMapper
+
+
+def load_sources(root_dir):
+    """Read every Python file under the given directory."""
+    return [path.read_text(encoding='utf-8') for path in sorted(Path(root_dir).rglob('*.py'))]
+
+
+def build_modules(sources, total_chars):
+    """Build module entities whose source adds up to at least total_chars."""
+    modules = []
+    size = 0
+    while size < total_chars:
+        source = sources[len(modules) % len(sources)]
+        module = ModuleEntity(name=f"bench.mod{len(modules)}", file_path=f"bench/mod{len(modules)}.py")
+        module.code = source
+        modules.append(module)
+        size += len(source)
+    return modules
+
+
+def time_analysis(modules, workers):
+    """Time one call analysis over the modules with the given worker count."""
+    mapper = RelationshipMapper()
+    mapper.register_entities(modules)
+    start = time.perf_counter()
+    mapper.analyze_function_calls(workers=workers)
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark serial and pooled call analysis")
+    parser.add_argument("--source-dir", default=str(Path(__file__).resolve().parent.parent / "codedoc"),
+                        help="Directory whose Python files are used as module source")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes for the pooled run")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[0.1, 1, 4, 16],
+                        help="Total source sizes to benchmark, in millions of characters")
+    args = parser.parse_args()
+
+    sources = load_sources(args.source_dir)
+
+    # Always take the pooled path for the pooled runs
+    relationship_mapper._PARALLEL_MIN_SOURCE_CHARS = 0
+
+    print(f"{'chars':>12} {'modules':>8} {'serial s':>10} {'pooled s':>10}")
+    for size in args.sizes:
+        modules = build_modules(sources, int(size * 1_000_000))
+        chars = sum(len(module.code) for module in modules)
+        serial = time_analysis(modules, workers=1)
+        pooled = time_analysis(modules, workers=args.workers)
+        print(f"{chars:>12} {len(modules):>8} {serial:>10.3f} {pooled:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()